@@ -0,0 +1,3 @@
+"""
+KNET benchmarks
+"""
@@ -0,0 +1,37 @@
+"""
+Run all the benchmarks.
+
+Usage: python -m benchmarks [-n CALLS] [-o results.json] [--only codec,playback]
+"""
+from . import allocations, codec, deadreckoning, interest, lagcomp, latency, playback, sharding
+from .common import make_parser, write_report
+
+SUITES = {
+    'allocations': allocations,
+    'codec': codec,
+    'deadreckoning': deadreckoning,
+    'interest': interest,
+    'lagcomp': lagcomp,
+    'latency': latency,
+    'playback': playback,
+    'sharding': sharding,
+}
+
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument('--only', help='comma separated benchmark names')
+    args = parser.parse_args()
+
+    names: list[str] = args.only.split(',') if args.only else list(SUITES)
+    results: list[dict] = []
+    for name in names:
+        for result in SUITES[name].run(args.number):
+            result['suite'] = name
+            results.append(result)
+
+    write_report(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Memory allocations of snapshot hot paths.
+
+Counts memory blocks left allocated by every call while its results
+are kept alive, and peak traced bytes of a call, with and without
+pooled interpolation and copy-on-write extrapolation.
+
+Usage: python -m benchmarks.allocations [-n CALLS] [-o results.json] [--entities 10,100,1000]
+"""
+import gc
+import sys
+import tracemalloc
+from typing import Callable, Iterator
+
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.event import Event
+from kitsunet.playback import PlaybackSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+from .common import make_parser, measure, summarize, write_report
+from .playback import FRAME_RATE, make_world, parse_list
+
+ENTITY_COUNTS = (10, 100, 1000)
+
+
+def count_allocations(func: Callable[[], object], number: int) -> tuple[float, float]:
+    """
+    Count memory allocated by function calls.
+
+    :param func: function without arguments
+    :type func: callable
+
+    :param number: number of calls
+    :type number: int
+
+    :returns: blocks kept allocated and peak bytes per call
+    :rtype: tuple
+    """
+    results: list = [None] * number
+    gc.collect()
+    gc.disable()
+    try:
+        before: int = sys.getallocatedblocks()
+        for i in range(number):
+            results[i] = func()
+        blocks: int = sys.getallocatedblocks() - before
+    finally:
+        gc.enable()
+
+    calls: int = max(1, number // 10)
+    peak: int = 0
+    tracemalloc.start()
+    try:
+        for _ in range(calls):
+            tracemalloc.reset_peak()
+            current: int = tracemalloc.get_traced_memory()[0]
+            func()
+            peak += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+
+    return blocks / number, peak / calls
+
+
+def summarize_allocations(name: str, params: dict, func: Callable[[], object], number: int, items: int) -> dict:
+    result: dict = summarize(name, params, measure(func, number), items)
+    result['blocks_per_call'], result['peak_bytes_per_call'] = count_allocations(func, number)
+    return result
+
+
+def run_snapshot(number: int) -> list[dict]:
+    snapshot_a: Snapshot = Snapshot(1, (0.0, 0.0, 0.0))
+    snapshot_b: Snapshot = Snapshot(1, (1.0, 2.0, 3.0))
+    pooled: Snapshot = Snapshot()
+    idle: Event = Event(tick_id=1, entity_id=1)
+    moving: Event = Event(tick_id=1, entity_id=1, velocity=(0.1, 0.0, 0.0))
+    return [
+        summarize_allocations('snapshot_interpolate', {'pooled': False}, lambda: snapshot_a.interpolate(snapshot_b, 0.5), number, 1),
+        summarize_allocations('snapshot_interpolate', {'pooled': True}, lambda: snapshot_a.interpolate(snapshot_b, 0.5, out=pooled), number, 1),
+        summarize_allocations('snapshot_extrapolate', {'moving': False}, lambda: snapshot_a.extrapolate(idle, 0.05), number, 1),
+        summarize_allocations('snapshot_extrapolate', {'moving': True}, lambda: snapshot_a.extrapolate(moving, 0.05), number, 1),
+    ]
+
+
+def run_world(number: int, count: int) -> list[dict]:
+    results: list[dict] = []
+    for world_class in (WorldSnapshot, ColumnarWorldSnapshot):
+        wsnapshot_a: WorldSnapshot = make_world(1, count, world_class)
+        wsnapshot_b: WorldSnapshot = make_world(2, count, world_class)
+        pool: WorldSnapshot = wsnapshot_a.interpolate(wsnapshot_b, 0.5)
+        for pooled in (False, True):
+            out: WorldSnapshot | None = pool if pooled else None
+            params: dict = {'entities': count, 'world': world_class.__name__, 'pooled': pooled}
+            results.append(summarize_allocations(
+                'interpolate', params,
+                lambda: wsnapshot_a.interpolate(wsnapshot_b, 0.5, out=out), number, count))
+
+    wsnapshot: WorldSnapshot = make_world(1, count)
+    for moving in (0, count // 10, count):  # share none, most or all entity snapshots
+        events: list[Event] = [
+            Event(tick_id=1, entity_id=entity_id, velocity=(0.1, 0.0, 0.0) if entity_id < moving else None)
+            for entity_id in range(count)]
+        params: dict = {'entities': count, 'moving': moving}
+        results.append(summarize_allocations(
+            'extrapolate', params, lambda: wsnapshot.extrapolate(events, 0.05, 2), number, count))
+    return results
+
+
+def run_update(number: int, count: int) -> list[dict]:
+    results: list[dict] = []
+    for reuse in (False, True):
+        system: PlaybackSystem = PlaybackSystem(20, reuse_interpolated=reuse)
+        # every call is a frame, three frames per tick, keep one snapshot queued
+        wsnapshots: list[WorldSnapshot] = [make_world(tick_id, count) for tick_id in range(1, number * 2 // 3 + 3)]
+        feeds: Iterator[WorldSnapshot] = iter(wsnapshots)
+        system.feed_snapshot(next(feeds))
+        frame_duration: float = 1 / FRAME_RATE
+        frame_id: list[int] = [0]
+
+        def frame() -> WorldSnapshot | None:
+            if frame_id[0] % 3 == 0:
+                system.feed_snapshot(next(feeds))
+            frame_id[0] += 1
+            system.update(frame_duration)
+            return system.get_interpolated_snapshot()
+
+        params: dict = {'entities': count, 'reuse_interpolated': reuse}
+        results.append(summarize_allocations('update', params, frame, number // 2, count))
+    return results
+
+
+def run(number: int, entity_counts: tuple[int] = ENTITY_COUNTS) -> list[dict]:
+    results: list[dict] = run_snapshot(number)
+    for count in entity_counts:
+        results += run_world(number, count)
+        results += run_update(number, count)
+    return results
+
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument('--entities', type=parse_list, default=ENTITY_COUNTS)
+    args = parser.parse_args()
+    write_report(run(args.number, args.entities), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Round trip and throughput of the binary codec compared to pickle,
+and encoding a tick for many clients with and without the packet cache.
+
+Usage: python -m benchmarks.codec [-n CALLS] [-o results.json]
+"""
+import pickle
+import random
+
+from kitsunet.cache import PacketCache
+from kitsunet.codec import Codec, Quantizer
+from kitsunet.event import Event
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+from .common import make_parser, measure, summarize, write_report
+
+ENTITY_COUNTS = (10, 100, 1000)
+CLIENT_COUNT = 100
+VIEW_COUNT = 4  # unique interest sets among clients
+
+
+def make_world(tick_id: int, count: int) -> WorldSnapshot:
+    rnd: random.Random = random.Random(count)
+    return WorldSnapshot(tick_id, [
+        Snapshot(entity_id=entity_id, position=(
+            rnd.uniform(-500, 500), rnd.uniform(-500, 500), rnd.uniform(0, 50)))
+        for entity_id in range(count)
+    ])
+
+
+def run(number: int) -> list[dict]:
+    codecs: dict[str, Codec] = {
+        'float32': Codec(),
+        'quantized': Codec(Quantizer(-1024.0, 1024.0, 20), Quantizer(-32.0, 32.0, 12)),
+    }
+    results: list[dict] = []
+
+    for count in ENTITY_COUNTS:
+        wsnapshot: WorldSnapshot = make_world(1, count)
+        events: list[Event] = [
+            Event(tick_id=1, entity_id=entity_id, velocity=(0.5, -0.5, 0.0))
+            for entity_id in range(count)
+        ]
+
+        data: bytes = pickle.dumps(wsnapshot)
+        params: dict = {'entities': count, 'codec': 'pickle', 'bytes': len(data)}
+        results.append(summarize(
+            'world_snapshot_encode', params,
+            measure(lambda: pickle.dumps(wsnapshot), number), count))
+        results.append(summarize(
+            'world_snapshot_decode', params,
+            measure(lambda: pickle.loads(data), number), count))
+
+        for name, codec in codecs.items():
+            data = codec.encode(wsnapshot)
+            params = {'entities': count, 'codec': name, 'bytes': len(data)}
+            results.append(summarize(
+                'world_snapshot_encode', params,
+                measure(lambda: codec.encode(wsnapshot), number), count))
+            results.append(summarize(
+                'world_snapshot_decode', params,
+                measure(lambda: codec.decode(data), number), count))
+
+            batch: bytes = codec.encode_batch(events)
+            params = {'entities': count, 'codec': name, 'bytes': len(batch)}
+            results.append(summarize(
+                'event_batch_encode', params,
+                measure(lambda: codec.encode_batch(events), number), count))
+            results.append(summarize(
+                'event_batch_decode', params,
+                measure(lambda: codec.decode_batch(batch), number), count))
+
+    results += run_clients(number)
+    return results
+
+
+def run_clients(number: int) -> list[dict]:
+    results: list[dict] = []
+    codec: Codec = Codec()
+    for count in ENTITY_COUNTS:
+        worlds: list[WorldSnapshot] = [make_world(tick_id, count) for tick_id in range(1, number + 1)]
+        views: list[frozenset[int]] = [
+            frozenset(range(view, count, VIEW_COUNT)) for view in range(VIEW_COUNT)]
+        params: dict = {'entities': count, 'clients': CLIENT_COUNT, 'views': VIEW_COUNT}
+
+        def encode_each(wsnapshots=iter(worlds)):
+            wsnapshot: WorldSnapshot = next(wsnapshots)
+            for client_id in range(CLIENT_COUNT):
+                interest: frozenset[int] = views[client_id % VIEW_COUNT]
+                codec.encode(WorldSnapshot(wsnapshot.get_tick_id(), [
+                    wsnapshot.get_snapshot(entity_id) for entity_id in interest]))
+
+        cache: PacketCache = PacketCache(codec)
+
+        def encode_cached(wsnapshots=iter(worlds)):
+            wsnapshot: WorldSnapshot = next(wsnapshots)
+            for client_id in range(CLIENT_COUNT):
+                cache.encode(client_id, wsnapshot, views[client_id % VIEW_COUNT])
+
+        results.append(summarize(
+            'tick_encode_clients', dict(params, cached=False), measure(encode_each, number), CLIENT_COUNT))
+        results.append(summarize(
+            'tick_encode_clients', dict(params, cached=True), measure(encode_cached, number), CLIENT_COUNT))
+    return results
+
+
+def main():
+    args = make_parser(__doc__).parse_args()
+    write_report(run(args.number), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from typing import Callable
+
+
+def measure(func: Callable[[], object], number: int) -> list[float]:
+    """
+    Call function many times.
+
+    :param func: function without arguments
+    :type func: callable
+
+    :param number: number of calls
+    :type number: int
+
+    :returns: duration of every call in seconds
+    :rtype: list
+    """
+    samples: list[float] = []
+    clock: Callable[[], float] = time.perf_counter
+    for _ in range(number):
+        start: float = clock()
+        func()
+        samples.append(clock() - start)
+    return samples
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    Get percentile of sorted samples using nearest rank.
+
+    :param samples: sorted samples
+    :type samples: list
+
+    :param q: percentile from 0 to 100
+    :type q: float
+
+    :returns: sample value
+    :rtype: float
+    """
+    index: int = min(len(samples) - 1, max(0, round(q / 100 * len(samples)) - 1))
+    return samples[index]
+
+
+def summarize(name: str, params: dict, samples: list[float], items: int = 1) -> dict:
+    """
+    Summarize call durations.
+
+    :param name: benchmark name
+    :type name: str
+
+    :param params: benchmark parameters
+    :type params: dict
+
+    :param samples: call durations in seconds
+    :type samples: list
+
+    :param items: number of items processed by every call
+    :type items: int
+
+    :returns: JSON serializable result
+    :rtype: dict
+    """
+    samples = sorted(samples)
+    total: float = sum(samples)
+    return {
+        'name': name,
+        'params': params,
+        'calls': len(samples),
+        'mean_us': total / len(samples) * 1e6,
+        'p50_us': percentile(samples, 50) * 1e6,
+        'p90_us': percentile(samples, 90) * 1e6,
+        'p99_us': percentile(samples, 99) * 1e6,
+        'max_us': samples[-1] * 1e6,
+        'items_per_second': len(samples) * items / total if total else None,  # too fast for the clock
+    }
+
+
+def make_parser(description: str) -> argparse.ArgumentParser:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=description)
+    parser.add_argument('-o', '--output', help='write JSON results into file')
+    parser.add_argument('-n', '--number', type=int, default=200, help='calls per benchmark')
+    return parser
+
+
+def write_report(results: list[dict], output: str | None = None):
+    """
+    Write results as JSON into file or standard output.
+
+    :param results: benchmark results
+    :type results: list
+
+    :param output: file path
+    :type output: str
+    """
+    report: dict = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'time': time.time(),
+        'results': results,
+    }
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
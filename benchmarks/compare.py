@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark reports.
+
+Usage: python -m benchmarks.compare old.json new.json [--metric p50_us]
+"""
+import argparse
+import json
+
+
+def get_key(result: dict) -> str:
+    params: dict = {k: v for k, v in result['params'].items() if k != 'bytes'}
+    return f"{result.get('suite', '')}:{result['name']} {json.dumps(params, sort_keys=True)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--metric', default='p50_us')
+    args = parser.parse_args()
+
+    with open(args.old) as f:
+        old: dict = {get_key(r): r for r in json.load(f)['results']}
+    with open(args.new) as f:
+        new: dict = {get_key(r): r for r in json.load(f)['results']}
+
+    for key in sorted(old.keys() & new.keys()):
+        before: float = old[key][args.metric]
+        after: float = new[key][args.metric]
+        if before is None or after is None:  # not measured
+            continue
+        ratio: float = after / before if before else float('inf')
+        print(f'{ratio:7.2f}x {before:12.2f} -> {after:12.2f}  {key}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Bandwidth saved by dead reckoning send suppression
+against the error it introduces on the client.
+
+Usage: python -m benchmarks.deadreckoning [-n TICKS] [-o results.json]
+"""
+import random
+
+from kitsunet.codec import Codec
+from kitsunet.deadreckoning import DeadReckoningFilter, DeadReckoningReceiver
+from kitsunet.math import distance3
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+from .common import make_parser, measure, summarize, write_report
+
+ENTITY_COUNT = 1000
+MOVING_PARTS = (0.0, 0.1, 0.5)  # part of the crowd walking, the rest is idle
+THRESHOLDS = (0.0, 0.01, 0.1, 0.5)
+TICK_RATE = 20
+SPEED = 0.05  # per tick
+REFRESH_INTERVAL = 40
+
+
+def make_worlds(count: int, moving: float, ticks: int) -> list[WorldSnapshot]:
+    """Crowd random walking, every walker turns once per second on average."""
+    rnd: random.Random = random.Random(1)
+    positions: list[tuple[float]] = [(rnd.uniform(-100, 100), rnd.uniform(-100, 100), 0.0) for _ in range(count)]
+    walkers: list[int] = rnd.sample(range(count), int(count * moving))
+    headings: dict[int, tuple[float]] = {}
+
+    worlds: list[WorldSnapshot] = []
+    for tick_id in range(1, ticks + 1):
+        for entity_id in walkers:
+            if entity_id not in headings or rnd.random() < 1 / TICK_RATE:
+                headings[entity_id] = (rnd.uniform(-SPEED, SPEED), rnd.uniform(-SPEED, SPEED), 0.0)
+            x, y, z = positions[entity_id]
+            dx, dy, _ = headings[entity_id]
+            positions[entity_id] = (x + dx, y + dy, z)
+        worlds.append(WorldSnapshot(tick_id, [
+            Snapshot(entity_id=entity_id, position=position)
+            for entity_id, position in enumerate(positions)
+        ]))
+    return worlds
+
+
+def run(number: int) -> list[dict]:
+    codec: Codec = Codec()
+    results: list[dict] = []
+    for moving in MOVING_PARTS:
+        worlds: list[WorldSnapshot] = make_worlds(ENTITY_COUNT, moving, number)
+        full_bytes: int = sum(len(codec.encode(wsnapshot)) for wsnapshot in worlds)
+
+        for threshold in THRESHOLDS:
+            drf: DeadReckoningFilter = DeadReckoningFilter(TICK_RATE, threshold, REFRESH_INTERVAL)
+            sent: list[WorldSnapshot] = []
+            ticks = iter(worlds)
+            samples: list[float] = measure(lambda: sent.append(drf.filter(1, next(ticks))), number)
+
+            receiver: DeadReckoningReceiver = DeadReckoningReceiver(TICK_RATE, REFRESH_INTERVAL * 2)
+            errors: list[float] = []
+            for wsnapshot, filtered in zip(worlds, sent):
+                merged: WorldSnapshot = receiver.merge(filtered)
+                for entity_id in wsnapshot.get_entity_ids():
+                    errors.append(distance3(
+                        merged.get_snapshot(entity_id).get_position(),
+                        wsnapshot.get_snapshot(entity_id).get_position()))
+
+            sent_bytes: int = sum(len(codec.encode(wsnapshot)) for wsnapshot in sent)
+            results.append(summarize('dead_reckoning_filter', {
+                'entities': ENTITY_COUNT,
+                'moving': moving,
+                'threshold': threshold,
+                'bytes_per_tick': sent_bytes / number,
+                'full_bytes_per_tick': full_bytes / number,
+                'saved': 1 - sent_bytes / full_bytes,
+                'suppressed': drf.get_suppression_rate(),
+                'mean_error': sum(errors) / len(errors),
+                'max_error': max(errors),
+            }, samples, ENTITY_COUNT))
+    return results
+
+
+def main():
+    args = make_parser(__doc__).parse_args()
+    write_report(run(args.number), args.output)
+
+
+if __name__ == '__main__':
+    main()
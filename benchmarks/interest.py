@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Interest management with random walking entities.
+
+Usage: python -m benchmarks.interest [-n CALLS] [-o results.json]
+"""
+import random
+
+from kitsunet.interest import InterestManager
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+from .common import make_parser, measure, summarize, write_report
+
+ENTITY_COUNTS = (1000, 10000, 20000)
+CLIENT_COUNT = 100
+WORLD_SIZE = 2000.0
+RADIUS = 100.0
+MOVING = 0.25  # part of entities moving every tick
+
+
+class RandomWalk:
+    def __init__(self, count: int):
+        self.rnd = random.Random(count)
+        self.tick_id = 0
+        self.snapshots = [
+            Snapshot(entity_id=entity_id, position=(
+                self.rnd.uniform(0, WORLD_SIZE), self.rnd.uniform(0, WORLD_SIZE), 0.0))
+            for entity_id in range(count)
+        ]
+
+    def step(self) -> WorldSnapshot:
+        self.tick_id += 1
+        for i in self.rnd.sample(range(len(self.snapshots)), int(len(self.snapshots) * MOVING)):
+            x, y, z = self.snapshots[i].get_position()
+            self.snapshots[i] = Snapshot(entity_id=i, position=(
+                x + self.rnd.uniform(-2, 2), y + self.rnd.uniform(-2, 2), z))
+        return WorldSnapshot(self.tick_id, self.snapshots)
+
+
+def run(number: int) -> list[dict]:
+    results: list[dict] = []
+
+    for count in ENTITY_COUNTS:
+        walk: RandomWalk = RandomWalk(count)
+        manager: InterestManager = InterestManager(RADIUS, RADIUS * 1.2)
+        for client_id in range(CLIENT_COUNT):
+            manager.add_client(client_id, entity_id=client_id)
+
+        worlds: list[WorldSnapshot] = [walk.step() for _ in range(number)]
+        manager.update(worlds[0])
+        updates = iter(worlds)
+        params: dict = {'entities': count, 'clients': CLIENT_COUNT, 'radius': RADIUS}
+        results.append(summarize(
+            'interest_update', params,
+            measure(lambda: manager.update(next(updates)), number), count))
+
+        wsnapshot: WorldSnapshot = worlds[-1]
+        visible: int = sum(len(manager.get_interest_set(c)) for c in range(CLIENT_COUNT))
+        results.append(summarize(
+            'interest_filter_all_clients', dict(params, visible=visible),
+            measure(lambda: [manager.filter(c, wsnapshot) for c in range(CLIENT_COUNT)], number),
+            CLIENT_COUNT))
+
+    return results
+
+
+def main():
+    args = make_parser(__doc__).parse_args()
+    write_report(run(args.number), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Lag compensation lookups in the world history.
+
+Usage: python -m benchmarks.lagcomp [-n CALLS] [-o results.json]
+"""
+import random
+
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.lagcomp import WorldHistory
+from kitsunet.snapshot import WorldSnapshot
+
+from .common import make_parser, measure, summarize, write_report
+from .playback import make_world
+
+ENTITY_COUNTS = (1000, 5000)
+HISTORY_SIZE = 64
+TARGETS = 8  # entities rewound per query
+
+
+def run(number: int) -> list[dict]:
+    results: list[dict] = []
+    rnd: random.Random = random.Random(1)
+    for world_class in (WorldSnapshot, ColumnarWorldSnapshot):
+        for count in ENTITY_COUNTS:
+            history: WorldHistory = WorldHistory(HISTORY_SIZE)
+            for tick_id in range(HISTORY_SIZE * 2):
+                history.record(make_world(tick_id, count, world_class))
+            first: int = history.get_first_tick_id()
+            queries: list[tuple[int, float]] = [
+                (rnd.randrange(first, first + HISTORY_SIZE), rnd.random()) for _ in range(number)]
+            entity_ids: list[int] = rnd.sample(range(count), TARGETS)
+            params: dict = {'entities': count, 'world': world_class.__name__, 'history': HISTORY_SIZE}
+
+            lookups = iter(queries)
+            results.append(summarize(
+                'history_bracket', params,
+                measure(lambda: history.get_bracket(*next(lookups)), number)))
+            lookups = iter(queries)
+            results.append(summarize(
+                'history_snapshot', params,
+                measure(lambda: history.get_snapshot(entity_ids[0], *next(lookups)), number)))
+            lookups = iter(queries)
+            results.append(summarize(
+                'history_snapshots', dict(params, targets=TARGETS),
+                measure(lambda: history.get_snapshots(entity_ids, *next(lookups)), number), TARGETS))
+    return results
+
+
+def main():
+    args = make_parser(__doc__).parse_args()
+    write_report(run(args.number), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+End to end input to display latency, stalls and interpolation error
+over simulated network links.
+
+Runs server, links and playback on a virtual clock, so results are
+reproducible and do not depend on the machine, only the per frame
+client cost is measured in real time.
+
+Usage: python -m benchmarks.latency [-n FRAMES] [-o results.json]
+    [--profiles lan,wifi,mobile] [--tick-rates 20,60]
+"""
+import time
+from typing import Callable
+
+from kitsunet import metrics as m
+from kitsunet.adaptive import AdaptivePlaybackSystem
+from kitsunet.event import Event
+from kitsunet.lagcomp import WorldHistory
+from kitsunet.math import distance3
+from kitsunet.metrics import Metrics
+from kitsunet.netsim import LinkSimulator
+from kitsunet.playback import PlaybackSystem
+from kitsunet.server import ServerSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+from .common import make_parser, percentile, summarize, write_report
+from .playback import parse_list
+
+PROFILES = ('lan', 'broadband', 'wifi', 'mobile', 'congested')
+PLAYBACKS = ('depth1', 'depth3', 'adaptive')
+TICK_RATES = (20, 60)
+FRAME_RATE = 60  # render rate in Hz
+CROWD = 100  # idle entities, so snapshots have realistic sizes
+SPEED = 1.0  # per second
+TOGGLE_INTERVAL = 1.0  # in seconds between direction changes, above any delay
+WARMUP = 1.0  # in seconds before measuring
+HISTORY_SIZE = 256
+
+
+def make_playback(name: str, tick_rate: int, link: LinkSimulator) -> PlaybackSystem:
+    if name == 'adaptive':
+        return AdaptivePlaybackSystem(tick_rate, clock=link.get_time)
+    return PlaybackSystem(tick_rate, target_depth=int(name.removeprefix('depth')))
+
+
+def simulate(profile: str, playback_name: str, tick_rate: int, frames: int, seed: int = 1) -> dict:
+    """
+    Player turns around periodically, every frame the client sends
+    its input up and displays the world it got down.
+    Latency is measured from a turn to the first displayed move
+    in the new direction.
+    """
+    dt: float = 1 / FRAME_RATE
+    velocity: float = SPEED / tick_rate ** 2  # moves velocity / tick duration per tick
+    server: ServerSystem = ServerSystem(tick_rate, WorldSnapshot(0, [
+        Snapshot(entity_id=entity_id, position=(float(entity_id), 0.0, 0.0))
+        for entity_id in range(CROWD + 1)
+    ]), history_size=HISTORY_SIZE)
+    history: WorldHistory = server.get_history()
+    uplink: LinkSimulator = LinkSimulator.from_profile(profile, seed=seed)
+    downlink: LinkSimulator = LinkSimulator.from_profile(profile, seed=seed + 1)
+    server.add_client(1, downlink)
+    playback: PlaybackSystem = make_playback(playback_name, tick_rate, downlink)
+    metrics: Metrics = Metrics()
+
+    direction: float = 1.0
+    turned: float | None = None  # time of the turn not displayed yet
+    last_x: float | None = None
+    latencies: list[float] = []
+    errors: list[float] = []
+    samples: list[float] = []
+    warmup: int = int(WARMUP * FRAME_RATE)
+    clock: Callable[[], float] = time.perf_counter
+
+    for frame in range(frames + warmup):
+        now: float = frame * dt
+        if frame == warmup:
+            playback.set_metrics(metrics)
+        if frame and frame % int(TOGGLE_INTERVAL * FRAME_RATE) == 0:
+            direction = -direction
+            turned = now if frame > warmup else None
+        uplink.send_event(Event(0, 0, (velocity * direction, 0.0, 0.0)))  # applied on the next tick
+
+        for event in uplink.advance(dt):
+            server.feed_event(event)
+        server.update(dt)
+        wsnapshots: list[WorldSnapshot] = downlink.advance(dt)
+
+        start: float = clock()
+        for wsnapshot in wsnapshots:
+            playback.feed_snapshot(wsnapshot)
+        playback.update(dt)
+        displayed: WorldSnapshot | None = playback.get_interpolated_snapshot()
+        if frame >= warmup:
+            samples.append(clock() - start)
+        if displayed is None:
+            continue
+
+        position: tuple[float] = displayed.get_snapshot(0).get_position()
+        if last_x is not None and turned is not None and (position[0] - last_x) * direction > 0:
+            latencies.append(now - turned)
+            turned = None
+        last_x = position[0]
+
+        if frame >= warmup:
+            actual: Snapshot | None = history.get_snapshot(
+                0, playback.get_tick_id() - 1, playback.get_interpolation_factor())
+            if actual is not None:
+                errors.append(distance3(position, actual.get_position()))
+
+    latencies.sort()
+    return {
+        'samples': samples,
+        'params': {
+            'profile': profile,
+            'playback': playback_name,
+            'tick_rate': tick_rate,
+            'frames': frames,
+            'turns': frames // int(TOGGLE_INTERVAL * FRAME_RATE),
+            'latency_mean_ms': sum(latencies) / len(latencies) * 1000 if latencies else None,
+            'latency_p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+            'latency_p90_ms': percentile(latencies, 90) * 1000 if latencies else None,
+            'stall_rate': metrics.get_counter(m.TICKS_STALLED) / frames,
+            'mean_error': sum(errors) / len(errors) if errors else None,
+            'max_error': max(errors, default=None),
+            'lost': downlink.get_lost_count() / max(1, downlink.get_sent_count()),
+        },
+    }
+
+
+def run(
+        number: int, profiles: tuple[str] = PROFILES,
+        tick_rates: tuple[int] = TICK_RATES) -> list[dict]:
+    frames: int = max(number, int(TOGGLE_INTERVAL * FRAME_RATE) * 4)
+    results: list[dict] = []
+    for profile in profiles:
+        for tick_rate in tick_rates:
+            for playback_name in PLAYBACKS:
+                result: dict = simulate(profile, playback_name, tick_rate, frames)
+                results.append(summarize('end_to_end', result['params'], result['samples']))
+    return results
+
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument('--profiles', type=lambda value: parse_list(value, str), default=PROFILES)
+    parser.add_argument('--tick-rates', type=parse_list, default=TICK_RATES)
+    args = parser.parse_args()
+    write_report(run(args.number, args.profiles, args.tick_rates), args.output)
+
+
+if __name__ == '__main__':
+    main()
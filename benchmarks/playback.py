@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Playback, prediction and world snapshot hot paths.
+
+Sweeps entity counts, tick rates, queue depths and arrival patterns.
+
+Usage: python -m benchmarks.playback [-n CALLS] [-o results.json]
+    [--entities 10,100,1000] [--tick-rates 20,60] [--depths 1,8,32]
+    [--patterns ordered,reversed,shuffled,lossy]
+"""
+import random
+from typing import Callable, Iterator
+
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.event import Event
+from kitsunet.playback import PlaybackSystem
+from kitsunet.prediction import PredictionSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+from kitsunet.view import InterpolatedWorldView
+
+from .common import make_parser, measure, summarize, write_report
+
+ENTITY_COUNTS = (10, 100, 1000)
+TICK_RATES = (20, 60)
+DEPTHS = (1, 8, 32)
+PATTERNS = ('ordered', 'reversed', 'shuffled', 'lossy')
+FRAME_RATE = 60  # render rate in Hz
+LOSS = 0.1
+VISIBLE = 16  # entities queried from a lazy view
+
+
+def make_world(tick_id: int, count: int, world_class: type = WorldSnapshot) -> WorldSnapshot:
+    return world_class(tick_id, [
+        Snapshot(entity_id=entity_id, position=(float(entity_id + tick_id), float(entity_id), 0.0))
+        for entity_id in range(count)
+    ])
+
+
+def arrival_order(tick_ids: list[int], pattern: str, rnd: random.Random) -> list[int]:
+    """
+    Reorder tick IDs as they would arrive over the network.
+
+    :param tick_ids: tick IDs in sending order
+    :type tick_ids: list
+
+    :param pattern: ordered, reversed, shuffled or lossy
+    :type pattern: str
+
+    :returns: tick IDs in arrival order
+    :rtype: list
+    """
+    tick_ids = list(tick_ids)
+    if pattern == 'reversed':
+        tick_ids.reverse()
+    elif pattern == 'shuffled':
+        rnd.shuffle(tick_ids)
+    elif pattern == 'lossy':  # some are lost, some swap with neighbours
+        tick_ids = [tick_id for tick_id in tick_ids if rnd.random() >= LOSS]
+        for i in range(len(tick_ids) - 1):
+            if rnd.random() < 0.2:
+                tick_ids[i], tick_ids[i + 1] = tick_ids[i + 1], tick_ids[i]
+    return tick_ids
+
+
+def arrival_frames(
+        tick_rate: int, frames: int, pattern: str,
+        rnd: random.Random) -> list[list[int]]:
+    """
+    Get tick IDs arriving during every rendered frame.
+    Ordered snapshots arrive with a constant latency,
+    others with up to two ticks of jitter.
+
+    :returns: tick IDs by frame
+    :rtype: list
+    """
+    tick_duration: float = 1 / tick_rate
+    frame_duration: float = 1 / FRAME_RATE
+    jitter: float = 0 if pattern == 'ordered' else tick_duration * 2
+
+    schedule: list[list[int]] = [[] for _ in range(frames)]
+    tick_id: int = 1
+    while tick_id * tick_duration < frames * frame_duration:
+        if pattern != 'lossy' or rnd.random() >= LOSS:
+            arrival: float = tick_id * tick_duration + rnd.uniform(0, jitter)
+            frame: int = int(arrival / frame_duration)
+            if frame < frames:
+                schedule[frame].append(tick_id)
+        tick_id += 1
+    return schedule
+
+
+def run_feed(number: int, count: int, depth: int, pattern: str) -> dict:
+    rnd: random.Random = random.Random(depth)
+    wsnapshots: dict[int, WorldSnapshot] = {
+        tick_id: make_world(tick_id, count) for tick_id in range(1, depth + 1)}
+    bursts: Iterator[list[WorldSnapshot]] = iter([
+        [wsnapshots[tick_id] for tick_id in arrival_order(list(wsnapshots), pattern, rnd)]
+        for _ in range(number)
+    ])
+    system: PlaybackSystem = PlaybackSystem(20, buffer_capacity=max(64, depth))
+
+    def feed():
+        for wsnapshot in next(bursts):
+            system.feed_snapshot(wsnapshot)
+        system.get_snapshot_queue().clear()
+
+    params: dict = {'entities': count, 'depth': depth, 'pattern': pattern}
+    return summarize('feed_snapshot', params, measure(feed, number), depth)
+
+
+def run_update(
+        number: int, count: int, tick_rate: int, depth: int, pattern: str,
+        system_class: type) -> dict:
+    rnd: random.Random = random.Random(tick_rate)
+    schedule: list[list[int]] = arrival_frames(tick_rate, number + depth, pattern, rnd)
+    system: PlaybackSystem = system_class(tick_rate)
+    system.get_snapshot_queue().set_target_depth(depth)
+    frames: Iterator[list[int]] = iter(schedule)
+    for _ in range(depth):  # fill the buffer
+        for tick_id in next(frames):
+            system.feed_snapshot(make_world(tick_id, count))
+    arrivals: list[list[WorldSnapshot]] = [
+        [make_world(tick_id, count) for tick_id in tick_ids] for tick_ids in frames]
+    feeds: Iterator[list[WorldSnapshot]] = iter(arrivals)
+    frame_duration: float = 1 / FRAME_RATE
+
+    def frame():
+        for wsnapshot in next(feeds):
+            system.feed_snapshot(wsnapshot)
+        system.update(frame_duration)
+
+    params: dict = {
+        'entities': count, 'tick_rate': tick_rate, 'depth': depth,
+        'pattern': pattern, 'system': system_class.__name__}
+    result: dict = summarize('update', params, measure(frame, len(arrivals)))
+    queue = system.get_snapshot_queue()
+    result['stats'] = {
+        'late': queue.get_late_count(),
+        'duplicate': queue.get_duplicate_count(),
+        'overflow': queue.get_overflow_count(),
+        'dropped': queue.get_drop_count(),
+    }
+    return result
+
+
+def run_world(number: int, count: int) -> list[dict]:
+    results: list[dict] = []
+    events: list[Event] = [Event(tick_id=1, entity_id=entity_id) for entity_id in range(count)]
+    for world_class in (WorldSnapshot, ColumnarWorldSnapshot):
+        wsnapshot_a: WorldSnapshot = make_world(1, count, world_class)
+        wsnapshot_b: WorldSnapshot = make_world(2, count, world_class)
+        params: dict = {'entities': count, 'world': world_class.__name__}
+        interpolate: Callable[[], WorldSnapshot] = lambda: wsnapshot_a.interpolate(wsnapshot_b, 0.5)
+        extrapolate: Callable[[], WorldSnapshot] = lambda: wsnapshot_a.extrapolate(events, 0.05, 2)
+        results.append(summarize('interpolate', params, measure(interpolate, number), count))
+        results.append(summarize('extrapolate', params, measure(extrapolate, number), count))
+
+        before: WorldSnapshot = make_world(0, count, world_class)
+        hermite: Callable[[], WorldSnapshot] = lambda: wsnapshot_a.interpolate_hermite(wsnapshot_b, 0.5, before)
+        results.append(summarize('interpolate_hermite', params, measure(hermite, number), count))
+
+        visible: list[int] = list(range(min(VISIBLE, count)))
+        view: Callable[[], dict] = lambda: InterpolatedWorldView(wsnapshot_a, wsnapshot_b, 0.5).get_snapshots(visible)
+        results.append(summarize('view', dict(params, visible=len(visible)), measure(view, number), len(visible)))
+    return results
+
+
+def run(
+        number: int, entity_counts: tuple[int] = ENTITY_COUNTS,
+        tick_rates: tuple[int] = TICK_RATES, depths: tuple[int] = DEPTHS,
+        patterns: tuple[str] = PATTERNS) -> list[dict]:
+    results: list[dict] = []
+    for count in entity_counts:
+        results += run_world(number, count)
+
+        for depth in depths:
+            for pattern in patterns:
+                results.append(run_feed(number, count, depth, pattern))
+
+        for tick_rate in tick_rates:
+            for depth in depths:
+                for pattern in patterns:
+                    if pattern == 'reversed':  # not meaningful for a stream
+                        continue
+                    for system_class in (PlaybackSystem, PredictionSystem):
+                        results.append(run_update(number, count, tick_rate, depth, pattern, system_class))
+    return results
+
+
+def parse_list(value: str, cast: type = int) -> tuple:
+    return tuple(cast(item) for item in value.split(','))
+
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument('--entities', type=parse_list, default=ENTITY_COUNTS)
+    parser.add_argument('--tick-rates', type=parse_list, default=TICK_RATES)
+    parser.add_argument('--depths', type=parse_list, default=DEPTHS)
+    parser.add_argument('--patterns', type=lambda value: parse_list(value, str), default=PATTERNS)
+    args = parser.parse_args()
+    write_report(run(args.number, args.entities, args.tick_rates, args.depths, args.patterns), args.output)
+
+
+if __name__ == '__main__':
+    main()
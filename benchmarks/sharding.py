@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Sharded world simulation across worker processes.
+
+Compares a tick of the sharded simulation with extrapolation
+of a columnar world snapshot in a single process.
+
+Usage: python -m benchmarks.sharding [-n CALLS] [-o results.json]
+    [--entities 100000,1000000] [--shards 1,2,4]
+"""
+import numpy as np
+
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.sharding import ShardedSimulation
+
+from .common import make_parser, measure, summarize, write_report
+from .playback import parse_list
+
+ENTITY_COUNTS = (100000, 1000000)
+SHARD_COUNTS = (1, 2, 4)
+TICK_RATE = 20
+
+
+def make_world(count: int) -> ColumnarWorldSnapshot:
+    positions: np.ndarray = np.random.default_rng(count).uniform(-1000, 1000, (count, 3))
+    return ColumnarWorldSnapshot.from_arrays(0, np.arange(count, dtype=np.int64), positions)
+
+
+def run(
+        number: int, entity_counts: tuple[int] = ENTITY_COUNTS,
+        shard_counts: tuple[int] = SHARD_COUNTS) -> list[dict]:
+    results: list[dict] = []
+    for count in entity_counts:
+        wsnapshot: ColumnarWorldSnapshot = make_world(count)
+        velocities: np.ndarray = np.full((count, 3), 0.01)
+
+        # the same kernel without workers
+        positions: list[np.ndarray] = [wsnapshot._positions.copy(), np.empty((count, 3))]
+        step: np.ndarray = np.empty((count, 3))
+        tick: list[int] = [0]
+
+        def single():
+            read: int = tick[0] % 2
+            np.divide(velocities, 1 / TICK_RATE, out=step)  # same as Snapshot.extrapolate
+            np.add(positions[read], step, out=positions[1 - read])
+            tick[0] += 1
+
+        results.append(summarize('simulation_step', {'entities': count, 'shards': 0}, measure(single, number), count))
+
+        for shards in shard_counts:
+            with ShardedSimulation(TICK_RATE, wsnapshot, shards=shards) as simulation:
+                simulation.feed_velocities(velocities)
+                results.append(summarize(
+                    'simulation_step', {'entities': count, 'shards': shards},
+                    measure(simulation.step, number), count))
+    return results
+
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument('--entities', type=parse_list, default=ENTITY_COUNTS)
+    parser.add_argument('--shards', type=parse_list, default=SHARD_COUNTS)
+    args = parser.parse_args()
+    write_report(run(args.number, args.entities, args.shards), args.output)
+
+
+if __name__ == '__main__':
+    main()
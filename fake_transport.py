@@ -0,0 +1,37 @@
+"""
+In-process datagram transport shared by the streamer tests.
+"""
+from kitsunet.streamer import Streamer
+
+
+class FakeTransport:
+    """In-process datagram transport which delivers into a peer streamer."""
+    def __init__(self, addr: tuple):
+        self.addr = addr
+        self.peer = None
+        self.packets = []
+        self.hold = False
+
+    def sendto(self, data: bytes, addr: tuple | None = None):
+        self.packets.append(data)
+        if not self.hold:
+            self.deliver()
+
+    def deliver(self):
+        while self.packets:
+            self.peer.datagram_received(self.packets.pop(0), self.addr)
+
+    def close(self):
+        pass
+
+
+def make_pair(**kwargs) -> tuple[Streamer, Streamer]:
+    server_transport = FakeTransport(('server', 1))
+    client_transport = FakeTransport(('client', 1))
+    server = Streamer(remote_addr=('client', 1), **kwargs.get('server', {}))
+    client = Streamer(remote_addr=('server', 1), **kwargs.get('client', {}))
+    server.connection_made(server_transport)
+    client.connection_made(client_transport)
+    server_transport.peer = client
+    client_transport.peer = server
+    return server, client
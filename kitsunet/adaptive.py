@@ -0,0 +1,256 @@
+import time
+from typing import Callable
+
+from . import metrics as m
+from .metrics import Metrics
+from .playback import PlaybackSystem
+from .snapshot import WorldSnapshot
+
+
+class AdaptivePlaybackSystem(PlaybackSystem):
+    """
+    Playback system with adaptive playout delay.
+
+    Estimates snapshot arrival jitter and keeps enough snapshots
+    buffered to ride it out. Instead of dropping queued snapshots,
+    the playout clock runs slightly faster when the buffer is deeper
+    than the target and slightly slower when it is shallower.
+    The target grows after every stall and slowly shrinks while
+    playback is smooth, so the stall rate converges to the given bound
+    with as little added latency as possible.
+    """
+    _clock: Callable[[], float]
+    _min_depth: int
+    _max_depth: int
+    _max_dilation: float
+    _dilation_gain: float
+    _stall_bound: float
+
+    _jitter: float  # in ms
+    _last_arrival: tuple[int, float] | None  # tick ID, arrival time in ms
+    _newest_tick_id: int
+    _margin: float  # in jitters
+    _margin_step: float
+    _target_depth: int
+    _depth: float  # moving average of buffered ticks
+    _playout_rate: float
+
+    _played_count: int
+    _stall_count: int
+    _stalled: bool
+
+    def __init__(
+            self, tick_rate: int, buffer_capacity: int = 64,
+            min_depth: int = 1, max_depth: int | None = None,
+            max_dilation: float = 0.1, dilation_gain: float = 0.05,
+            stall_bound: float = 0.01, clock: Callable[[], float] | None = None,
+            metrics: Metrics | None = None, inbox_capacity: int | None = None):
+        """
+        Create a new adaptive playback system.
+
+        :param tick_rate: tick rate in Hz, ex.: 20Hz
+        :type tick_rate: int
+
+        :param buffer_capacity: maximum number of queued snapshots
+        :type buffer_capacity: int
+
+        :param min_depth: lowest target number of queued snapshots
+        :type min_depth: int
+
+        :param max_depth: highest target number of queued snapshots,
+            older snapshots above it are dropped, half of capacity by default
+        :type max_depth: int
+
+        :param max_dilation: maximum playout clock speed change, ex.: 0.1 is ±10%
+        :type max_dilation: float
+
+        :param dilation_gain: playout clock speed change per snapshot of depth error
+        :type dilation_gain: float
+
+        :param stall_bound: acceptable part of ticks which stall
+        :type stall_bound: float
+
+        :param clock: arrival time source in seconds
+        :type clock: callable
+
+        :param metrics: metrics to report into, disabled if None
+        :type metrics: :class:`kitsunet.metrics.Metrics`
+
+        :param inbox_capacity: maximum number of snapshots pushed from another
+            thread between updates, buffer capacity by default
+        :type inbox_capacity: int
+        """
+        if not 0 < stall_bound < 1:
+            raise ValueError('stall bound must be between 0 and 1')
+
+        max_depth = max(min_depth, max_depth or buffer_capacity // 2)
+        super().__init__(tick_rate, buffer_capacity, max_depth, metrics, inbox_capacity=inbox_capacity)
+        self._clock = clock or time.monotonic
+        self._min_depth = min_depth
+        self._max_depth = max_depth
+        self._max_dilation = max_dilation
+        self._dilation_gain = dilation_gain
+        self._stall_bound = stall_bound
+
+        self._jitter = 0
+        self._last_arrival = None
+        self._newest_tick_id = 0
+        self._margin = 2.0
+        self._margin_step = 0.5
+        self._target_depth = min_depth
+        self._depth = min_depth
+        self._playout_rate = 1.0
+
+        self._played_count = 0
+        self._stall_count = 0
+        self._stalled = False
+
+    def get_jitter(self) -> float:
+        """
+        Get estimated arrival jitter.
+
+        :returns: jitter in seconds
+        :rtype: float
+        """
+        return self._jitter / 1000
+
+    def get_target_depth(self) -> int:
+        """
+        Get number of buffered ticks the playout clock converges to.
+
+        :returns: number of ticks
+        :rtype: int
+        """
+        return self._target_depth
+
+    def get_depth(self) -> float:
+        """
+        Get number of buffered ticks between the playout time
+        and the newest received snapshot.
+
+        :returns: number of ticks
+        :rtype: float
+        """
+        if not self._next_snapshot:
+            return float(len(self._snapshot_queue))
+        return self._newest_tick_id - self.get_tick_id() + (self._tick_time - self._real_time) / self._tick_duration
+
+    def get_playout_rate(self) -> float:
+        """
+        Get playout clock speed of the last update.
+
+        :returns: speed, 1.0 is real time
+        :rtype: float
+        """
+        return self._playout_rate
+
+    def get_stall_rate(self) -> float:
+        """
+        Get number of stalls per played tick.
+
+        :returns: stall rate from 0.0 to 1.0
+        :rtype: float
+        """
+        if not self._played_count:
+            return 0.0
+        return self._stall_count / self._played_count
+
+    def set_min_depth(self, min_depth: int):
+        self._min_depth = max(0, min(min_depth, self._max_depth))
+        self._update_target_depth()
+
+    def feed_snapshot(self, snapshot: WorldSnapshot, arrival_time: float | None = None):
+        """
+        Feed snapshot into queue.
+
+        :param snapshot: snapshot
+        :type snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param arrival_time: arrival time in seconds, clock time by default
+        :type arrival_time: float
+        """
+        if arrival_time is None:
+            arrival_time = self._clock()
+        self._estimate_jitter(snapshot.get_tick_id(), arrival_time * 1000)
+        self._newest_tick_id = max(self._newest_tick_id, snapshot.get_tick_id())
+
+        super().feed_snapshot(snapshot)
+
+    def push_snapshot(self, snapshot: WorldSnapshot, arrival_time: float | None = None) -> bool:
+        """
+        Push snapshot from the network thread.
+        Arrival time is taken on push, not when the snapshot is fed.
+
+        :param snapshot: snapshot
+        :type snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param arrival_time: arrival time in seconds, clock time by default
+        :type arrival_time: float
+
+        :returns: was snapshot accepted? False if too many are pending
+        :rtype: bool
+        """
+        if arrival_time is None:
+            arrival_time = self._clock()
+        return self._snapshot_inbox.push((snapshot, arrival_time))
+
+    def _feed_pushed(self, item: tuple[WorldSnapshot, float]):
+        self.feed_snapshot(*item)
+
+    def reset(self):
+        super().reset()
+        self._last_arrival = None
+        self._newest_tick_id = 0
+        self._depth = self._target_depth
+        self._stalled = False
+
+    def _estimate_jitter(self, tick_id: int, arrival_time: float):
+        """
+        Interarrival jitter estimate as in RFC 3550, section 6.4.1:
+        smoothed difference of transit times of consecutive arrivals.
+        """
+        if self._last_arrival:
+            last_tick_id, last_arrival_time = self._last_arrival
+            difference: float = (
+                (arrival_time - last_arrival_time) -
+                (tick_id - last_tick_id) * self._tick_duration)
+            self._jitter += (abs(difference) - self._jitter) / 16
+            self._update_target_depth()
+
+        self._last_arrival = (tick_id, arrival_time)
+
+    def _update_target_depth(self):
+        depth: int = self._min_depth + round(self._margin * self._jitter / self._tick_duration)
+        self._target_depth = min(depth, self._max_depth)
+
+    def _do_step(self) -> bool:
+        if not super()._do_step():
+            if not self._stalled:
+                self._stalled = True
+                self._stall_count += 1
+                self._margin += self._margin_step
+                self._update_target_depth()
+            return False
+
+        # shrink margin, so one stall per (1 - bound) / bound played ticks keeps it
+        self._stalled = False
+        self._played_count += 1
+        self._margin = max(0.0, self._margin - self._margin_step * self._stall_bound / (1 - self._stall_bound))
+        return True
+
+    def update(self, dt: float):
+        """
+        Advances time at the playout clock speed.
+
+        :param dt: delta time in seconds
+        :type dt: float
+        """
+        error: float = self._depth - self._target_depth
+        self._playout_rate = 1 + max(-self._max_dilation, min(self._max_dilation, error * self._dilation_gain))
+
+        super().update(dt * self._playout_rate)
+
+        self._depth += (self.get_depth() - self._depth) / 8
+        if self._metrics is not None:
+            self._metrics.observe(m.PLAYOUT_RATE, self._playout_rate)
+            self._metrics.observe(m.JITTER, self._jitter / 1000)
@@ -0,0 +1,232 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Self
+
+import numpy as np
+
+from .kernel import LinearKernel
+
+
+class BatchPredictionSystem:
+    """
+    Many headless prediction systems advanced together.
+
+    Keeps clock, input and predicted local entity state of N clients
+    in arrays and advances all of them with vectorized operations.
+    Every client behaves as a :class:`kitsunet.prediction.PredictionSystem`
+    which is never fed snapshots, ex.: a load testing bot: the latest fed
+    velocity is repeated every tick, same as the latest queued event.
+    """
+    _tick_rate: int  # in Hz
+    _tick_duration: float  # in ms
+
+    _tick_ids: np.ndarray  # (N,) int
+    _tick_times: np.ndarray  # (N,) in ms
+    _real_times: np.ndarray  # (N,) in ms
+    _stepped: np.ndarray  # (N,) bool, has previous snapshot
+    _positions: np.ndarray  # (N, 3) next snapshot
+    _prev_positions: np.ndarray  # (N, 3) previous snapshot
+    _velocities: np.ndarray  # (N, 3) latest input
+    _kernel: LinearKernel | None
+
+    def __init__(self, tick_rate: int, positions: np.ndarray, kernel: LinearKernel | None = None):
+        """
+        Create a new batch of prediction systems.
+
+        :param tick_rate: tick rate in Hz, ex.: 20Hz
+        :type tick_rate: int
+
+        :param positions: Nx3 array of initial local entity positions
+        :type positions: :class:`numpy.ndarray`
+
+        :param kernel: motion rule, linear by default
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+        """
+        count: int = len(positions)
+        self._tick_rate = tick_rate
+        self._tick_duration = 1 / tick_rate * 1000
+
+        self._tick_ids = np.zeros(count, dtype=np.int64)
+        self._tick_times = np.zeros(count, dtype=np.float64)
+        self._real_times = np.zeros(count, dtype=np.float64)
+        self._stepped = np.zeros(count, dtype=bool)
+        self._positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        self._prev_positions = self._positions.copy()
+        self._velocities = np.zeros((count, 3), dtype=np.float64)
+        self._kernel = kernel
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._tick_rate}Hz x{len(self)}>'
+
+    def __len__(self) -> int:
+        return len(self._tick_ids)
+
+    def get_tick_ids(self) -> np.ndarray:
+        return self._tick_ids
+
+    def get_tick_times(self) -> np.ndarray:
+        """
+        Get time of the next tick of every client.
+
+        :returns: times in seconds
+        :rtype: :class:`numpy.ndarray`
+        """
+        return self._tick_times / 1000
+
+    def get_real_times(self) -> np.ndarray:
+        """
+        Get real time of every client.
+
+        :returns: times in seconds
+        :rtype: :class:`numpy.ndarray`
+        """
+        return self._real_times / 1000
+
+    def get_positions(self) -> np.ndarray:
+        """
+        Get predicted local entity positions of the next tick.
+
+        :returns: Nx3 array
+        :rtype: :class:`numpy.ndarray`
+        """
+        return self._positions
+
+    def get_interpolation_factors(self) -> np.ndarray:
+        """
+        Get interpolation factor of every client.
+
+        :returns: factors from 0.0 to 1.0
+        :rtype: :class:`numpy.ndarray`
+        """
+        factors: np.ndarray = 1 - (self._tick_times - self._real_times) / self._tick_duration
+        return np.where(self._stepped, factors, 1.0)
+
+    def get_interpolated_positions(self) -> np.ndarray:
+        """
+        Get interpolated local entity positions.
+
+        :returns: Nx3 array
+        :rtype: :class:`numpy.ndarray`
+        """
+        factors: np.ndarray = self.get_interpolation_factors()[:, None]
+        interpolated: np.ndarray = self._prev_positions * (1 - factors) + self._positions * factors
+        return np.where(factors == 1.0, self._positions, interpolated)
+
+    def feed_velocities(self, velocities: np.ndarray, mask: np.ndarray | None = None):
+        """
+        Feed input of many clients at once.
+
+        :param velocities: Nx3 array of velocities, or Mx3 with mask
+        :type velocities: :class:`numpy.ndarray`
+
+        :param mask: clients to feed, all if None
+        :type mask: :class:`numpy.ndarray`
+        """
+        if mask is None:
+            self._velocities[:] = velocities
+        else:
+            self._velocities[mask] = velocities
+
+    def update(self, dt: float):
+        """
+        Advances time of all the clients.
+
+        :param dt: delta time in seconds
+        :type dt: float
+        """
+        real_times: np.ndarray = self._real_times + dt * 1000
+        step_dt: float = self._tick_duration / 1000
+
+        # step clients one tick at a time, so floating point sums
+        # are the same as in the individual systems
+        mask: np.ndarray = self._tick_times < real_times
+        while mask.any():
+            self._prev_positions[mask] = self._positions[mask]
+            if self._kernel is not None:  # latest input is repeated, not the velocity the kernel changed
+                self._positions[mask], _ = self._kernel.step(self._positions[mask], self._velocities[mask], step_dt)
+            elif step_dt != 0:  # same as the linear kernel
+                self._positions[mask] += self._velocities[mask] / step_dt
+            self._tick_ids[mask] += 1
+            self._tick_times[mask] += self._tick_duration
+            self._stepped |= mask
+            mask = self._tick_times < real_times
+
+        self._real_times = real_times
+
+    def split(self, parts: int) -> list[Self]:
+        """
+        Split clients into smaller batches.
+
+        :param parts: number of batches
+        :type parts: int
+
+        :returns: batches
+        :rtype: list
+        """
+        batches: list[Self] = []
+        for rows in np.array_split(np.arange(len(self)), parts):
+            batch: Self = self.__class__(self._tick_rate, self._positions[rows], self._kernel)
+            batch._tick_ids = self._tick_ids[rows]
+            batch._tick_times = self._tick_times[rows]
+            batch._real_times = self._real_times[rows]
+            batch._stepped = self._stepped[rows]
+            batch._prev_positions = self._prev_positions[rows]
+            batch._velocities = self._velocities[rows]
+            batches.append(batch)
+        return batches
+
+    @classmethod
+    def merge(cls, batches: list[Self]) -> Self:
+        """
+        Join batches of clients.
+
+        :param batches: batches with the same tick rate
+        :type batches: list
+
+        :returns: batch
+        :rtype: :class:`kitsunet.batch.BatchPredictionSystem`
+        """
+        batch: Self = cls(
+            batches[0]._tick_rate, np.concatenate([b._positions for b in batches]), batches[0]._kernel)
+        batch._tick_ids = np.concatenate([b._tick_ids for b in batches])
+        batch._tick_times = np.concatenate([b._tick_times for b in batches])
+        batch._real_times = np.concatenate([b._real_times for b in batches])
+        batch._stepped = np.concatenate([b._stepped for b in batches])
+        batch._prev_positions = np.concatenate([b._prev_positions for b in batches])
+        batch._velocities = np.concatenate([b._velocities for b in batches])
+        return batch
+
+
+def _advance(batch: BatchPredictionSystem, dt: float, frames: int) -> BatchPredictionSystem:
+    for _ in range(frames):
+        batch.update(dt)
+    return batch
+
+
+def run_parallel(
+        batch: BatchPredictionSystem, dt: float, frames: int,
+        executor: ProcessPoolExecutor, parts: int | None = None) -> BatchPredictionSystem:
+    """
+    Advance clients for many frames spreading work across processes.
+
+    :param batch: clients
+    :type batch: :class:`kitsunet.batch.BatchPredictionSystem`
+
+    :param dt: delta time of every frame in seconds
+    :type dt: float
+
+    :param frames: number of frames
+    :type frames: int
+
+    :param executor: process pool
+    :type executor: :class:`concurrent.futures.ProcessPoolExecutor`
+
+    :param parts: number of batches, number of CPUs by default
+    :type parts: int
+
+    :returns: advanced clients
+    :rtype: :class:`kitsunet.batch.BatchPredictionSystem`
+    """
+    batches: list[BatchPredictionSystem] = batch.split(parts or os.cpu_count() or 1)
+    return BatchPredictionSystem.merge(list(executor.map(
+        _advance, batches, [dt] * len(batches), [frames] * len(batches))))
@@ -0,0 +1,178 @@
+from .codec import Codec
+from .delta import diff
+from .snapshot import Snapshot, WorldSnapshot
+
+_ALL = None  # interest of clients receiving the whole world
+
+
+class PacketCache:
+    """
+    Encode-once cache of world snapshot payloads shared by clients.
+
+    Payloads are delta snapshots keyed by tick ID, baseline tick ID
+    and interest sets of the client at both ticks, so clients which see
+    the same part of the world against the same baseline get the same
+    bytes object and the world snapshot is encoded once per unique view
+    instead of once per client. Interest sets are compared as frozensets,
+    their hashes are computed once per set. Ticks older than the history
+    window are evicted.
+    """
+    _codec: Codec
+    _history_size: int
+
+    _views: dict[int, dict[frozenset[int] | None, WorldSnapshot]]  # tick ID -> interest -> filtered world
+    _payloads: dict[int, dict[tuple, bytes]]  # tick ID -> key -> encoded item
+    _sent: dict[int, dict[int, frozenset[int] | None]]  # client ID -> tick ID -> interest
+    _acknowledged: dict[int, int]  # client ID -> tick ID
+
+    _hit_count: int
+    _miss_count: int
+
+    def __init__(self, codec: Codec | None = None, history_size: int = 32):
+        """
+        Create a new packet cache.
+
+        :param codec: codec of the payloads
+        :type codec: :class:`kitsunet.codec.Codec`
+
+        :param history_size: number of ticks kept as baselines
+        :type history_size: int
+        """
+        if history_size < 1:
+            raise ValueError('history size must be positive')
+
+        self._codec = codec or Codec()
+        self._history_size = history_size
+        self._views = {}
+        self._payloads = {}
+        self._sent = {}
+        self._acknowledged = {}
+        self._hit_count = 0
+        self._miss_count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} ({len(self._views)} ticks, {len(self._sent)} clients)>'
+
+    def get_hit_count(self) -> int:
+        return self._hit_count
+
+    def get_miss_count(self) -> int:
+        """
+        Get number of encoded payloads.
+
+        :returns: number of payloads
+        :rtype: int
+        """
+        return self._miss_count
+
+    def get_payload_count(self, tick_id: int) -> int:
+        """
+        Get number of unique payloads of the tick.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :returns: number of payloads
+        :rtype: int
+        """
+        return len(self._payloads.get(tick_id, ()))
+
+    def remove_client(self, client_id: int):
+        self._sent.pop(client_id, None)
+        self._acknowledged.pop(client_id, None)
+
+    def acknowledge(self, client_id: int, tick_id: int):
+        """
+        Mark world snapshot as received by the client.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :param tick_id: tick ID of the received world snapshot
+        :type tick_id: int
+        """
+        if tick_id > self._acknowledged.get(client_id, -1):
+            self._acknowledged[client_id] = tick_id
+
+    def _get_view(self, wsnapshot: WorldSnapshot, interest: frozenset[int] | None) -> WorldSnapshot:
+        """
+        Get world snapshot of the tick with the entities of interest only.
+        """
+        views: dict[frozenset[int] | None, WorldSnapshot] = self._views[wsnapshot.get_tick_id()]
+        view: WorldSnapshot | None = views.get(interest)
+        if view is None:
+            if interest is _ALL:
+                view = wsnapshot
+            else:
+                snapshots: list[Snapshot] = []
+                for entity_id in interest:
+                    snapshot: Snapshot | None = wsnapshot.get_snapshot(entity_id)
+                    if snapshot:
+                        snapshots.append(snapshot)
+                view = WorldSnapshot(tick_id=wsnapshot.get_tick_id(), snapshots=snapshots)
+            views[interest] = view
+        return view
+
+    def _evict(self, tick_id: int):
+        oldest: int = tick_id - self._history_size
+        for stale in [stale for stale in self._views if stale <= oldest]:
+            del self._views[stale]
+            self._payloads.pop(stale, None)
+
+        for sent in self._sent.values():
+            for stale in [stale for stale in sent if stale <= oldest]:
+                del sent[stale]
+
+    def _get_baseline(self, client_id: int) -> tuple[int | None, frozenset[int] | None]:
+        tick_id: int | None = self._acknowledged.get(client_id)
+        sent: dict[int, frozenset[int] | None] = self._sent.get(client_id, {})
+        if tick_id is None or tick_id not in sent or tick_id not in self._views:
+            return None, None
+        return tick_id, sent[tick_id]
+
+    def encode(
+            self, client_id: int, wsnapshot: WorldSnapshot,
+            interest: frozenset[int] | None = _ALL) -> bytes:
+        """
+        Get encoded world snapshot for the client.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :param wsnapshot: world snapshot of the current tick
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param interest: IDs of the entities relevant to the client,
+            ex.: :meth:`kitsunet.interest.InterestManager.get_interest_set`,
+            the whole world if None
+        :type interest: frozenset
+
+        :returns: encoded delta snapshot item,
+            ex.: for :meth:`kitsunet.streamer.Streamer.send_encoded`
+        :rtype: bytes
+        """
+        tick_id: int = wsnapshot.get_tick_id()
+        if tick_id not in self._views:
+            self._views[tick_id] = {}
+            self._payloads[tick_id] = {}
+            self._evict(tick_id)
+
+        baseline_tick_id, baseline_interest = self._get_baseline(client_id)
+        self._sent.setdefault(client_id, {})[tick_id] = interest
+
+        key: tuple = (baseline_tick_id, baseline_interest, interest)
+        payloads: dict[tuple, bytes] = self._payloads[tick_id]
+        payload: bytes | None = payloads.get(key)
+        if payload is not None:
+            self._hit_count += 1
+            return payload
+
+        baseline: WorldSnapshot | None = None
+        if baseline_tick_id is not None:
+            baseline = self._views[baseline_tick_id][baseline_interest]
+
+        buffer: bytearray = bytearray()
+        self._codec.write_item(buffer, diff(baseline, self._get_view(wsnapshot, interest)))
+        payload = payloads[key] = bytes(buffer)
+        self._miss_count += 1
+        return payload
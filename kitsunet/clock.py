@@ -0,0 +1,290 @@
+import math
+import statistics
+import time
+from collections import deque
+from typing import Callable
+
+from .adaptive import AdaptivePlaybackSystem
+from .playback import PlaybackSystem
+
+
+class ClockSync:
+    """
+    Client side estimate of the server tick clock.
+
+    Timestamps are exchanged as in NTP: the client sends its time,
+    the server replies with its receive and send times, ex.:
+    :meth:`kitsunet.server.ServerSystem.get_tick_time`, and the client
+    adds its receive time. Each exchange gives a round trip time and
+    a clock offset sample. Samples with a round trip much longer than
+    the median of the window are rejected as outliers, unless they
+    persist, ex.: after a route change. The offset is taken from the
+    sample with the shortest round trip, which has the least asymmetric
+    queueing error.
+
+    The estimate tells how many ticks playback should stay behind
+    the server and which tick local input should be stamped with,
+    so it arrives before the server simulates that tick.
+    """
+    _clock: Callable[[], float]
+    _tick_rate: int  # in Hz
+    _tick_duration: float  # in ms
+    _window: deque[tuple[float, float]]  # round trip time, offset, in ms
+    _outlier_factor: float
+    _margin: float  # in jitters
+    _min_depth: int
+
+    _rtt: float  # in ms
+    _offset: float  # in ms
+    _jitter: float  # in ms
+    _sample_count: int
+    _rejected_count: int
+    _rejected_run: int  # consecutive rejections
+
+    def __init__(
+            self, tick_rate: int, window: int = 16, outlier_factor: float = 3.0,
+            margin: float = 2.0, min_depth: int = 1,
+            clock: Callable[[], float] | None = None):
+        """
+        Create a new clock synchronization.
+
+        :param tick_rate: tick rate in Hz, ex.: 20Hz
+        :type tick_rate: int
+
+        :param window: number of kept samples
+        :type window: int
+
+        :param outlier_factor: samples with round trip time more than this
+            many deviations above the median are rejected
+        :type outlier_factor: float
+
+        :param margin: number of jitters added to the delay and lead
+        :type margin: float
+
+        :param min_depth: lowest number of buffered snapshots
+        :type min_depth: int
+
+        :param clock: local time source in seconds
+        :type clock: callable
+        """
+        if window < 1:
+            raise ValueError('window must be positive')
+
+        self._clock = clock or time.monotonic
+        self._tick_rate = tick_rate
+        self._tick_duration = 1 / tick_rate * 1000
+        self._window = deque(maxlen=window)
+        self._outlier_factor = outlier_factor
+        self._margin = margin
+        self._min_depth = min_depth
+
+        self._rtt = 0
+        self._offset = 0
+        self._jitter = 0
+        self._sample_count = 0
+        self._rejected_count = 0
+        self._rejected_run = 0
+
+    def __str__(self) -> str:
+        return (
+            f'<{self.__class__.__name__} {self._tick_rate}Hz '
+            f'rtt={self._rtt:.1f}ms offset={self._offset:.1f}ms>')
+
+    def get_time(self) -> float:
+        """
+        Get local time to send to the server.
+
+        :returns: time in seconds
+        :rtype: float
+        """
+        return self._clock()
+
+    def is_synchronized(self) -> bool:
+        return bool(self._window)
+
+    def get_sample_count(self) -> int:
+        return self._sample_count
+
+    def get_rejected_count(self) -> int:
+        """
+        Get number of samples rejected as outliers.
+
+        :returns: number of samples
+        :rtype: int
+        """
+        return self._rejected_count
+
+    def get_rtt(self) -> float:
+        """
+        Get median round trip time.
+
+        :returns: time in seconds
+        :rtype: float
+        """
+        return self._rtt / 1000
+
+    def get_offset(self) -> float:
+        """
+        Get server clock minus local clock.
+
+        :returns: time in seconds
+        :rtype: float
+        """
+        return self._offset / 1000
+
+    def get_jitter(self) -> float:
+        """
+        Get median deviation of round trip time.
+
+        :returns: time in seconds
+        :rtype: float
+        """
+        return self._jitter / 1000
+
+    def add_sample(
+            self, client_send: float, server_receive: float, server_send: float,
+            client_receive: float | None = None) -> bool:
+        """
+        Add timestamps of a single exchange.
+
+        :param client_send: local time of the request in seconds
+        :type client_send: float
+
+        :param server_receive: server time of the request in seconds
+        :type server_receive: float
+
+        :param server_send: server time of the reply in seconds
+        :type server_send: float
+
+        :param client_receive: local time of the reply in seconds, clock time by default
+        :type client_receive: float
+
+        :returns: was sample accepted? False if it is an outlier
+        :rtype: bool
+        """
+        if client_receive is None:
+            client_receive = self._clock()
+
+        rtt: float = ((client_receive - client_send) - (server_send - server_receive)) * 1000
+        offset: float = ((server_receive - client_send) + (server_send - client_receive)) / 2 * 1000
+        self._sample_count += 1
+
+        if rtt < 0 or self._is_outlier(rtt):
+            self._rejected_count += 1
+            self._rejected_run += 1
+            if rtt < 0 or self._rejected_run < self._window.maxlen // 2 + 1:
+                return False
+            self._window.clear()  # persistent change of the link
+
+        self._rejected_run = 0
+        self._window.append((rtt, offset))
+        self._estimate()
+        return True
+
+    def _is_outlier(self, rtt: float) -> bool:
+        if len(self._window) < 4:
+            return False
+        # deviation is at least a millisecond, so a steady link does not reject everything
+        return rtt > self._rtt + self._outlier_factor * max(self._jitter, 1.0)
+
+    def _estimate(self):
+        rtts: list[float] = [rtt for rtt, _ in self._window]
+        self._rtt = statistics.median(rtts)
+        self._jitter = statistics.median(abs(rtt - self._rtt) for rtt in rtts)
+        _, self._offset = min(self._window)
+
+    def get_server_time(self, local_time: float | None = None) -> float:
+        """
+        Get estimated server time.
+
+        :param local_time: local time in seconds, clock time by default
+        :type local_time: float
+
+        :returns: time in seconds
+        :rtype: float
+        """
+        if local_time is None:
+            local_time = self._clock()
+        return local_time + self._offset / 1000
+
+    def get_server_tick(self, local_time: float | None = None) -> float:
+        """
+        Get estimated fractional tick the server is on.
+
+        :param local_time: local time in seconds, clock time by default
+        :type local_time: float
+
+        :returns: tick
+        :rtype: float
+        """
+        return self.get_server_time(local_time) * 1000 / self._tick_duration
+
+    def get_target_depth(self) -> int:
+        """
+        Get number of snapshots to buffer against jitter.
+
+        :returns: number of ticks
+        :rtype: int
+        """
+        ticks: float = round(self._margin * self._jitter / self._tick_duration, 3)  # float noise of timestamps
+        return self._min_depth + math.ceil(ticks)
+
+    def get_playback_delay(self) -> float:
+        """
+        Get how far behind the server clock playback should run:
+        one way trip, the buffered ticks and the interpolated tick.
+
+        :returns: time in seconds
+        :rtype: float
+        """
+        return (self._rtt / 2 + (self.get_target_depth() + 1) * self._tick_duration) / 1000
+
+    def get_playback_tick(self, local_time: float | None = None) -> float:
+        """
+        Get fractional tick playback should be on.
+
+        :param local_time: local time in seconds, clock time by default
+        :type local_time: float
+
+        :returns: tick
+        :rtype: float
+        """
+        return self.get_server_tick(local_time) - self.get_playback_delay() * 1000 / self._tick_duration
+
+    def get_prediction_lead(self) -> float:
+        """
+        Get how far ahead of the server clock input should be stamped:
+        one way trip with the jitter margin.
+
+        :returns: time in seconds
+        :rtype: float
+        """
+        return (self._rtt / 2 + self._margin * self._jitter) / 1000
+
+    def get_input_tick_id(self, local_time: float | None = None) -> int:
+        """
+        Get tick ID to stamp local input events with,
+        ex.: for :meth:`kitsunet.prediction.PredictionSystem.feed_event`.
+
+        :param local_time: local time in seconds, clock time by default
+        :type local_time: float
+
+        :returns: tick ID
+        :rtype: int
+        """
+        lead: float = self.get_prediction_lead() * 1000 / self._tick_duration
+        return math.ceil(self.get_server_tick(local_time) + lead)
+
+    def apply(self, playback: PlaybackSystem):
+        """
+        Set buffered snapshots of the playback system.
+        Adaptive playback only gets the lower bound of its own target.
+
+        :param playback: playback or prediction system
+        :type playback: :class:`kitsunet.playback.PlaybackSystem`
+        """
+        depth: int = self.get_target_depth()
+        if isinstance(playback, AdaptivePlaybackSystem):
+            playback.set_min_depth(depth)
+        else:
+            playback.get_snapshot_queue().set_target_depth(depth)
@@ -0,0 +1,536 @@
+import struct
+
+from .delta import DeltaSnapshot
+from .event import Event
+from .redundancy import EventBatch
+from .snapshot import Snapshot, WorldSnapshot
+
+CODEC_VERSION = 1
+
+TYPE_SNAPSHOT = 1
+TYPE_WORLD_SNAPSHOT = 2
+TYPE_EVENT = 3
+TYPE_EVENT_BATCH = 4
+TYPE_DELTA_SNAPSHOT = 5
+
+FLAG_POSITION_QUANTIZED = 0x01
+FLAG_VELOCITY_QUANTIZED = 0x02
+FLAG_DOUBLE_PRECISION = 0x04
+
+_HEADER = struct.Struct('<BB')  # version, flags
+_FLOAT3 = struct.Struct('<3f')
+_DOUBLE3 = struct.Struct('<3d')
+
+
+def write_varint(buffer: bytearray, value: int):
+    """
+    Write unsigned integer in LEB128 format.
+
+    :param buffer: output buffer
+    :type buffer: bytearray
+
+    :param value: non-negative integer
+    :type value: int
+    """
+    if value < 0:
+        raise ValueError('varint must be non-negative')
+
+    while value > 0x7f:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(buffer: memoryview | bytes, offset: int) -> tuple[int, int]:
+    """
+    Read unsigned integer in LEB128 format.
+
+    :param buffer: input buffer
+    :type buffer: memoryview
+
+    :param offset: read offset
+    :type offset: int
+
+    :returns: value and offset after it
+    :rtype: tuple
+    """
+    value: int = 0
+    shift: int = 0
+    while True:
+        byte: int = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Quantizer:
+    """
+    Maps 3D vectors with components within bounds
+    to unsigned integers of fixed bit width.
+    """
+    _minimum: float
+    _maximum: float
+    _bits: int
+    _steps: int
+    _scale: float
+    _size: int  # in bytes
+
+    def __init__(self, minimum: float, maximum: float, bits: int = 16):
+        """
+        Create a new quantizer.
+
+        :param minimum: lower bound of every component
+        :type minimum: float
+
+        :param maximum: upper bound of every component
+        :type maximum: float
+
+        :param bits: bit width of every component, from 1 to 32
+        :type bits: int
+        """
+        if not 1 <= bits <= 32:
+            raise ValueError('bits must be from 1 to 32')
+        if maximum <= minimum:
+            raise ValueError('maximum must be greater than minimum')
+
+        self._minimum = minimum
+        self._maximum = maximum
+        self._bits = bits
+        self._steps = (1 << bits) - 1
+        self._scale = self._steps / (maximum - minimum)
+        self._size = (bits * 3 + 7) // 8
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} [{self._minimum}, {self._maximum}] {self._bits}bit>'
+
+    def get_size(self) -> int:
+        """
+        Get size of the quantized vector.
+
+        :returns: size in bytes
+        :rtype: int
+        """
+        return self._size
+
+    def get_precision(self) -> float:
+        """
+        Get maximum quantization error of a component.
+
+        :returns: error
+        :rtype: float
+        """
+        return 0.5 / self._scale
+
+    def quantize(self, value: float) -> int:
+        step: int = round((value - self._minimum) * self._scale)
+        return min(max(step, 0), self._steps)
+
+    def dequantize(self, step: int) -> float:
+        return self._minimum + step / self._scale
+
+    def write(self, buffer: bytearray, vector: tuple[float]):
+        minimum: float = self._minimum
+        scale: float = self._scale
+        steps: int = self._steps
+        bits: int = self._bits
+
+        packed: int = 0
+        for i in (2, 1, 0):  # same as quantize(), inlined for speed
+            step: int = round((vector[i] - minimum) * scale)
+            packed = packed << bits | (0 if step < 0 else steps if step > steps else step)
+        buffer += packed.to_bytes(self._size, 'little')
+
+    def read(self, buffer: memoryview, offset: int) -> tuple[tuple[float], int]:
+        end: int = offset + self._size
+        packed: int = int.from_bytes(buffer[offset:end], 'little')
+        minimum: float = self._minimum
+        scale: float = self._scale
+        steps: int = self._steps
+        bits: int = self._bits
+        return (
+            minimum + (packed & steps) / scale,
+            minimum + (packed >> bits & steps) / scale,
+            minimum + (packed >> bits * 2 & steps) / scale,
+        ), end
+
+
+class Codec:
+    """
+    Versioned binary codec for snapshots and events.
+
+    Tick and entity IDs are written as varints, vectors are written
+    as floats or quantized integers. Encoded messages start with a
+    header holding the codec version and configuration flags.
+    """
+    _position_quantizer: Quantizer | None
+    _velocity_quantizer: Quantizer | None
+    _vector: struct.Struct
+    _flags: int
+
+    _snapshot_class: type
+    _world_snapshot_class: type
+    _event_class: type
+
+    def __init__(
+            self, position_quantizer: Quantizer | None = None,
+            velocity_quantizer: Quantizer | None = None,
+            double_precision: bool = False, snapshot_class: type | None = None,
+            world_snapshot_class: type | None = None, event_class: type | None = None):
+        """
+        Create a new codec.
+
+        :param position_quantizer: quantizer of positions, floats if None
+        :type position_quantizer: :class:`kitsunet.codec.Quantizer`
+
+        :param velocity_quantizer: quantizer of velocities, floats if None
+        :type velocity_quantizer: :class:`kitsunet.codec.Quantizer`
+
+        :param double_precision: write floats as 64-bit instead of 32-bit
+        :type double_precision: bool
+        """
+        self._position_quantizer = position_quantizer
+        self._velocity_quantizer = velocity_quantizer
+        self._vector = _DOUBLE3 if double_precision else _FLOAT3
+
+        self._flags = 0
+        if position_quantizer:
+            self._flags |= FLAG_POSITION_QUANTIZED
+        if velocity_quantizer:
+            self._flags |= FLAG_VELOCITY_QUANTIZED
+        if double_precision:
+            self._flags |= FLAG_DOUBLE_PRECISION
+
+        self._snapshot_class = snapshot_class or Snapshot
+        self._world_snapshot_class = world_snapshot_class or WorldSnapshot
+        self._event_class = event_class or Event
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} v{CODEC_VERSION} flags={self._flags:#04x}>'
+
+    def get_snapshot_class(self) -> type:
+        return self._snapshot_class
+
+    def get_world_snapshot_class(self) -> type:
+        return self._world_snapshot_class
+
+    def get_event_class(self) -> type:
+        return self._event_class
+
+    def _write_vector(self, buffer: bytearray, vector: tuple[float], quantizer: Quantizer | None):
+        if quantizer:
+            quantizer.write(buffer, vector)
+        else:
+            buffer += self._vector.pack(*vector)
+
+    def _read_vector(
+            self, buffer: memoryview, offset: int,
+            quantizer: Quantizer | None) -> tuple[tuple[float], int]:
+        if quantizer:
+            return quantizer.read(buffer, offset)
+
+        return self._vector.unpack_from(buffer, offset), offset + self._vector.size
+
+    def write_header(self, buffer: bytearray):
+        buffer += _HEADER.pack(CODEC_VERSION, self._flags)
+
+    def read_header(self, buffer: memoryview, offset: int = 0) -> int:
+        """
+        Read and validate header.
+
+        :returns: offset after the header
+        :rtype: int
+        """
+        version, flags = _HEADER.unpack_from(buffer, offset)
+        if version != CODEC_VERSION:
+            raise ValueError(f'unsupported codec version {version}')
+        if flags != self._flags:
+            raise ValueError(f'codec flags mismatch {flags:#04x} != {self._flags:#04x}')
+
+        return offset + _HEADER.size
+
+    def write_snapshot(self, buffer: bytearray, snapshot: Snapshot):
+        write_varint(buffer, snapshot.get_entity_id())
+        self._write_vector(buffer, snapshot.get_position(), self._position_quantizer)
+
+    def read_snapshot(self, buffer: memoryview, offset: int) -> tuple[Snapshot, int]:
+        entity_id, offset = read_varint(buffer, offset)
+        position, offset = self._read_vector(buffer, offset, self._position_quantizer)
+        return self._snapshot_class(entity_id=entity_id, position=position), offset
+
+    def write_world_snapshot(self, buffer: bytearray, wsnapshot: WorldSnapshot):
+        entity_ids: list[int] = sorted(wsnapshot.get_entity_ids())
+        write_varint(buffer, wsnapshot.get_tick_id())
+        write_varint(buffer, len(entity_ids))
+
+        quantizer: Quantizer | None = self._position_quantizer
+        pack = self._vector.pack
+        get_snapshot = wsnapshot.get_snapshot
+
+        previous_id: int = 0
+        for entity_id in entity_ids:  # sorted IDs are written as gaps
+            gap: int = entity_id - previous_id
+            if gap < 0x80:
+                buffer.append(gap)
+            else:
+                write_varint(buffer, gap)
+
+            if quantizer:
+                quantizer.write(buffer, get_snapshot(entity_id).get_position())
+            else:
+                buffer += pack(*get_snapshot(entity_id).get_position())
+            previous_id = entity_id
+
+    def read_world_snapshot(self, buffer: memoryview, offset: int) -> tuple[WorldSnapshot, int]:
+        tick_id, offset = read_varint(buffer, offset)
+        count, offset = read_varint(buffer, offset)
+
+        quantizer: Quantizer | None = self._position_quantizer
+        unpack_from = self._vector.unpack_from
+        size: int = self._vector.size
+        snapshot_class: type = self._snapshot_class
+
+        snapshots: list[Snapshot] = []
+        entity_id: int = 0
+        for _ in range(count):
+            gap: int = buffer[offset]
+            if gap < 0x80:
+                offset += 1
+            else:
+                gap, offset = read_varint(buffer, offset)
+            entity_id += gap
+
+            position: tuple[float]
+            if quantizer:
+                position, offset = quantizer.read(buffer, offset)
+            else:
+                position = unpack_from(buffer, offset)
+                offset += size
+            snapshots.append(snapshot_class(entity_id=entity_id, position=position))
+
+        return self._world_snapshot_class(tick_id=tick_id, snapshots=snapshots), offset
+
+    def _write_ids(self, buffer: bytearray, entity_ids: list[int]):
+        write_varint(buffer, len(entity_ids))
+        previous_id: int = 0
+        for entity_id in entity_ids:  # sorted IDs are written as gaps
+            write_varint(buffer, entity_id - previous_id)
+            previous_id = entity_id
+
+    def _read_ids(self, buffer: memoryview, offset: int) -> tuple[list[int], int]:
+        count, offset = read_varint(buffer, offset)
+        entity_ids: list[int] = []
+        entity_id: int = 0
+        for _ in range(count):
+            gap, offset = read_varint(buffer, offset)
+            entity_id += gap
+            entity_ids.append(entity_id)
+        return entity_ids, offset
+
+    def write_delta_snapshot(self, buffer: bytearray, delta: DeltaSnapshot):
+        """
+        Write delta snapshot.
+        Position differences are always written as doubles, as they are
+        exact in double precision only and errors would add up over
+        chained baselines.
+        """
+        write_varint(buffer, delta.get_tick_id())
+        write_varint(buffer, 0 if delta.is_full() else delta.get_baseline_tick_id() + 1)
+
+        spawned: list[Snapshot] = sorted(delta.get_spawned(), key=Snapshot.get_entity_id)
+        self._write_ids(buffer, [snapshot.get_entity_id() for snapshot in spawned])
+        for snapshot in spawned:
+            self._write_vector(buffer, snapshot.get_position(), self._position_quantizer)
+
+        changed: list[tuple[int, tuple[float]]] = sorted(delta.get_changed())
+        self._write_ids(buffer, [entity_id for entity_id, _ in changed])
+        for _, difference in changed:
+            buffer += _DOUBLE3.pack(*difference)
+
+        self._write_ids(buffer, sorted(delta.get_removed()))
+
+    def read_delta_snapshot(self, buffer: memoryview, offset: int) -> tuple[DeltaSnapshot, int]:
+        tick_id, offset = read_varint(buffer, offset)
+        baseline_tick_id, offset = read_varint(buffer, offset)
+
+        entity_ids, offset = self._read_ids(buffer, offset)
+        spawned: list[Snapshot] = []
+        for entity_id in entity_ids:
+            position, offset = self._read_vector(buffer, offset, self._position_quantizer)
+            spawned.append(self._snapshot_class(entity_id=entity_id, position=position))
+
+        entity_ids, offset = self._read_ids(buffer, offset)
+        changed: list[tuple[int, tuple[float]]] = []
+        for entity_id in entity_ids:
+            changed.append((entity_id, _DOUBLE3.unpack_from(buffer, offset)))
+            offset += _DOUBLE3.size
+
+        removed, offset = self._read_ids(buffer, offset)
+        return DeltaSnapshot(
+            tick_id=tick_id,
+            baseline_tick_id=baseline_tick_id - 1 if baseline_tick_id else None,
+            spawned=spawned,
+            changed=changed,
+            removed=removed,
+        ), offset
+
+    def write_event(self, buffer: bytearray, event: Event):
+        write_varint(buffer, event.get_tick_id())
+        write_varint(buffer, event.get_entity_id())
+        self._write_vector(buffer, event.get_velocity(), self._velocity_quantizer)
+
+    def read_event(self, buffer: memoryview, offset: int) -> tuple[Event, int]:
+        tick_id, offset = read_varint(buffer, offset)
+        entity_id, offset = read_varint(buffer, offset)
+        velocity, offset = self._read_vector(buffer, offset, self._velocity_quantizer)
+        return self._event_class(tick_id=tick_id, entity_id=entity_id, velocity=velocity), offset
+
+    def write_event_batch(self, buffer: bytearray, batch: EventBatch):
+        runs: list[tuple[int, int, tuple[float]]] = batch.get_runs()
+        write_varint(buffer, batch.get_entity_id())
+        write_varint(buffer, len(runs))
+
+        end_tick_id: int = 0
+        for first_tick_id, count, velocity in runs:  # first ticks are written as gaps
+            write_varint(buffer, first_tick_id - end_tick_id)
+            write_varint(buffer, count)
+            self._write_vector(buffer, velocity, self._velocity_quantizer)
+            end_tick_id = first_tick_id + count
+
+    def read_event_batch(self, buffer: memoryview, offset: int) -> tuple[EventBatch, int]:
+        entity_id, offset = read_varint(buffer, offset)
+        run_count, offset = read_varint(buffer, offset)
+
+        runs: list[tuple[int, int, tuple[float]]] = []
+        end_tick_id: int = 0
+        for _ in range(run_count):
+            gap, offset = read_varint(buffer, offset)
+            count, offset = read_varint(buffer, offset)
+            velocity, offset = self._read_vector(buffer, offset, self._velocity_quantizer)
+            runs.append((end_tick_id + gap, count, velocity))
+            end_tick_id += gap + count
+
+        return EventBatch(entity_id, runs), offset
+
+    def write_item(self, buffer: bytearray, item: Snapshot | WorldSnapshot | DeltaSnapshot | Event | EventBatch):
+        """
+        Write type tag and object.
+
+        :param buffer: output buffer
+        :type buffer: bytearray
+
+        :param item: snapshot, world snapshot, delta snapshot, event or event batch
+        :type item: object
+        """
+        if isinstance(item, WorldSnapshot):
+            buffer.append(TYPE_WORLD_SNAPSHOT)
+            self.write_world_snapshot(buffer, item)
+        elif isinstance(item, Snapshot):
+            buffer.append(TYPE_SNAPSHOT)
+            self.write_snapshot(buffer, item)
+        elif isinstance(item, Event):
+            buffer.append(TYPE_EVENT)
+            self.write_event(buffer, item)
+        elif isinstance(item, EventBatch):
+            buffer.append(TYPE_EVENT_BATCH)
+            self.write_event_batch(buffer, item)
+        elif isinstance(item, DeltaSnapshot):
+            buffer.append(TYPE_DELTA_SNAPSHOT)
+            self.write_delta_snapshot(buffer, item)
+        else:
+            raise TypeError(f'can not encode {type(item).__name__}')
+
+    def read_item(
+            self, buffer: memoryview,
+            offset: int) -> tuple[Snapshot | WorldSnapshot | DeltaSnapshot | Event | EventBatch, int]:
+        """
+        Read type tag and object.
+
+        :param buffer: input buffer
+        :type buffer: memoryview
+
+        :param offset: read offset
+        :type offset: int
+
+        :returns: object and offset after it
+        :rtype: tuple
+        """
+        tag: int = buffer[offset]
+        if tag == TYPE_WORLD_SNAPSHOT:
+            return self.read_world_snapshot(buffer, offset + 1)
+        if tag == TYPE_SNAPSHOT:
+            return self.read_snapshot(buffer, offset + 1)
+        if tag == TYPE_EVENT:
+            return self.read_event(buffer, offset + 1)
+        if tag == TYPE_EVENT_BATCH:
+            return self.read_event_batch(buffer, offset + 1)
+        if tag == TYPE_DELTA_SNAPSHOT:
+            return self.read_delta_snapshot(buffer, offset + 1)
+
+        raise ValueError(f'unknown type tag {tag}')
+
+    def encode(self, item: Snapshot | WorldSnapshot | Event) -> bytes:
+        """
+        Encode a single object.
+
+        :param item: snapshot, world snapshot or event
+        :type item: object
+
+        :returns: encoded message
+        :rtype: bytes
+        """
+        buffer: bytearray = bytearray()
+        self.write_header(buffer)
+        self.write_item(buffer, item)
+        return bytes(buffer)
+
+    def decode(self, buffer: memoryview | bytes) -> Snapshot | WorldSnapshot | Event:
+        """
+        Decode a single object.
+
+        :param buffer: encoded message
+        :type buffer: memoryview
+
+        :returns: snapshot, world snapshot or event
+        :rtype: object
+        """
+        view: memoryview = memoryview(buffer)
+        item, _ = self.read_item(view, self.read_header(view))
+        return item
+
+    def encode_batch(self, items: list[Snapshot | WorldSnapshot | Event]) -> bytes:
+        """
+        Encode many objects into one message.
+
+        :param items: snapshots, world snapshots or events
+        :type items: list
+
+        :returns: encoded message
+        :rtype: bytes
+        """
+        buffer: bytearray = bytearray()
+        self.write_header(buffer)
+        write_varint(buffer, len(items))
+        for item in items:
+            self.write_item(buffer, item)
+        return bytes(buffer)
+
+    def decode_batch(self, buffer: memoryview | bytes) -> list[Snapshot | WorldSnapshot | Event]:
+        """
+        Decode many objects from one message.
+
+        :param buffer: encoded message
+        :type buffer: memoryview
+
+        :returns: snapshots, world snapshots or events
+        :rtype: list
+        """
+        view: memoryview = memoryview(buffer)
+        count, offset = read_varint(view, self.read_header(view))
+
+        items: list[Snapshot | WorldSnapshot | Event] = []
+        for _ in range(count):
+            item, offset = self.read_item(view, offset)
+            items.append(item)
+        return items
@@ -0,0 +1,345 @@
+from typing import Iterable, Self
+
+import numpy as np
+
+from .event import Event
+from .kernel import LINEAR_KERNEL, LinearKernel
+from .snapshot import HermiteWeights, Snapshot, WorldSnapshot
+
+
+class ColumnarWorldSnapshot(WorldSnapshot):
+    """
+    Game world state stored as struct-of-arrays.
+
+    Entity IDs are kept in a sorted array and positions in a contiguous
+    Nx3 array, so the whole world is interpolated or extrapolated
+    with a single vectorized operation instead of one per entity.
+    """
+    __slots__ = ('_entity_ids', '_positions', '_snapshot_class')
+
+    _tick_id: int
+    _entity_ids: np.ndarray
+    _positions: np.ndarray  # shared with copies until changed
+    _snapshot_class: type
+
+    def __init__(
+            self, tick_id: int,
+            snapshots: tuple[Snapshot] | list[Snapshot] | None = None,
+            snapshot_class: type | None = None):
+        positions: dict[int, tuple[float]] = {}
+        for snapshot in (snapshots or []):
+            positions[snapshot.get_entity_id()] = snapshot.get_position()
+
+        entity_ids: list[int] = sorted(positions)
+        self._tick_id = tick_id
+        self._entity_ids = np.array(entity_ids, dtype=np.int64)
+        self._positions = np.array(
+            [positions[entity_id] for entity_id in entity_ids],
+            dtype=np.float64).reshape(-1, 3)
+        self._snapshot_class = snapshot_class or Snapshot
+        self._shared = False
+
+    @classmethod
+    def from_arrays(
+            cls, tick_id: int, entity_ids: np.ndarray, positions: np.ndarray,
+            snapshot_class: type | None = None) -> Self:
+        """
+        Create a world snapshot from existing arrays without copying them.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :param entity_ids: sorted array of unique entity IDs
+        :type entity_ids: :class:`numpy.ndarray`
+
+        :param positions: Nx3 array of positions, one row per entity ID
+        :type positions: :class:`numpy.ndarray`
+
+        :returns: world snapshot
+        :rtype: :class:`kitsunet.columnar.ColumnarWorldSnapshot`
+        """
+        wsnapshot: Self = cls.__new__(cls)
+        wsnapshot._tick_id = tick_id
+        wsnapshot._entity_ids = entity_ids
+        wsnapshot._positions = positions
+        wsnapshot._snapshot_class = snapshot_class or Snapshot
+        wsnapshot._shared = False
+        return wsnapshot
+
+    @classmethod
+    def from_world_snapshot(cls, wsnapshot: WorldSnapshot) -> Self:
+        """
+        Convert an object world snapshot into a columnar one.
+
+        :param wsnapshot: world snapshot
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: world snapshot
+        :rtype: :class:`kitsunet.columnar.ColumnarWorldSnapshot`
+        """
+        if isinstance(wsnapshot, cls):
+            return wsnapshot
+
+        return cls(
+            tick_id=wsnapshot.get_tick_id(),
+            snapshots=[
+                wsnapshot.get_snapshot(entity_id)
+                for entity_id in wsnapshot.get_entity_ids()
+            ],
+        )
+
+    def to_world_snapshot(self) -> WorldSnapshot:
+        """
+        Convert into an object world snapshot.
+
+        :returns: world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        return WorldSnapshot(
+            tick_id=self.get_tick_id(),
+            snapshots=[
+                self._snapshot_class(entity_id=entity_id, position=tuple(position))
+                for entity_id, position in zip(
+                    self._entity_ids.tolist(), self._positions.tolist())
+            ],
+        )
+
+    def get_entity_ids(self) -> frozenset[int]:
+        return frozenset(self._entity_ids.tolist())
+
+    def get_entity_id_array(self) -> np.ndarray:
+        return self._entity_ids
+
+    def get_positions(self) -> np.ndarray:
+        return self._positions
+
+    def _find(self, entity_id: int) -> int | None:
+        """
+        Find row of the entity.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :returns: row index or None if entity is missing
+        :rtype: int
+        """
+        row: int = int(np.searchsorted(self._entity_ids, entity_id))
+        if row < len(self._entity_ids) and self._entity_ids[row] == entity_id:
+            return row
+
+    def copy(self, tick_id: int | None = None) -> Self:
+        wsnapshot: Self = self.from_arrays(
+            tick_id=self.get_tick_id() if tick_id is None else tick_id,
+            entity_ids=self._entity_ids,
+            positions=self._positions,
+            snapshot_class=self._snapshot_class,
+        )
+        wsnapshot._shared = self._shared = True
+        return wsnapshot
+
+    def add_snapshot(self, entity_id: int, snapshot: Snapshot):
+        row: int | None = self._find(entity_id)
+        if row is not None:
+            if self._shared:
+                self._positions = self._positions.copy()
+                self._shared = False
+            self._positions[row] = snapshot.get_position()
+            return
+
+        row = int(np.searchsorted(self._entity_ids, entity_id))
+        self._entity_ids = np.insert(self._entity_ids, row, entity_id)
+        self._positions = np.insert(self._positions, row, snapshot.get_position(), axis=0)
+
+    def get_snapshot(self, entity_id: int) -> Snapshot | None:
+        row: int | None = self._find(entity_id)
+        if row is None:
+            return None
+
+        return self._snapshot_class(
+            entity_id=entity_id,
+            position=tuple(self._positions[row].tolist()),
+        )
+
+    def _find_many(self, entity_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find rows of many entities.
+
+        :param entity_ids: entity IDs
+        :type entity_ids: :class:`numpy.ndarray`
+
+        :returns: row indices and mask of found entities
+        :rtype: tuple
+        """
+        if not len(self._entity_ids):
+            return np.zeros(len(entity_ids), dtype=np.intp), np.zeros(len(entity_ids), dtype=bool)
+
+        rows: np.ndarray = np.minimum(
+            np.searchsorted(self._entity_ids, entity_ids), len(self._entity_ids) - 1)
+        return rows, self._entity_ids[rows] == entity_ids
+
+    def get_snapshots(self, entity_ids: Iterable[int]) -> dict[int, Snapshot]:
+        wanted: np.ndarray = np.fromiter(entity_ids, dtype=np.int64)
+        rows, found = self._find_many(wanted)
+        return {
+            entity_id: self._snapshot_class(entity_id=entity_id, position=tuple(position))
+            for entity_id, position in zip(
+                wanted[found].tolist(), self._positions[rows[found]].tolist())
+        }
+
+    def interpolate_snapshots(
+            self, wsnapshot: WorldSnapshot, factor: float,
+            entity_ids: Iterable[int]) -> dict[int, Snapshot]:
+        other: Self = self.from_world_snapshot(wsnapshot)
+        wanted: np.ndarray = np.fromiter(entity_ids, dtype=np.int64)
+        rows_a, found_a = self._find_many(wanted)
+        rows_b, found_b = other._find_many(wanted)
+        found: np.ndarray = found_a & found_b
+
+        positions: np.ndarray = (
+            self._positions[rows_a[found]] * (1 - factor) +
+            other._positions[rows_b[found]] * factor)
+        return {
+            entity_id: self._snapshot_class(entity_id=entity_id, position=tuple(position))
+            for entity_id, position in zip(wanted[found].tolist(), positions.tolist())
+        }
+
+    def interpolate(self, wsnapshot: WorldSnapshot, factor: float, out: Self | None = None) -> Self:
+        other: Self = self.from_world_snapshot(wsnapshot)
+
+        entity_ids: np.ndarray = self._entity_ids
+        positions_a: np.ndarray = self._positions
+        positions_b: np.ndarray = other._positions
+        if not (
+                entity_ids is other._entity_ids or
+                np.array_equal(entity_ids, other._entity_ids)):
+            entity_ids, rows_a, rows_b = np.intersect1d(
+                self._entity_ids, other._entity_ids,
+                assume_unique=True, return_indices=True)
+            positions_a = positions_a[rows_a]
+            positions_b = positions_b[rows_b]
+
+        if (
+                isinstance(out, ColumnarWorldSnapshot) and not out._shared and
+                out._positions.shape == positions_a.shape):
+            positions: np.ndarray = out._positions
+            np.multiply(positions_a, 1 - factor, out=positions)
+            positions += positions_b * factor  # same rounding as without out
+            out._tick_id = self.get_tick_id()
+            out._entity_ids = entity_ids
+            return out
+
+        return self.from_arrays(
+            tick_id=self.get_tick_id(),
+            entity_ids=entity_ids,
+            positions=positions_a * (1 - factor) + positions_b * factor,
+            snapshot_class=self._snapshot_class,
+        )
+
+    def _get_neighbour_velocities(
+            self, neighbour: WorldSnapshot | None, entity_ids: np.ndarray,
+            positions: np.ndarray, ticks: int | None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get velocities between neighbour and given positions.
+
+        :returns: Nx3 velocities per tick and mask of entities found in neighbour
+        :rtype: tuple
+        """
+        if neighbour is None or not ticks:
+            return positions, np.zeros(len(entity_ids), dtype=bool)
+
+        other: Self = self.from_world_snapshot(neighbour)
+        if other._entity_ids is entity_ids or np.array_equal(other._entity_ids, entity_ids):
+            return (positions - other._positions) * (1 / ticks), np.ones(len(entity_ids), dtype=bool)
+
+        rows, found = other._find_many(entity_ids)
+        return (positions - other._positions[rows]) * (1 / ticks), found
+
+    def interpolate_hermite(
+            self, wsnapshot: WorldSnapshot, factor: float,
+            before: WorldSnapshot | None = None, after: WorldSnapshot | None = None,
+            entity_ids: Iterable[int] | None = None) -> Self:
+        other: Self = self.from_world_snapshot(wsnapshot)
+        tick_a: int = self.get_tick_id()
+        span: int = other.get_tick_id() - tick_a
+        weights: HermiteWeights = HermiteWeights(
+            span,
+            before and tick_a - before.get_tick_id(),
+            after and after.get_tick_id() - other.get_tick_id())
+
+        if entity_ids is None and (
+                self._entity_ids is other._entity_ids or
+                np.array_equal(self._entity_ids, other._entity_ids)):
+            ids: np.ndarray = self._entity_ids
+            positions_a: np.ndarray = self._positions
+            positions_b: np.ndarray = other._positions
+        else:
+            if entity_ids is None:
+                ids = np.intersect1d(self._entity_ids, other._entity_ids, assume_unique=True)
+            else:
+                ids = np.unique(np.fromiter(entity_ids, dtype=np.int64))
+            rows_a, found_a = self._find_many(ids)
+            rows_b, found_b = other._find_many(ids)
+            found: np.ndarray = found_a & found_b
+            ids = ids[found]
+            positions_a = self._positions[rows_a[found]]
+            positions_b = other._positions[rows_b[found]]
+        chords: np.ndarray = positions_b - positions_a
+
+        # velocity of after is negated: (b - after) / ticks
+        velocities_before, has_before = self._get_neighbour_velocities(
+            before, ids, positions_a, weights.get_before())
+        velocities_after, has_after = self._get_neighbour_velocities(
+            after, ids, positions_b, weights.get_after())
+        velocities_after = -velocities_after
+        tangents_a: np.ndarray = chords
+        tangents_b: np.ndarray = chords
+        if has_before.any() or has_after.any():
+            velocities: np.ndarray = chords * (1 / span)
+            (a_before, a_after), (b_after, b_before) = weights.get_weights()
+            tangents_a = np.where(
+                has_before[:, None], velocities * a_before[0] + velocities_before * a_before[1],
+                np.where(has_after[:, None], velocities * a_after[0] + velocities_after * a_after[1], chords))
+            tangents_b = np.where(
+                has_after[:, None], velocities * b_after[0] + velocities_after * b_after[1],
+                np.where(has_before[:, None], velocities * b_before[0] + velocities_before * b_before[1], chords))
+
+        factor2: float = factor * factor
+        factor3: float = factor2 * factor
+        positions: np.ndarray = (  # same order of operations as in kitsunet.math.hermite
+            positions_a +
+            (3 * factor2 - 2 * factor3) * chords +
+            (factor3 - 2 * factor2 + factor) * tangents_a +
+            (factor3 - factor2) * tangents_b
+        )
+        return self.from_arrays(
+            tick_id=tick_a,
+            entity_ids=ids,
+            positions=positions,
+            snapshot_class=self._snapshot_class,
+        )
+
+    def extrapolate(
+            self, events: list[Event], dt: float, tick_id: int | None = None,
+            kernel: LinearKernel | None = None) -> Self:
+        count: int = len(events)
+        event_ids: np.ndarray = np.fromiter(
+            (event.get_entity_id() for event in events), dtype=np.int64, count=count)
+        velocities: np.ndarray = np.array(
+            [event.get_velocity() for event in events], dtype=np.float64).reshape(-1, 3)
+
+        # the last event wins for every entity, same as in WorldSnapshot
+        entity_ids, last = np.unique(event_ids[::-1], return_index=True)
+        velocities = velocities[count - 1 - last]
+
+        rows: np.ndarray = np.searchsorted(self._entity_ids, entity_ids)
+        found: np.ndarray = rows < len(self._entity_ids)
+        found[found] = self._entity_ids[rows[found]] == entity_ids[found]
+
+        positions, _ = (kernel or LINEAR_KERNEL).step(self._positions[rows[found]], velocities[found], dt)
+
+        return self.from_arrays(
+            tick_id=self.get_tick_id() if tick_id is None else tick_id,
+            entity_ids=entity_ids[found],
+            positions=positions,
+            snapshot_class=self._snapshot_class,
+        )
@@ -0,0 +1,279 @@
+from .event import Event
+from .kernel import LinearKernel
+from .math import distance3
+from .snapshot import Snapshot, WorldSnapshot
+
+
+class DeadReckoningFilter:
+    """
+    Server side send suppression.
+
+    Runs the same extrapolation clients run for remote entities,
+    ex.: :meth:`kitsunet.prediction.PredictionSystem._remote_entity_extrapolate`,
+    on the entities last sent to every client, and sends an entity
+    only if the client side prediction is off by more than the threshold.
+    Every entity is also refreshed once per refresh interval, staggered
+    by entity ID, so lost packets and precision loss do not persist
+    and refreshes of a crowd are spread over the interval.
+    """
+    _tick_duration: float  # in ms
+    _threshold: float
+    _refresh_interval: int  # in ticks
+    _event_class: type
+    _event_kwargs: dict
+    _kernel: LinearKernel | None
+
+    _models: dict[int, dict[int, Snapshot]]  # client ID -> entity ID -> predicted snapshot
+    _model_tick_ids: dict[int, int]  # client ID -> tick ID of predicted snapshots
+
+    _sent_count: int
+    _suppressed_count: int
+    _error_sum: float
+    _max_error: float
+
+    def __init__(
+            self, tick_rate: int, threshold: float = 0.01, refresh_interval: int = 20,
+            event_class: type | None = None, event_kwargs: dict | None = None,
+            kernel: LinearKernel | None = None):
+        """
+        Create a new dead reckoning filter.
+
+        :param tick_rate: tick rate in Hz, ex.: 20Hz
+        :type tick_rate: int
+
+        :param threshold: largest prediction error which is not sent
+        :type threshold: float
+
+        :param refresh_interval: maximum number of ticks between sends of an entity
+        :type refresh_interval: int
+
+        :param event_class: event class clients extrapolate with
+        :type event_class: type
+
+        :param event_kwargs: event arguments clients extrapolate with
+        :type event_kwargs: dict
+
+        :param kernel: motion rule clients extrapolate with, linear by default
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+        """
+        if refresh_interval < 1:
+            raise ValueError('refresh interval must be positive')
+
+        self._tick_duration = 1 / tick_rate * 1000
+        self._threshold = threshold
+        self._refresh_interval = refresh_interval
+        self._event_class = event_class or Event
+        self._event_kwargs = event_kwargs or {}
+        self._kernel = kernel
+
+        self._models = {}
+        self._model_tick_ids = {}
+
+        self._sent_count = 0
+        self._suppressed_count = 0
+        self._error_sum = 0
+        self._max_error = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._threshold} ({len(self._models)} clients)>'
+
+    def get_sent_count(self) -> int:
+        return self._sent_count
+
+    def get_suppressed_count(self) -> int:
+        return self._suppressed_count
+
+    def get_suppression_rate(self) -> float:
+        """
+        Get part of entity snapshots which were not sent.
+
+        :returns: rate from 0.0 to 1.0
+        :rtype: float
+        """
+        total: int = self._sent_count + self._suppressed_count
+        if not total:
+            return 0.0
+        return self._suppressed_count / total
+
+    def get_mean_error(self) -> float:
+        """
+        Get average distance between the client side prediction
+        and the actual position of the not sent entities.
+
+        :returns: distance
+        :rtype: float
+        """
+        if not self._suppressed_count:
+            return 0.0
+        return self._error_sum / self._suppressed_count
+
+    def get_max_error(self) -> float:
+        return self._max_error
+
+    def remove_client(self, client_id: int):
+        self._models.pop(client_id, None)
+        self._model_tick_ids.pop(client_id, None)
+
+    def _predict(self, snapshot: Snapshot, tick_id: int, ticks: int) -> Snapshot:
+        dt: float = self._tick_duration / 1000
+        for i in range(ticks):
+            snapshot = snapshot.extrapolate(self._event_class(
+                tick_id=tick_id + i,
+                entity_id=snapshot.get_entity_id(),
+                **self._event_kwargs,
+            ), dt, self._kernel)
+        return snapshot
+
+    def filter(self, client_id: int, wsnapshot: WorldSnapshot) -> WorldSnapshot:
+        """
+        Leave out entities the client predicts well enough.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :param wsnapshot: world snapshot of the tick as seen by the client
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: world snapshot with the entities to send,
+            ex.: for :class:`kitsunet.deadreckoning.DeadReckoningReceiver`
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        tick_id: int = wsnapshot.get_tick_id()
+        models: dict[int, Snapshot] = self._models.setdefault(client_id, {})
+        model_tick_id: int = self._model_tick_ids.get(client_id, tick_id)
+        ticks: int = tick_id - model_tick_id
+        self._model_tick_ids[client_id] = tick_id
+
+        snapshots: list[Snapshot] = []
+        entity_ids: frozenset[int] = wsnapshot.get_entity_ids()
+        for entity_id in entity_ids:
+            snapshot: Snapshot = wsnapshot.get_snapshot(entity_id)
+            predicted: Snapshot | None = models.get(entity_id)
+            if predicted is not None and (tick_id + entity_id) % self._refresh_interval:
+                predicted = self._predict(predicted, model_tick_id, ticks)
+                error: float = distance3(predicted.get_position(), snapshot.get_position())
+                if error <= self._threshold:
+                    models[entity_id] = predicted
+                    self._suppressed_count += 1
+                    self._error_sum += error
+                    self._max_error = max(self._max_error, error)
+                    continue
+
+            models[entity_id] = snapshot
+            snapshots.append(snapshot)
+
+        for entity_id in [entity_id for entity_id in models if entity_id not in entity_ids]:
+            del models[entity_id]  # despawned or out of interest
+
+        self._sent_count += len(snapshots)
+        return WorldSnapshot(tick_id=tick_id, snapshots=snapshots)
+
+
+class DeadReckoningReceiver:
+    """
+    Client side counterpart of :class:`kitsunet.deadreckoning.DeadReckoningFilter`.
+
+    Rebuilds whole world snapshots from filtered ones by extrapolating
+    the entities which were not sent with the same model the server
+    suppressed them with. Entities not sent for longer than the timeout
+    are considered gone, as every entity is refreshed periodically.
+    """
+    _tick_duration: float  # in ms
+    _timeout: int  # in ticks
+    _event_class: type
+    _event_kwargs: dict
+    _kernel: LinearKernel | None
+
+    _wsnapshot: WorldSnapshot | None
+    _received_tick_ids: dict[int, int]  # entity ID -> tick ID
+    _late_count: int
+
+    def __init__(
+            self, tick_rate: int, timeout: int = 40,
+            event_class: type | None = None, event_kwargs: dict | None = None,
+            kernel: LinearKernel | None = None):
+        """
+        Create a new dead reckoning receiver.
+
+        :param tick_rate: tick rate in Hz, ex.: 20Hz
+        :type tick_rate: int
+
+        :param timeout: number of ticks an entity is kept without being sent,
+            ex.: twice the refresh interval of the filter
+        :type timeout: int
+
+        :param event_class: event class to extrapolate with
+        :type event_class: type
+
+        :param event_kwargs: event arguments to extrapolate with
+        :type event_kwargs: dict
+
+        :param kernel: motion rule to extrapolate with, linear by default
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+        """
+        self._tick_duration = 1 / tick_rate * 1000
+        self._timeout = timeout
+        self._event_class = event_class or Event
+        self._event_kwargs = event_kwargs or {}
+        self._kernel = kernel
+
+        self._wsnapshot = None
+        self._received_tick_ids = {}
+        self._late_count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._wsnapshot}>'
+
+    def get_world_snapshot(self) -> WorldSnapshot | None:
+        return self._wsnapshot
+
+    def get_late_count(self) -> int:
+        """
+        Get number of filtered world snapshots older than the merged one.
+
+        :returns: number of world snapshots
+        :rtype: int
+        """
+        return self._late_count
+
+    def merge(self, wsnapshot: WorldSnapshot) -> WorldSnapshot | None:
+        """
+        Rebuild whole world snapshot of the tick.
+
+        :param wsnapshot: filtered world snapshot
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: world snapshot, ex.: for
+            :meth:`kitsunet.playback.PlaybackSystem.feed_snapshot`,
+            None if it is older than the merged one,
+            changing it does not change the model
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        tick_id: int = wsnapshot.get_tick_id()
+        merged: WorldSnapshot | None = self._wsnapshot
+        if merged is not None and tick_id <= merged.get_tick_id():
+            self._late_count += 1
+            return None
+
+        received: dict[int, int] = self._received_tick_ids
+        for entity_id in wsnapshot.get_entity_ids():
+            received[entity_id] = tick_id
+        for entity_id in [entity_id for entity_id, last in received.items() if tick_id - last > self._timeout]:
+            del received[entity_id]
+
+        if merged is None:
+            merged = WorldSnapshot(tick_id=tick_id)
+        else:
+            dt: float = self._tick_duration / 1000
+            for model_tick_id in range(merged.get_tick_id(), tick_id):
+                merged = merged.extrapolate([
+                    self._event_class(tick_id=model_tick_id, entity_id=entity_id, **self._event_kwargs)
+                    for entity_id in merged.get_entity_ids()
+                    if entity_id in received
+                ], dt, tick_id=model_tick_id + 1, kernel=self._kernel)
+
+        for entity_id in wsnapshot.get_entity_ids():
+            merged.add_snapshot(entity_id, wsnapshot.get_snapshot(entity_id))
+
+        self._wsnapshot = merged.copy()  # callers may add snapshots to the returned one
+        return merged
@@ -0,0 +1,284 @@
+from .math import add3, sub3
+from .snapshot import Snapshot, WorldSnapshot
+
+
+class DeltaSnapshot:
+    """
+    World state encoded as a difference against a baseline world state.
+    """
+    _tick_id: int
+    _baseline_tick_id: int | None
+    _spawned: list[Snapshot]
+    _changed: list[tuple[int, tuple[float]]]
+    _removed: list[int]
+
+    def __init__(
+            self, tick_id: int, baseline_tick_id: int | None = None,
+            spawned: list[Snapshot] | None = None,
+            changed: list[tuple[int, tuple[float]]] | None = None,
+            removed: list[int] | None = None):
+        """
+        Create a new delta snapshot.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :param baseline_tick_id: tick ID of the baseline, None for a full snapshot
+        :type baseline_tick_id: int
+
+        :param spawned: snapshots of entities sent with absolute positions
+        :type spawned: list
+
+        :param changed: pairs of entity ID and position difference
+        :type changed: list
+
+        :param removed: IDs of entities missing since the baseline
+        :type removed: list
+        """
+        self._tick_id = tick_id
+        self._baseline_tick_id = baseline_tick_id
+        self._spawned = spawned or []
+        self._changed = changed or []
+        self._removed = removed or []
+
+    def __str__(self) -> str:
+        return (
+            f'DeltaSnapshot #{self.get_tick_id()} <- #{self.get_baseline_tick_id()} '
+            f'(+{len(self._spawned)} ~{len(self._changed)} -{len(self._removed)})')
+
+    def get_tick_id(self) -> int:
+        return self._tick_id
+
+    def get_baseline_tick_id(self) -> int | None:
+        return self._baseline_tick_id
+
+    def get_spawned(self) -> list[Snapshot]:
+        return self._spawned
+
+    def get_changed(self) -> list[tuple[int, tuple[float]]]:
+        return self._changed
+
+    def get_removed(self) -> list[int]:
+        return self._removed
+
+    def is_full(self) -> bool:
+        return self._baseline_tick_id is None
+
+
+class BaselineRing:
+    """
+    Fixed size ring of world snapshots keyed by tick ID.
+    """
+    _slots: list[WorldSnapshot | None]
+
+    def __init__(self, size: int = 32):
+        """
+        Create a new ring.
+
+        :param size: number of kept world snapshots
+        :type size: int
+        """
+        self._slots = [None] * size
+
+    def put(self, wsnapshot: WorldSnapshot):
+        self._slots[wsnapshot.get_tick_id() % len(self._slots)] = wsnapshot
+
+    def get(self, tick_id: int) -> WorldSnapshot | None:
+        wsnapshot: WorldSnapshot | None = self._slots[tick_id % len(self._slots)]
+        if wsnapshot and wsnapshot.get_tick_id() == tick_id:
+            return wsnapshot
+
+
+def diff(baseline: WorldSnapshot | None, wsnapshot: WorldSnapshot) -> DeltaSnapshot:
+    """
+    Get difference between baseline and world snapshot.
+
+    :param baseline: baseline world snapshot, None for a full snapshot
+    :type baseline: :class:`kitsunet.snapshot.WorldSnapshot`
+
+    :param wsnapshot: world snapshot
+    :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+    :returns: delta snapshot
+    :rtype: :class:`kitsunet.delta.DeltaSnapshot`
+    """
+    if baseline is None:
+        return DeltaSnapshot(
+            tick_id=wsnapshot.get_tick_id(),
+            spawned=[
+                wsnapshot.get_snapshot(entity_id)
+                for entity_id in sorted(wsnapshot.get_entity_ids())
+            ],
+        )
+
+    spawned: list[Snapshot] = []
+    changed: list[tuple[int, tuple[float]]] = []
+    entity_ids: frozenset[int] = wsnapshot.get_entity_ids()
+
+    for entity_id in sorted(entity_ids):
+        snapshot: Snapshot = wsnapshot.get_snapshot(entity_id)
+        base: Snapshot | None = baseline.get_snapshot(entity_id)
+        if base is None:
+            spawned.append(snapshot)
+            continue
+
+        if base is snapshot:
+            continue
+
+        position: tuple[float] = snapshot.get_position()
+        base_position: tuple[float] = base.get_position()
+        if position == base_position:
+            continue
+
+        delta: tuple[float] = sub3(position, base_position)
+        if add3(base_position, delta) == position:
+            changed.append((entity_id, delta))
+        else:  # difference is not exact in floating point, send as is
+            spawned.append(snapshot)
+
+    return DeltaSnapshot(
+        tick_id=wsnapshot.get_tick_id(),
+        baseline_tick_id=baseline.get_tick_id(),
+        spawned=spawned,
+        changed=changed,
+        removed=sorted(baseline.get_entity_ids() - entity_ids),
+    )
+
+
+class DeltaEncoder:
+    """
+    Server side delta encoder.
+    Keeps a ring of sent world snapshots for every client
+    and encodes new ones against the latest acknowledged one.
+    """
+    _history_size: int
+    _baselines: dict[int, BaselineRing]
+    _acknowledged: dict[int, int]
+
+    def __init__(self, history_size: int = 32):
+        """
+        Create a new delta encoder.
+
+        :param history_size: number of kept world snapshots per client
+        :type history_size: int
+        """
+        self._history_size = history_size
+        self._baselines = {}
+        self._acknowledged = {}
+
+    def add_client(self, client_id: int):
+        self._baselines[client_id] = BaselineRing(self._history_size)
+
+    def remove_client(self, client_id: int):
+        self._baselines.pop(client_id, None)
+        self._acknowledged.pop(client_id, None)
+
+    def acknowledge(self, client_id: int, tick_id: int):
+        """
+        Mark world snapshot as received by the client.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :param tick_id: tick ID of the received world snapshot
+        :type tick_id: int
+        """
+        if tick_id > self._acknowledged.get(client_id, -1):
+            self._acknowledged[client_id] = tick_id
+
+    def get_baseline(self, client_id: int) -> WorldSnapshot | None:
+        """
+        Get the latest acknowledged world snapshot still in history.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :returns: baseline world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        tick_id: int | None = self._acknowledged.get(client_id)
+        if tick_id is not None:
+            return self._baselines[client_id].get(tick_id)
+
+    def encode(self, client_id: int, wsnapshot: WorldSnapshot) -> DeltaSnapshot:
+        """
+        Encode world snapshot for the client.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :param wsnapshot: world snapshot
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: delta snapshot
+        :rtype: :class:`kitsunet.delta.DeltaSnapshot`
+        """
+        if client_id not in self._baselines:
+            self.add_client(client_id)
+
+        delta: DeltaSnapshot = diff(self.get_baseline(client_id), wsnapshot)
+        self._baselines[client_id].put(wsnapshot)
+        return delta
+
+
+class DeltaDecoder:
+    """
+    Client side delta decoder.
+    Rebuilds full world snapshots from delta snapshots.
+    """
+    _baselines: BaselineRing
+    _snapshot_class: type
+    _world_snapshot_class: type
+
+    def __init__(
+            self, history_size: int = 32, snapshot_class: type | None = None,
+            world_snapshot_class: type | None = None):
+        """
+        Create a new delta decoder.
+
+        :param history_size: number of kept world snapshots
+        :type history_size: int
+        """
+        self._baselines = BaselineRing(history_size)
+        self._snapshot_class = snapshot_class or Snapshot
+        self._world_snapshot_class = world_snapshot_class or WorldSnapshot
+
+    def decode(self, delta: DeltaSnapshot) -> WorldSnapshot | None:
+        """
+        Decode delta snapshot.
+
+        :param delta: delta snapshot
+        :type delta: :class:`kitsunet.delta.DeltaSnapshot`
+
+        :returns: world snapshot or None if the baseline is unknown,
+            changing it does not change the kept baseline
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        snapshots: dict[int, Snapshot] = {}
+
+        if not delta.is_full():
+            baseline: WorldSnapshot | None = self._baselines.get(delta.get_baseline_tick_id())
+            if baseline is None:
+                return None
+
+            for entity_id in baseline.get_entity_ids():
+                snapshots[entity_id] = baseline.get_snapshot(entity_id)
+
+            for entity_id in delta.get_removed():
+                snapshots.pop(entity_id, None)
+
+            for entity_id, position in delta.get_changed():
+                snapshots[entity_id] = self._snapshot_class(
+                    entity_id=entity_id,
+                    position=add3(snapshots[entity_id].get_position(), position),
+                )
+
+        for snapshot in delta.get_spawned():
+            snapshots[snapshot.get_entity_id()] = snapshot
+
+        wsnapshot: WorldSnapshot = self._world_snapshot_class(
+            tick_id=delta.get_tick_id(),
+            snapshots=list(snapshots.values()),
+        )
+        self._baselines.put(wsnapshot.copy())  # callers may add snapshots to the returned one
+        return wsnapshot
@@ -2,6 +2,8 @@ class Event:
     """
     Input/command event.
     """
+    __slots__ = ('_tick_id', '_entity_id', '_velocity')
+
     _tick_id: int
     _entity_id: int
     _velocity: tuple[float]
@@ -1,6 +1,6 @@
 from .event import Event
 from .playback import PlaybackSystem
-from .snapshot import Snapshot, WorldSnapshot
+from .snapshot import WorldSnapshot
 
 
 class ExtrapolationSystem(PlaybackSystem):
@@ -72,7 +72,7 @@ class ExtrapolationSystem(PlaybackSystem):
         if not wsnapshot:
             wsnapshot = self._remote_entity_extrapolate()
 
-        event, snapshot: tuple[Event, Snapshot] = self._client_side_predict()
+        event, snapshot = self._client_side_predict()
         wsnapshot.add_snapshot(self._local_entity_id, snapshot)
         self._local_event_history.append((event, wsnapshot))
 
@@ -0,0 +1,126 @@
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class TickHistory(Generic[T]):
+    """
+    Fixed size ring of values indexed by tick ID.
+    Keeps values of the latest ticks only, older ones are overwritten.
+    """
+    _slots: list[tuple[int, T] | None]
+    _first_tick_id: int | None
+    _last_tick_id: int | None
+    _count: int
+
+    def __init__(self, size: int = 64):
+        """
+        Create a new history.
+
+        :param size: number of kept ticks
+        :type size: int
+        """
+        if size < 1:
+            raise ValueError('size must be positive')
+
+        self._slots = [None] * size
+        self._first_tick_id = None
+        self._last_tick_id = None
+        self._count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} #{self._first_tick_id}..#{self._last_tick_id}>'
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_size(self) -> int:
+        return len(self._slots)
+
+    def get_first_tick_id(self) -> int | None:
+        return self._first_tick_id
+
+    def get_last_tick_id(self) -> int | None:
+        return self._last_tick_id
+
+    def put(self, tick_id: int, value: T):
+        """
+        Put value of the tick.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :param value: value
+        :type value: object
+        """
+        size: int = len(self._slots)
+        if self._last_tick_id is not None and tick_id <= self._last_tick_id - size:
+            return  # older than the whole ring
+
+        if self._last_tick_id is not None and tick_id > self._last_tick_id:
+            # slots of skipped ticks still hold values fallen out of the ring
+            for i in range(max(self._last_tick_id + 1, tick_id - size + 1), tick_id + 1):
+                if self._slots[i % size] is not None:
+                    self._slots[i % size] = None
+                    self._count -= 1
+            if not self._count:
+                self._first_tick_id = None
+
+        slot: int = tick_id % size
+        old: tuple[int, T] | None = self._slots[slot]
+        if old is None:
+            self._count += 1
+        self._slots[slot] = (tick_id, value)
+
+        if self._last_tick_id is None or tick_id > self._last_tick_id:
+            self._last_tick_id = tick_id
+        if self._first_tick_id is None or tick_id < self._first_tick_id:
+            self._first_tick_id = tick_id
+        self._first_tick_id = max(self._first_tick_id, self._last_tick_id - size + 1)
+
+    def get(self, tick_id: int) -> T | None:
+        """
+        Get value of the tick.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :returns: value or None if it is missing
+        :rtype: object
+        """
+        item: tuple[int, T] | None = self._slots[tick_id % len(self._slots)]
+        if item and item[0] == tick_id:
+            return item[1]
+
+    def get_latest(self) -> T | None:
+        """
+        Get value of the latest tick.
+
+        :returns: value or None if history is empty
+        :rtype: object
+        """
+        if self._last_tick_id is not None:
+            return self.get(self._last_tick_id)
+
+    def discard(self, tick_id: int):
+        """
+        Remove values of this tick and all the older ones.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+        """
+        if self._first_tick_id is None or tick_id < self._first_tick_id:
+            return
+
+        size: int = len(self._slots)
+        for i in range(self._first_tick_id, min(tick_id, self._last_tick_id) + 1):
+            item: tuple[int, T] | None = self._slots[i % size]
+            if item and item[0] <= tick_id:
+                self._slots[i % size] = None
+                self._count -= 1
+
+        if tick_id >= self._last_tick_id:
+            self._first_tick_id = None
+            self._last_tick_id = None
+        else:
+            self._first_tick_id = tick_id + 1
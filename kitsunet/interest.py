@@ -0,0 +1,249 @@
+import math
+
+from .snapshot import Snapshot, WorldSnapshot
+
+
+class SpatialGrid:
+    """
+    Uniform grid spatial index of entity positions.
+    Cells split the ground (X, Y) plane, Z is up.
+    """
+    _cell_size: float
+    _cells: dict[tuple[int, int], dict[int, tuple[float]]]  # entity positions by cell
+    _entity_cells: dict[int, tuple[int, int]]
+    _snapshots: dict[int, Snapshot]
+
+    def __init__(self, cell_size: float):
+        """
+        Create a new spatial grid.
+
+        :param cell_size: cell edge length, about half of the query radius works best
+        :type cell_size: float
+        """
+        if cell_size <= 0:
+            raise ValueError('cell size must be positive')
+
+        self._cell_size = cell_size
+        self._cells = {}
+        self._entity_cells = {}
+        self._snapshots = {}
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {len(self._snapshots)} entities in {len(self._cells)} cells>'
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def _get_cell(self, position: tuple[float]) -> tuple[int, int]:
+        return (
+            math.floor(position[0] / self._cell_size),
+            math.floor(position[1] / self._cell_size),
+        )
+
+    def get_snapshot(self, entity_id: int) -> Snapshot | None:
+        return self._snapshots.get(entity_id)
+
+    def update(self, snapshot: Snapshot):
+        """
+        Insert or move entity.
+
+        :param snapshot: entity state
+        :type snapshot: :class:`kitsunet.snapshot.Snapshot`
+        """
+        entity_id: int = snapshot.get_entity_id()
+        position: tuple[float] = snapshot.get_position()
+        self._snapshots[entity_id] = snapshot
+
+        cell: tuple[int, int] = self._get_cell(position)
+        old_cell: tuple[int, int] | None = self._entity_cells.get(entity_id)
+        if cell != old_cell:
+            if old_cell is not None:
+                self._remove_from_cell(entity_id, old_cell)
+            self._entity_cells[entity_id] = cell
+
+        positions: dict[int, tuple[float]] | None = self._cells.get(cell)
+        if positions is None:
+            positions = self._cells[cell] = {}
+        positions[entity_id] = position
+
+    def _remove_from_cell(self, entity_id: int, cell: tuple[int, int]):
+        positions: dict[int, tuple[float]] = self._cells[cell]
+        positions.pop(entity_id, None)
+        if not positions:
+            del self._cells[cell]
+
+    def remove(self, entity_id: int):
+        """
+        Remove entity.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+        """
+        cell: tuple[int, int] | None = self._entity_cells.pop(entity_id, None)
+        if cell is not None:
+            self._remove_from_cell(entity_id, cell)
+        self._snapshots.pop(entity_id, None)
+
+    def update_world(self, wsnapshot: WorldSnapshot):
+        """
+        Synchronize index with world snapshot.
+        Entities with the same snapshot object as before are skipped.
+
+        :param wsnapshot: world snapshot
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        entity_ids: frozenset[int] = wsnapshot.get_entity_ids()
+        for entity_id in [e for e in self._snapshots if e not in entity_ids]:
+            self.remove(entity_id)
+
+        snapshots: dict[int, Snapshot] = self._snapshots
+        for entity_id in entity_ids:
+            snapshot: Snapshot = wsnapshot.get_snapshot(entity_id)
+            if snapshots.get(entity_id) is not snapshot:
+                self.update(snapshot)
+
+    def query(self, position: tuple[float], radius: float) -> dict[int, float]:
+        """
+        Find entities within radius.
+
+        :param position: center of the query
+        :type position: tuple
+
+        :param radius: query radius
+        :type radius: float
+
+        :returns: squared distances by entity ID
+        :rtype: dict
+        """
+        x, y, z = position
+        min_x, min_y = self._get_cell((x - radius, y - radius))
+        max_x, max_y = self._get_cell((x + radius, y + radius))
+        radius_sq: float = radius * radius
+
+        found: dict[int, float] = {}
+        cells: dict[tuple[int, int], dict[int, tuple[float]]] = self._cells
+        for cell_x in range(min_x, max_x + 1):
+            for cell_y in range(min_y, max_y + 1):
+                positions: dict[int, tuple[float]] | None = cells.get((cell_x, cell_y))
+                if not positions:
+                    continue
+
+                for entity_id, (ex, ey, ez) in positions.items():
+                    dx, dy, dz = ex - x, ey - y, ez - z
+                    distance_sq: float = dx * dx + dy * dy + dz * dz
+                    if distance_sq <= radius_sq:
+                        found[entity_id] = distance_sq
+        return found
+
+
+class InterestManager:
+    """
+    Spatial interest management.
+    Keeps a set of relevant entities for every client around the entity
+    it controls. Entities enter the set within the enter radius and leave
+    it beyond the leave radius, so they do not flicker at the border.
+    """
+    _grid: SpatialGrid
+    _enter_radius: float
+    _leave_radius: float
+    _clients: dict[int, int]  # client ID -> focus entity ID
+    _interests: dict[int, frozenset[int]]
+
+    def __init__(self, enter_radius: float, leave_radius: float | None = None, cell_size: float | None = None):
+        """
+        Create a new interest manager.
+
+        :param enter_radius: entities closer than this become relevant
+        :type enter_radius: float
+
+        :param leave_radius: entities further than this stop being relevant
+        :type leave_radius: float
+
+        :param cell_size: spatial grid cell size, half of leave radius by default
+        :type cell_size: float
+        """
+        self._enter_radius = enter_radius
+        self._leave_radius = max(enter_radius, leave_radius or enter_radius * 1.2)
+        self._grid = SpatialGrid(cell_size or self._leave_radius / 2)
+        self._clients = {}
+        self._interests = {}
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {len(self._clients)} clients>'
+
+    def get_grid(self) -> SpatialGrid:
+        return self._grid
+
+    def add_client(self, client_id: int, entity_id: int):
+        """
+        Add client.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :param entity_id: ID of the entity the client is focused on
+        :type entity_id: int
+        """
+        self._clients[client_id] = entity_id
+        self._interests[client_id] = frozenset()
+
+    def remove_client(self, client_id: int):
+        self._clients.pop(client_id, None)
+        self._interests.pop(client_id, None)
+
+    def get_interest_set(self, client_id: int) -> frozenset[int]:
+        """
+        Get IDs of the entities relevant to the client.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :returns: entity IDs
+        :rtype: frozenset
+        """
+        return self._interests.get(client_id, frozenset())
+
+    def update(self, wsnapshot: WorldSnapshot):
+        """
+        Update spatial index and interest sets of all the clients.
+
+        :param wsnapshot: world snapshot
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        self._grid.update_world(wsnapshot)
+        enter_sq: float = self._enter_radius ** 2
+
+        for client_id, focus_id in self._clients.items():
+            focus: Snapshot | None = self._grid.get_snapshot(focus_id)
+            if not focus:
+                self._interests[client_id] = frozenset()
+                continue
+
+            old: frozenset[int] = self._interests[client_id]
+            found: dict[int, float] = self._grid.query(focus.get_position(), self._leave_radius)
+            self._interests[client_id] = frozenset(
+                entity_id for entity_id, distance_sq in found.items()
+                if distance_sq <= enter_sq or entity_id in old
+            )
+
+    def filter(self, client_id: int, wsnapshot: WorldSnapshot) -> WorldSnapshot:
+        """
+        Get world snapshot with only the entities relevant to the client.
+        Entity snapshots are shared with the original world snapshot.
+
+        :param client_id: client ID
+        :type client_id: int
+
+        :param wsnapshot: world snapshot
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        snapshots: list[Snapshot] = []
+        for entity_id in self.get_interest_set(client_id):
+            snapshot: Snapshot | None = wsnapshot.get_snapshot(entity_id)
+            if snapshot:
+                snapshots.append(snapshot)
+
+        return WorldSnapshot(tick_id=wsnapshot.get_tick_id(), snapshots=snapshots)
@@ -0,0 +1,77 @@
+from typing import Iterable
+
+from .snapshot import Snapshot, WorldSnapshot
+
+
+class LinearInterpolation:
+    """
+    Linear interpolation between the previous and the next snapshot.
+    """
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__}>'
+
+    def interpolate(
+            self, prev_snapshot: WorldSnapshot, next_snapshot: WorldSnapshot, factor: float,
+            before: WorldSnapshot | None = None, after: WorldSnapshot | None = None,
+            out: WorldSnapshot | None = None) -> WorldSnapshot:
+        """
+        Interpolate world snapshot.
+
+        :param prev_snapshot: world snapshot to interpolate from
+        :type prev_snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param next_snapshot: world snapshot to interpolate into
+        :type next_snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param factor: interpolation factor
+        :type factor: float
+
+        :param before: world snapshot preceding the previous one, if known
+        :type before: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param after: world snapshot following the next one, if known
+        :type after: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param out: pooled world snapshot to overwrite, if supported
+        :type out: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: interpolated world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        return prev_snapshot.interpolate(next_snapshot, factor, out=out)
+
+    def interpolate_snapshots(
+            self, prev_snapshot: WorldSnapshot, next_snapshot: WorldSnapshot, factor: float,
+            entity_ids: Iterable[int], before: WorldSnapshot | None = None,
+            after: WorldSnapshot | None = None) -> dict[int, Snapshot]:
+        """
+        Interpolate snapshots of some entities only.
+
+        :returns: snapshots by entity ID, missing entities are left out
+        :rtype: dict
+        """
+        return prev_snapshot.interpolate_snapshots(next_snapshot, factor, entity_ids)
+
+
+class HermiteInterpolation(LinearInterpolation):
+    """
+    Cubic Hermite (Catmull-Rom) interpolation.
+
+    Uses the snapshots around the interpolated pair to estimate
+    velocities, so curved and accelerating motion stays smooth
+    at low tick rates. Falls back to linear motion at the ends
+    of the buffer. Pooled world snapshots are not reused.
+    """
+    def interpolate(
+            self, prev_snapshot: WorldSnapshot, next_snapshot: WorldSnapshot, factor: float,
+            before: WorldSnapshot | None = None, after: WorldSnapshot | None = None,
+            out: WorldSnapshot | None = None) -> WorldSnapshot:
+        return prev_snapshot.interpolate_hermite(next_snapshot, factor, before, after)
+
+    def interpolate_snapshots(
+            self, prev_snapshot: WorldSnapshot, next_snapshot: WorldSnapshot, factor: float,
+            entity_ids: Iterable[int], before: WorldSnapshot | None = None,
+            after: WorldSnapshot | None = None) -> dict[int, Snapshot]:
+        entity_ids = list(entity_ids)
+        return prev_snapshot.interpolate_hermite(
+            next_snapshot, factor, before, after, entity_ids).get_snapshots(entity_ids)
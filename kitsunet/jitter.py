@@ -0,0 +1,145 @@
+import heapq
+
+from .snapshot import WorldSnapshot
+
+
+class JitterBuffer:
+    """
+    Bounded jitter buffer of snapshots ordered by tick ID.
+
+    Snapshots are indexed by tick ID, so inserts and duplicate checks
+    are O(log n) and O(1) regardless of the arrival order.
+    """
+    _capacity: int
+    _target_depth: int
+    _tick_ids: list[int]  # min-heap
+    _snapshots: dict[int, WorldSnapshot]
+
+    _late_count: int
+    _duplicate_count: int
+    _overflow_count: int
+    _drop_count: int
+
+    def __init__(self, capacity: int = 64, target_depth: int = 1):
+        """
+        Create a new jitter buffer.
+
+        :param capacity: maximum number of buffered snapshots
+        :type capacity: int
+
+        :param target_depth: number of snapshots kept after trimming
+        :type target_depth: int
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+
+        self._capacity = capacity
+        self._target_depth = target_depth
+        self._tick_ids = []
+        self._snapshots = {}
+
+        self._late_count = 0
+        self._duplicate_count = 0
+        self._overflow_count = 0
+        self._drop_count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {len(self)}/{self._capacity}>'
+
+    def __len__(self) -> int:
+        return len(self._tick_ids)
+
+    def get_capacity(self) -> int:
+        return self._capacity
+
+    def get_target_depth(self) -> int:
+        return self._target_depth
+
+    def set_target_depth(self, target_depth: int):
+        self._target_depth = max(0, min(target_depth, self._capacity))
+
+    def get_late_count(self) -> int:
+        return self._late_count
+
+    def get_duplicate_count(self) -> int:
+        return self._duplicate_count
+
+    def get_overflow_count(self) -> int:
+        return self._overflow_count
+
+    def get_drop_count(self) -> int:
+        return self._drop_count
+
+    def push(self, snapshot: WorldSnapshot, min_tick_id: int = 0) -> bool:
+        """
+        Put snapshot into the buffer.
+
+        :param snapshot: snapshot
+        :type snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param min_tick_id: snapshots with this or lower tick ID are late
+        :type min_tick_id: int
+
+        :returns: was snapshot accepted?
+        :rtype: bool
+        """
+        tick_id: int = snapshot.get_tick_id()
+        if tick_id <= min_tick_id:
+            self._late_count += 1
+            return False
+
+        if tick_id in self._snapshots:
+            self._duplicate_count += 1
+            return False
+
+        if len(self._tick_ids) >= self._capacity:
+            self._overflow_count += 1
+            if tick_id < self._tick_ids[0]:  # older than everything buffered
+                return False
+
+            del self._snapshots[heapq.heappushpop(self._tick_ids, tick_id)]
+        else:
+            heapq.heappush(self._tick_ids, tick_id)
+
+        self._snapshots[tick_id] = snapshot
+        return True
+
+    def peek(self) -> WorldSnapshot | None:
+        """
+        Get snapshot with lowest tick ID without removing it.
+
+        :returns: snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        if self._tick_ids:
+            return self._snapshots[self._tick_ids[0]]
+
+    def pop(self) -> WorldSnapshot | None:
+        """
+        Remove and get snapshot with lowest tick ID.
+
+        :returns: snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        if self._tick_ids:
+            return self._snapshots.pop(heapq.heappop(self._tick_ids))
+
+    def trim(self) -> int:
+        """
+        Drop the oldest snapshots above the target depth.
+
+        :returns: number of dropped snapshots
+        :rtype: int
+        """
+        dropped: int = 0
+        while len(self._tick_ids) > self._target_depth:
+            del self._snapshots[heapq.heappop(self._tick_ids)]
+            dropped += 1
+
+        self._drop_count += dropped
+        return dropped
+
+    def clear(self):
+        """Remove all snapshots."""
+        self._tick_ids.clear()
+        self._snapshots.clear()
@@ -0,0 +1,228 @@
+try:
+    import numpy as np
+except ImportError:  # pure Python kernels only
+    np = None
+
+
+class LinearKernel:
+    """
+    Motion rule of extrapolation, applied to whole batches of entities.
+
+    Moves positions by velocity divided by dt, same as
+    :meth:`kitsunet.snapshot.Snapshot.extrapolate`. Subclasses change
+    velocities before the move, ex.: to accelerate or slow down entities.
+
+    Batches are either Nx3 numpy arrays, ex.: of columnar world snapshots,
+    or lists of tuples, ex.: of world snapshots of entity snapshots,
+    which are moved in pure Python, as converting them into arrays
+    costs more than the move itself and small worlds need no numpy.
+
+    Kernels return velocities of the next tick, those are kept only
+    where velocities live between ticks, ex.: in
+    :class:`kitsunet.sharding.ShardedSimulation`, world snapshots get
+    velocities from the input events of every tick.
+    """
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__}>'
+
+    def accelerate(self, velocities: 'np.ndarray', dt: 'float | np.ndarray') -> 'np.ndarray':
+        """
+        Get velocities of the next tick.
+
+        :param velocities: Nx3 array of velocities, not changed
+        :type velocities: :class:`numpy.ndarray`
+
+        :param dt: tick duration in seconds, scalar or one per entity
+        :type dt: float
+
+        :returns: Nx3 array, same array if velocities do not change
+        :rtype: :class:`numpy.ndarray`
+        """
+        return velocities
+
+    def accelerate_tuples(self, velocities: list[tuple[float]], dt: float) -> list[tuple[float]]:
+        """
+        Get velocities of the next tick, pure Python.
+
+        :param velocities: velocities, not changed
+        :type velocities: list
+
+        :param dt: tick duration in seconds
+        :type dt: float
+
+        :returns: velocities, same list if they do not change
+        :rtype: list
+        """
+        return velocities
+
+    def step(
+            self, positions: 'np.ndarray', velocities: 'np.ndarray',
+            dt: 'float | np.ndarray') -> tuple['np.ndarray', 'np.ndarray']:
+        """
+        Extrapolate a batch of entities by a single tick.
+
+        :param positions: Nx3 array of positions, not changed
+        :type positions: :class:`numpy.ndarray`
+
+        :param velocities: Nx3 array of velocities, not changed
+        :type velocities: :class:`numpy.ndarray`
+
+        :param dt: tick duration in seconds, scalar or one per entity
+        :type dt: float
+
+        :returns: Nx3 arrays of positions and velocities of the next tick
+        :rtype: tuple
+        """
+        velocities = self.accelerate(velocities, dt)
+        if np.ndim(dt):
+            dt = np.asarray(dt, dtype=np.float64).reshape(-1, 1)
+            moves: np.ndarray = np.divide(
+                velocities, dt, out=np.zeros(positions.shape, dtype=np.float64), where=dt != 0)
+            return positions + moves, velocities
+
+        if dt == 0:
+            return positions.copy(), velocities
+        return positions + velocities / dt, velocities
+
+    def step_tuples(
+            self, positions: list[tuple[float]], velocities: list[tuple[float]],
+            dt: float) -> tuple[list[tuple[float]], list[tuple[float]]]:
+        """
+        Extrapolate a batch of entities by a single tick, pure Python.
+
+        :param positions: positions
+        :type positions: list
+
+        :param velocities: velocities
+        :type velocities: list
+
+        :param dt: tick duration in seconds
+        :type dt: float
+
+        :returns: positions and velocities of the next tick
+        :rtype: tuple
+        """
+        velocities = self.accelerate_tuples(velocities, dt)
+        if dt == 0:
+            return list(positions), velocities
+
+        return [
+            (position[0] + velocity[0] / dt, position[1] + velocity[1] / dt, position[2] + velocity[2] / dt)
+            for position, velocity in zip(positions, velocities)
+        ], velocities
+
+
+class AccelerationKernel(LinearKernel):
+    """
+    Constant acceleration, ex.: gravity.
+    """
+    _acceleration: tuple[float]
+
+    def __init__(self, acceleration: tuple[float]):
+        """
+        Create a new acceleration kernel.
+
+        :param acceleration: velocity change per second
+        :type acceleration: tuple
+        """
+        self._acceleration = acceleration
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._acceleration}>'
+
+    def accelerate(self, velocities: 'np.ndarray', dt: 'float | np.ndarray') -> 'np.ndarray':
+        return velocities + np.multiply.outer(dt, self._acceleration)
+
+    def accelerate_tuples(self, velocities: list[tuple[float]], dt: float) -> list[tuple[float]]:
+        x, y, z = self._acceleration
+        return [(v[0] + x * dt, v[1] + y * dt, v[2] + z * dt) for v in velocities]
+
+
+class DragKernel(LinearKernel):
+    """
+    Linear drag, velocities lose the drag part of themselves per second.
+    """
+    _drag: float
+
+    def __init__(self, drag: float):
+        """
+        Create a new drag kernel.
+
+        :param drag: part of velocity lost per second, stops entities above 1/dt
+        :type drag: float
+        """
+        if drag < 0:
+            raise ValueError('drag must not be negative')
+
+        self._drag = drag
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._drag}>'
+
+    def accelerate(self, velocities: 'np.ndarray', dt: 'float | np.ndarray') -> 'np.ndarray':
+        factor: np.ndarray = np.maximum(0.0, 1 - self._drag * np.asarray(dt, dtype=np.float64))
+        if factor.ndim:
+            factor = factor.reshape(-1, 1)
+        return velocities * factor
+
+    def accelerate_tuples(self, velocities: list[tuple[float]], dt: float) -> list[tuple[float]]:
+        factor: float = max(0.0, 1 - self._drag * dt)
+        return [(v[0] * factor, v[1] * factor, v[2] * factor) for v in velocities]
+
+
+class ClampKernel(LinearKernel):
+    """
+    Keeps positions moved by another kernel inside bounds, ex.: the map.
+    """
+    _kernel: LinearKernel
+    _minimum: tuple[float]
+    _maximum: tuple[float]
+
+    def __init__(
+            self, minimum: tuple[float], maximum: tuple[float],
+            kernel: LinearKernel | None = None):
+        """
+        Create a new clamp kernel.
+
+        :param minimum: lowest position
+        :type minimum: tuple
+
+        :param maximum: highest position
+        :type maximum: tuple
+
+        :param kernel: kernel which moves entities, linear by default
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+        """
+        if any(low > high for low, high in zip(minimum, maximum)):
+            raise ValueError('minimum must not be above maximum')
+
+        self._kernel = kernel or LinearKernel()
+        self._minimum = minimum
+        self._maximum = maximum
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._minimum}..{self._maximum} {self._kernel}>'
+
+    def get_kernel(self) -> LinearKernel:
+        return self._kernel
+
+    def step(
+            self, positions: 'np.ndarray', velocities: 'np.ndarray',
+            dt: 'float | np.ndarray') -> tuple['np.ndarray', 'np.ndarray']:
+        moved, velocities = self._kernel.step(positions, velocities, dt)
+        np.clip(moved, self._minimum, self._maximum, out=moved)
+        return moved, velocities
+
+    def step_tuples(
+            self, positions: list[tuple[float]], velocities: list[tuple[float]],
+            dt: float) -> tuple[list[tuple[float]], list[tuple[float]]]:
+        moved, velocities = self._kernel.step_tuples(positions, velocities, dt)
+        low: tuple[float] = self._minimum
+        high: tuple[float] = self._maximum
+        return [
+            (min(max(p[0], low[0]), high[0]), min(max(p[1], low[1]), high[1]), min(max(p[2], low[2]), high[2]))
+            for p in moved
+        ], velocities
+
+
+LINEAR_KERNEL: LinearKernel = LinearKernel()  # default rule
@@ -0,0 +1,242 @@
+from typing import Iterable
+
+from .snapshot import Snapshot, WorldSnapshot
+
+
+class WorldHistory:
+    """
+    Bounded history of world snapshots for lag compensation.
+
+    Keeps world snapshots of the latest ticks in a fixed size ring,
+    older ones are overwritten, so memory use does not grow with
+    the session length. Lookup of contiguous ticks is a direct index,
+    ticks with gaps are binary searched. World snapshots are kept as is,
+    entity snapshots are shared with the simulation.
+    """
+    _tick_ids: list[int]
+    _wsnapshots: list[WorldSnapshot | None]
+    _start: int  # ring position of the oldest world snapshot
+    _count: int
+
+    def __init__(self, size: int = 64):
+        """
+        Create a new world history.
+
+        :param size: number of kept world snapshots
+        :type size: int
+        """
+        if size < 2:
+            raise ValueError('size must be at least 2')
+
+        self._tick_ids = [0] * size
+        self._wsnapshots = [None] * size
+        self._start = 0
+        self._count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} #{self.get_first_tick_id()}..#{self.get_last_tick_id()}>'
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get_size(self) -> int:
+        return len(self._wsnapshots)
+
+    def get_first_tick_id(self) -> int | None:
+        if not self._count:
+            return None
+        return self._tick_ids[self._start]
+
+    def get_last_tick_id(self) -> int | None:
+        if not self._count:
+            return None
+        return self._tick_ids[(self._start + self._count - 1) % len(self._tick_ids)]
+
+    def record(self, wsnapshot: WorldSnapshot):
+        """
+        Record world snapshot of a new tick, overwriting the oldest one if full.
+
+        :param wsnapshot: world snapshot
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        tick_id: int = wsnapshot.get_tick_id()
+        size: int = len(self._tick_ids)
+        if self._count and tick_id <= self.get_last_tick_id():
+            raise ValueError(f'tick #{tick_id} is not newer than #{self.get_last_tick_id()}')
+
+        position: int = (self._start + self._count) % size
+        self._tick_ids[position] = tick_id
+        self._wsnapshots[position] = wsnapshot
+        if self._count < size:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % size
+
+    def clear(self):
+        self._wsnapshots = [None] * len(self._wsnapshots)
+        self._start = 0
+        self._count = 0
+
+    def _find(self, tick_id: int) -> int:
+        """
+        Find index of the newest world snapshot not newer than the tick.
+
+        :returns: index from the oldest world snapshot, -1 if all are newer
+        :rtype: int
+        """
+        tick_ids: list[int] = self._tick_ids
+        start: int = self._start
+        index: int = tick_id - tick_ids[start]
+        if 0 <= index < self._count:
+            position: int = start + index
+            if position >= len(tick_ids):
+                position -= len(tick_ids)
+            if tick_ids[position] == tick_id:
+                return index  # contiguous ticks
+
+        size: int = len(tick_ids)
+        low: int = 0
+        high: int = self._count
+        while low < high:  # first newer tick
+            middle: int = (low + high) // 2
+            if tick_ids[(start + middle) % size] <= tick_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1
+
+    def get(self, tick_id: int) -> WorldSnapshot | None:
+        """
+        Get world snapshot of the tick.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :returns: world snapshot or None if it is missing
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        if not self._count:
+            return None
+
+        index: int = self._find(tick_id)
+        position: int = (self._start + index) % len(self._tick_ids)
+        if index >= 0 and self._tick_ids[position] == tick_id:
+            return self._wsnapshots[position]
+
+    def get_bracket(
+            self, tick_id: int,
+            factor: float = 0.0) -> tuple[WorldSnapshot, WorldSnapshot, float] | None:
+        """
+        Find world snapshots around a fractional tick.
+
+        Ticks newer than the history are clamped to the latest one.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :param factor: fraction of the tick, from 0.0 to 1.0
+        :type factor: float
+
+        :returns: previous and next world snapshots and interpolation factor
+            between them, None if the tick is older than the history
+        :rtype: tuple
+        """
+        count: int = self._count
+        if not count:
+            return None
+
+        index: int = self._find(tick_id)
+        if index < 0:
+            return None
+
+        tick_ids: list[int] = self._tick_ids
+        size: int = len(tick_ids)
+        position: int = (self._start + index) % size
+        prev_tick_id: int = tick_ids[position]
+        if index == count - 1 or (factor <= 0 and prev_tick_id == tick_id):
+            return self._wsnapshots[position], self._wsnapshots[position], 0.0
+
+        next_position: int = (position + 1) % size
+        # ticks may have gaps, so the factor is relative to the whole gap
+        factor = (tick_id + factor - prev_tick_id) / (tick_ids[next_position] - prev_tick_id)
+        return self._wsnapshots[position], self._wsnapshots[next_position], min(1.0, factor)
+
+    def get_world_snapshot(self, tick_id: int, factor: float = 0.0) -> WorldSnapshot | None:
+        """
+        Rewind the whole world to a fractional tick.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :param factor: fraction of the tick, from 0.0 to 1.0
+        :type factor: float
+
+        :returns: world snapshot, None if the tick is older than the history
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        bracket: tuple[WorldSnapshot, WorldSnapshot, float] | None = self.get_bracket(tick_id, factor)
+        if bracket is None:
+            return None
+
+        prev_snapshot, next_snapshot, factor = bracket
+        if prev_snapshot is next_snapshot:
+            return prev_snapshot
+        return prev_snapshot.interpolate(next_snapshot, factor)
+
+    def get_snapshots(
+            self, entity_ids: Iterable[int], tick_id: int,
+            factor: float = 0.0) -> dict[int, Snapshot]:
+        """
+        Rewind some entities only to a fractional tick,
+        ex.: the target of a shot the shooter saw.
+
+        :param entity_ids: entity IDs
+        :type entity_ids: iterable
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :param factor: fraction of the tick, from 0.0 to 1.0
+        :type factor: float
+
+        :returns: snapshots by entity ID, missing entities are left out
+        :rtype: dict
+        """
+        bracket: tuple[WorldSnapshot, WorldSnapshot, float] | None = self.get_bracket(tick_id, factor)
+        if bracket is None:
+            return {}
+
+        prev_snapshot, next_snapshot, factor = bracket
+        if prev_snapshot is next_snapshot:
+            return prev_snapshot.get_snapshots(entity_ids)
+        return prev_snapshot.interpolate_snapshots(next_snapshot, factor, entity_ids)
+
+    def get_snapshot(self, entity_id: int, tick_id: int, factor: float = 0.0) -> Snapshot | None:
+        """
+        Rewind a single entity to a fractional tick.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :param factor: fraction of the tick, from 0.0 to 1.0
+        :type factor: float
+
+        :returns: snapshot, None if entity or tick is missing
+        :rtype: :class:`kitsunet.snapshot.Snapshot`
+        """
+        bracket: tuple[WorldSnapshot, WorldSnapshot, float] | None = self.get_bracket(tick_id, factor)
+        if bracket is None:
+            return None
+
+        prev_snapshot, next_snapshot, factor = bracket
+        snapshot: Snapshot | None = prev_snapshot.get_snapshot(entity_id)
+        if prev_snapshot is next_snapshot or snapshot is None:
+            return snapshot
+
+        next_entity: Snapshot | None = next_snapshot.get_snapshot(entity_id)
+        if next_entity is None:
+            return None
+        return snapshot.interpolate(next_entity, factor)
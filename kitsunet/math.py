@@ -24,3 +24,56 @@ def div3(a: tuple[float], b: tuple[float]) -> tuple[float]:
         a[1] / b[1],
         a[2] / b[2],
     )
+
+
+def sub3(a: tuple[float], b: tuple[float]) -> tuple[float]:
+    return (
+        a[0] - b[0],
+        a[1] - b[1],
+        a[2] - b[2],
+    )
+
+
+def distance3(a: tuple[float], b: tuple[float]) -> float:
+    return (
+        (a[0] - b[0]) ** 2 +
+        (a[1] - b[1]) ** 2 +
+        (a[2] - b[2]) ** 2
+    ) ** 0.5
+
+
+def hermite(a: float, b: float, tangent_a: float, tangent_b: float, factor: float) -> float:
+    factor2: float = factor * factor
+    factor3: float = factor2 * factor
+    return (  # h00 * a + h01 * b with h00 = 1 - h01, so still entities stay exact
+        a +
+        (3 * factor2 - 2 * factor3) * (b - a) +
+        (factor3 - 2 * factor2 + factor) * tangent_a +
+        (factor3 - factor2) * tangent_b
+    )
+
+
+def hermite3(
+        a: tuple[float], b: tuple[float],
+        tangent_a: tuple[float], tangent_b: tuple[float], factor: float) -> tuple[float]:
+    return (
+        hermite(a[0], b[0], tangent_a[0], tangent_b[0], factor),
+        hermite(a[1], b[1], tangent_a[1], tangent_b[1], factor),
+        hermite(a[2], b[2], tangent_a[2], tangent_b[2], factor),
+    )
+
+
+def scale3(a: tuple[float], factor: float) -> tuple[float]:
+    return (
+        a[0] * factor,
+        a[1] * factor,
+        a[2] * factor,
+    )
+
+
+def blend3(a: tuple[float], b: tuple[float], weight_a: float, weight_b: float) -> tuple[float]:
+    return (
+        a[0] * weight_a + b[0] * weight_b,
+        a[1] * weight_a + b[1] * weight_b,
+        a[2] * weight_a + b[2] * weight_b,
+    )
@@ -0,0 +1,207 @@
+import bisect
+from typing import Callable
+
+UPDATE_TIME = 'update_time'  # seconds spent in update()
+QUEUE_DEPTH = 'queue_depth'  # queued snapshots after update()
+INTERPOLATION_FACTOR = 'interpolation_factor'
+TICKS_STALLED = 'ticks_stalled'  # updates which stopped time
+SNAPSHOTS_DROPPED = 'snapshots_dropped'
+SNAPSHOTS_LATE = 'snapshots_late'
+SNAPSHOTS_DUPLICATE = 'snapshots_duplicate'
+SNAPSHOTS_OVERFLOWED = 'snapshots_overflowed'
+TICKS_EXTRAPOLATED = 'ticks_extrapolated'
+RECONCILIATIONS = 'reconciliations'
+PLAYOUT_RATE = 'playout_rate'  # adaptive playout clock speed
+JITTER = 'jitter'  # estimated arrival jitter in seconds
+
+DEFAULT_BOUNDS: dict[str, tuple[float]] = {
+    UPDATE_TIME: (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2),
+    QUEUE_DEPTH: (0, 1, 2, 3, 4, 6, 8, 12, 16, 32, 64),
+    INTERPOLATION_FACTOR: (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0),
+    PLAYOUT_RATE: (0.9, 0.95, 0.98, 0.99, 1.0, 1.01, 1.02, 1.05, 1.1),
+    JITTER: (1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25),
+}
+
+
+class Histogram:
+    """
+    Histogram with fixed bucket upper bounds.
+    """
+    _bounds: tuple[float]
+    _counts: list[int]  # last bucket is for values above all bounds
+    _count: int
+    _sum: float
+    _min: float | None
+    _max: float | None
+
+    def __init__(self, bounds: tuple[float]):
+        """
+        Create a new histogram.
+
+        :param bounds: sorted inclusive upper bounds of buckets
+        :type bounds: tuple
+        """
+        self._bounds = tuple(bounds)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._min = None
+        self._max = None
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} n={self._count} mean={self.get_mean()}>'
+
+    def observe(self, value: float):
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._count += 1
+        self._sum += value
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def get_count(self) -> int:
+        return self._count
+
+    def get_sum(self) -> float:
+        return self._sum
+
+    def get_mean(self) -> float | None:
+        if self._count:
+            return self._sum / self._count
+
+    def get_min(self) -> float | None:
+        return self._min
+
+    def get_max(self) -> float | None:
+        return self._max
+
+    def get_buckets(self) -> list[tuple[float, int]]:
+        """
+        Get number of values in every bucket.
+
+        :returns: pairs of upper bound and count, last bound is infinity
+        :rtype: list
+        """
+        return list(zip(self._bounds + (float('inf'),), self._counts))
+
+    def get_percentile(self, q: float) -> float | None:
+        """
+        Estimate percentile as the upper bound of its bucket.
+
+        :param q: percentile from 0 to 100
+        :type q: float
+
+        :returns: estimated value
+        :rtype: float
+        """
+        if not self._count:
+            return None
+
+        rank: float = q / 100 * self._count
+        seen: int = 0
+        for bound, count in self.get_buckets():
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self._max)
+        return self._max
+
+
+class Metrics:
+    """
+    Counters and histograms of playback internals.
+
+    Systems report into metrics only when they are given one,
+    so instrumentation costs a single check when disabled.
+    Subscribed callbacks receive every reported value,
+    ex.: to export them into a metrics backend.
+    """
+    _counters: dict[str, int]
+    _histograms: dict[str, Histogram]
+    _bounds: dict[str, tuple[float]]
+    _callbacks: list[Callable[[str, float], None]]
+
+    def __init__(self, bounds: dict[str, tuple[float]] | None = None):
+        """
+        Create new metrics.
+
+        :param bounds: histogram bucket bounds by metric name
+        :type bounds: dict
+        """
+        self._counters = {}
+        self._histograms = {}
+        self._bounds = dict(DEFAULT_BOUNDS, **(bounds or {}))
+        self._callbacks = []
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {len(self._counters)} counters, {len(self._histograms)} histograms>'
+
+    def subscribe(self, callback: Callable[[str, float], None]):
+        """
+        Add callback called with name and value of every reported metric.
+
+        :param callback: callback
+        :type callback: callable
+        """
+        self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, float], None]):
+        self._callbacks.remove(callback)
+
+    def increment(self, name: str, value: int = 1):
+        """
+        Increase counter.
+
+        :param name: metric name
+        :type name: str
+
+        :param value: increment
+        :type value: int
+        """
+        self._counters[name] = self._counters.get(name, 0) + value
+        for callback in self._callbacks:
+            callback(name, value)
+
+    def observe(self, name: str, value: float):
+        """
+        Put value into histogram.
+
+        :param name: metric name
+        :type name: str
+
+        :param value: value
+        :type value: float
+        """
+        histogram: Histogram | None = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = Histogram(self._bounds.get(name, (0,)))
+        histogram.observe(value)
+        for callback in self._callbacks:
+            callback(name, value)
+
+    def get_counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def get_histogram(self, name: str) -> Histogram | None:
+        return self._histograms.get(name)
+
+    def to_dict(self) -> dict:
+        """
+        Get all the metrics as plain data.
+
+        :returns: counters and histogram summaries
+        :rtype: dict
+        """
+        return {
+            'counters': dict(self._counters),
+            'histograms': {
+                name: {
+                    'count': histogram.get_count(),
+                    'sum': histogram.get_sum(),
+                    'min': histogram.get_min(),
+                    'max': histogram.get_max(),
+                    'buckets': histogram.get_buckets(),
+                }
+                for name, histogram in self._histograms.items()
+            },
+        }
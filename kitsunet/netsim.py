@@ -0,0 +1,250 @@
+import heapq
+import random
+from typing import Generic, Self, TypeVar
+
+from .codec import Codec
+from .event import Event
+from .snapshot import WorldSnapshot
+
+T = TypeVar('T')
+
+# link conditions of one direction, delays in seconds, bandwidth in bytes per second
+PROFILES: dict[str, dict] = {
+    'ideal': {},
+    'lan': {'latency': 0.001, 'jitter': 0.001},
+    'broadband': {'latency': 0.02, 'jitter': 0.005, 'loss': 0.001},
+    'wifi': {'latency': 0.015, 'jitter': 0.04, 'loss': 0.01, 'reorder': 0.01},
+    'mobile': {'latency': 0.06, 'jitter': 0.08, 'loss': 0.03, 'duplication': 0.01, 'reorder': 0.02},
+    'congested': {'latency': 0.04, 'jitter': 0.01, 'loss': 0.01, 'bandwidth': 32000, 'max_queue_delay': 0.25},
+}
+
+
+class LinkSimulator(Generic[T]):
+    """
+    One direction of a simulated network link driven by a virtual clock.
+
+    Items sent at the current virtual time are delivered by
+    :meth:`advance` once their delay has passed. Each item is lost,
+    duplicated or reordered at random, delayed by the latency and
+    the jitter and, with a bandwidth cap, by the transmission of the
+    items queued before it. Links deliver in sending order unless
+    an item is reordered, as real routes mostly do. All the randomness
+    comes from a seeded generator, so runs are reproducible.
+
+    Links can be added as server clients or used instead of a streamer,
+    delivered items are fed into, ex.:
+    :meth:`kitsunet.playback.PlaybackSystem.feed_snapshot` or
+    :meth:`kitsunet.server.ServerSystem.feed_event`.
+    """
+    _latency: float  # in seconds
+    _jitter: float  # in seconds
+    _loss: float
+    _duplication: float
+    _reorder: float
+    _bandwidth: float | None  # in bytes per second
+    _max_queue_delay: float  # in seconds
+    _codec: Codec
+    _random: random.Random
+
+    _time: float  # in seconds
+    _link_time: float  # when the link is done transmitting queued items
+    _last_arrival: float  # of items delivered in order
+    _in_flight: list[tuple[float, int, T]]  # min-heap by arrival time, sequence
+    _sequence: int
+
+    _sent_count: int
+    _lost_count: int
+    _duplicated_count: int
+    _reordered_count: int
+    _delivered_count: int
+    _sent_bytes: int
+
+    def __init__(
+            self, latency: float = 0.0, jitter: float = 0.0, loss: float = 0.0,
+            duplication: float = 0.0, reorder: float = 0.0, bandwidth: float | None = None,
+            max_queue_delay: float = 1.0, codec: Codec | None = None, seed: int = 0):
+        """
+        Create a new simulated link.
+
+        :param latency: minimum one way delay in seconds
+        :type latency: float
+
+        :param jitter: maximum random delay added to the latency in seconds
+        :type jitter: float
+
+        :param loss: probability of an item being lost
+        :type loss: float
+
+        :param duplication: probability of an item being delivered twice
+        :type duplication: float
+
+        :param reorder: probability of an item being delayed past the following ones
+        :type reorder: float
+
+        :param bandwidth: link capacity in bytes per second, unlimited if None
+        :type bandwidth: float
+
+        :param max_queue_delay: items waiting longer than this for the capped link are dropped
+        :type max_queue_delay: float
+
+        :param codec: codec measuring item sizes for the bandwidth cap
+        :type codec: :class:`kitsunet.codec.Codec`
+
+        :param seed: random seed
+        :type seed: int
+        """
+        for name, probability in (('loss', loss), ('duplication', duplication), ('reorder', reorder)):
+            if not 0 <= probability <= 1:
+                raise ValueError(f'{name} must be between 0 and 1')
+
+        self._latency = latency
+        self._jitter = jitter
+        self._loss = loss
+        self._duplication = duplication
+        self._reorder = reorder
+        self._bandwidth = bandwidth
+        self._max_queue_delay = max_queue_delay
+        self._codec = codec or Codec()
+        self._random = random.Random(seed)
+
+        self._time = 0.0
+        self._link_time = 0.0
+        self._last_arrival = 0.0
+        self._in_flight = []
+        self._sequence = 0
+
+        self._sent_count = 0
+        self._lost_count = 0
+        self._duplicated_count = 0
+        self._reordered_count = 0
+        self._delivered_count = 0
+        self._sent_bytes = 0
+
+    @classmethod
+    def from_profile(cls, name: str, seed: int = 0, **kwargs) -> Self:
+        """
+        Create a simulated link with conditions of a profile.
+
+        :param name: profile name, ex.: 'wifi', one of :data:`PROFILES`
+        :type name: str
+
+        :param seed: random seed
+        :type seed: int
+
+        :returns: link, keyword arguments override the profile
+        :rtype: :class:`kitsunet.netsim.LinkSimulator`
+        """
+        if name not in PROFILES:
+            raise ValueError(f'unknown profile {name!r}')
+        return cls(**dict(PROFILES[name], seed=seed, **kwargs))
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._latency * 1000:.0f}ms ({len(self._in_flight)} in flight)>'
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def get_time(self) -> float:
+        return self._time
+
+    def get_sent_count(self) -> int:
+        return self._sent_count
+
+    def get_lost_count(self) -> int:
+        """
+        Get number of items lost at random or dropped by the capped link.
+
+        :returns: number of items
+        :rtype: int
+        """
+        return self._lost_count
+
+    def get_duplicated_count(self) -> int:
+        return self._duplicated_count
+
+    def get_reordered_count(self) -> int:
+        return self._reordered_count
+
+    def get_delivered_count(self) -> int:
+        return self._delivered_count
+
+    def get_sent_bytes(self) -> int:
+        """
+        Get size of the sent items, counted with a bandwidth cap only.
+
+        :returns: number of bytes
+        :rtype: int
+        """
+        return self._sent_bytes
+
+    def _schedule(self, item: T, departure: float):
+        arrival: float = departure + self._latency + self._random.random() * self._jitter
+        if self._reorder and self._random.random() < self._reorder:
+            arrival += self._random.random() * (self._latency + self._jitter)
+            self._reordered_count += 1
+        else:
+            arrival = max(arrival, self._last_arrival)  # in order
+            self._last_arrival = arrival
+
+        self._sequence += 1
+        heapq.heappush(self._in_flight, (arrival, self._sequence, item))
+
+    def send(self, item: T, size: int | None = None) -> bool:
+        """
+        Send item at the current virtual time.
+
+        :param item: item, ex.: world snapshot or event
+        :type item: object
+
+        :param size: size in bytes, encoded size by default
+        :type size: int
+
+        :returns: is item on its way? False if it is lost
+        :rtype: bool
+        """
+        self._sent_count += 1
+        departure: float = self._time
+        if self._bandwidth:
+            if size is None:
+                size = len(self._codec.encode(item))
+            start: float = max(self._link_time, self._time)
+            if start - self._time > self._max_queue_delay:  # tail drop
+                self._lost_count += 1
+                return False
+            self._link_time = departure = start + size / self._bandwidth
+            self._sent_bytes += size
+
+        if self._loss and self._random.random() < self._loss:
+            self._lost_count += 1
+            return False
+
+        self._schedule(item, departure)
+        if self._duplication and self._random.random() < self._duplication:
+            self._schedule(item, departure)
+            self._duplicated_count += 1
+        return True
+
+    def send_snapshot(self, wsnapshot: WorldSnapshot):
+        self.send(wsnapshot)
+
+    def send_event(self, event: Event):
+        self.send(event)
+
+    def advance(self, dt: float) -> list[T]:
+        """
+        Advance the virtual clock.
+
+        :param dt: delta time in seconds
+        :type dt: float
+
+        :returns: items delivered meanwhile, in arrival order
+        :rtype: list
+        """
+        self._time += dt
+        delivered: list[T] = []
+        in_flight: list[tuple[float, int, T]] = self._in_flight
+        while in_flight and in_flight[0][0] <= self._time:
+            delivered.append(heapq.heappop(in_flight)[2])
+
+        self._delivered_count += len(delivered)
+        return delivered
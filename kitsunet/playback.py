@@ -1,42 +1,110 @@
+import time
+
+from . import metrics as m
+from .interpolation import LinearInterpolation
+from .jitter import JitterBuffer
+from .metrics import Metrics
 from .snapshot import WorldSnapshot
+from .spsc import SPSCQueue
+from .view import InterpolatedWorldView
 
 
 class PlaybackSystem:
     """
     Playback system which plays the queued snapshots.
     """
-    _snapshot_queue: list[WorldSnapshot]
+    _snapshot_queue: JitterBuffer
+    _snapshot_inbox: SPSCQueue  # pushed by network thread
     _tick_rate: int  # in Hz
     _tick_duration: float  # in ms
 
     _next_snapshot: WorldSnapshot | None
     _prev_snapshot: WorldSnapshot | None
-    _intr_snapshot: WorldSnapshot | None
+    _before_snapshot: WorldSnapshot | None  # preceding the previous one
+    _intr_snapshot: WorldSnapshot | InterpolatedWorldView | None
+    _intr_pool: WorldSnapshot | None  # reused interpolated snapshot
+    _reuse_interpolated: bool
+    _lazy_interpolation: bool
+    _interpolation: LinearInterpolation
 
     _tick_time: float  # in ms
     _real_time: float  # in ms
 
-    def __init__(self, tick_rate: int):
+    _metrics: Metrics | None
+    _reported_counts: tuple[int, int, int]  # late, duplicate, overflowed
+
+    def __init__(
+            self, tick_rate: int, buffer_capacity: int = 64, target_depth: int = 1,
+            metrics: Metrics | None = None, reuse_interpolated: bool = False,
+            lazy_interpolation: bool = False, interpolation: LinearInterpolation | None = None,
+            inbox_capacity: int | None = None):
         """
         Create a new playback system.
 
         :param tick_rate: tick rate in Hz, ex.: 20Hz
         :type tick_rate: int
+
+        :param buffer_capacity: maximum number of queued snapshots
+        :type buffer_capacity: int
+
+        :param target_depth: number of queued snapshots kept on each update
+        :type target_depth: int
+
+        :param metrics: metrics to report into, disabled if None
+        :type metrics: :class:`kitsunet.metrics.Metrics`
+
+        :param reuse_interpolated: overwrite the same interpolated snapshot
+            on every update instead of creating a new one, so it is valid
+            only until the next update
+        :type reuse_interpolated: bool
+
+        :param lazy_interpolation: interpolate entities only when they are
+            queried from the interpolated snapshot
+        :type lazy_interpolation: bool
+
+        :param interpolation: interpolation strategy, linear by default
+        :type interpolation: :class:`kitsunet.interpolation.LinearInterpolation`
+
+        :param inbox_capacity: maximum number of snapshots pushed from another
+            thread between updates, buffer capacity by default
+        :type inbox_capacity: int
         """
-        self._snapshot_queue = []
+        self._snapshot_queue = JitterBuffer(buffer_capacity, target_depth)
+        self._snapshot_inbox = SPSCQueue(inbox_capacity or buffer_capacity)
         self._tick_rate = tick_rate  # ex.: 20Hz
         self._tick_duration = 1 / tick_rate * 1000  # ex.: 1 / 20 * 1000 = 50ms
 
         self._next_snapshot = None
         self._prev_snapshot = None
+        self._before_snapshot = None
         self._intr_snapshot = None
+        self._intr_pool = None
+        self._reuse_interpolated = reuse_interpolated
+        self._lazy_interpolation = lazy_interpolation
+        self._interpolation = interpolation or LinearInterpolation()
 
         self._tick_time = 0
         self._real_time = 0
 
+        self._metrics = metrics
+        self._reported_counts = (0, 0, 0)
+
     def __str__(self) -> str:
         return f'<{self.__class__.__name__} {self._tick_rate}Hz>'
 
+    def get_metrics(self) -> Metrics | None:
+        return self._metrics
+
+    def set_metrics(self, metrics: Metrics | None):
+        """
+        Enable or disable instrumentation.
+
+        :param metrics: metrics to report into, disabled if None
+        :type metrics: :class:`kitsunet.metrics.Metrics`
+        """
+        self._metrics = metrics
+        self._reported_counts = self._get_queue_counts()
+
     def feed_snapshot(self, snapshot: WorldSnapshot):
         """
         Feed snapshot into queue.
@@ -44,19 +112,54 @@ class PlaybackSystem:
         :param snapshot: snapshot
         :type snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
         """
-        if snapshot.get_tick_id() <= self.get_tick_id():  # outdated
-            return
+        self._snapshot_queue.push(snapshot, self.get_tick_id())  # outdated are rejected
+
+    def push_snapshot(self, snapshot: WorldSnapshot) -> bool:
+        """
+        Push snapshot from the network thread.
+        Pushed snapshots are fed on the next update, so only one thread
+        may push and only one thread may update, without locks.
+
+        :param snapshot: snapshot
+        :type snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: was snapshot accepted? False if too many are pending
+        :rtype: bool
+        """
+        return self._snapshot_inbox.push(snapshot)
+
+    def get_snapshot_inbox(self) -> SPSCQueue:
+        """
+        Get queue of snapshots pushed from another thread.
+
+        :returns: queue
+        :rtype: :class:`kitsunet.spsc.SPSCQueue`
+        """
+        return self._snapshot_inbox
 
-        for i in range(len(self._snapshot_queue)):
-            if snapshot.get_tick_id() == self._snapshot_queue[i].get_tick_id():  # same
-                break
+    def _feed_pushed(self, item: WorldSnapshot):
+        self.feed_snapshot(item)
 
-            if snapshot.get_tick_id() > self._snapshot_queue[i].get_tick_id():  # newer
-                self._snapshot_queue.insert(i, snapshot)
-                break
+    def _drain_inboxes(self):
+        """Feed items pushed from other threads."""
+        if len(self._snapshot_inbox):
+            for item in self._snapshot_inbox.drain():
+                self._feed_pushed(item)
 
-        else:  # did not matched, add anyway
-            self._snapshot_queue.append(snapshot)
+    def reset(self):
+        """
+        Forget the played snapshots and clear the queue,
+        so playback can restart from any tick, ex.: when seeking a replay.
+        """
+        self._snapshot_queue.clear()
+        self._snapshot_inbox.drain()
+        self._next_snapshot = None
+        self._prev_snapshot = None
+        self._before_snapshot = None
+        self._intr_snapshot = None
+        self._intr_pool = None
+        self._tick_time = 0
+        self._real_time = 0
 
     def get_snapshot_queue_size(self) -> int:
         """
@@ -67,6 +170,15 @@ class PlaybackSystem:
         """
         return len(self._snapshot_queue)
 
+    def get_snapshot_queue(self) -> JitterBuffer:
+        """
+        Get snapshot queue.
+
+        :returns: jitter buffer
+        :rtype: :class:`kitsunet.jitter.JitterBuffer`
+        """
+        return self._snapshot_queue
+
     def get_tick_id(self) -> int:
         """
         Get tick ID of the next snapshot.
@@ -117,12 +229,12 @@ class PlaybackSystem:
         else:
             return (last_factor + tick_delta - 1) / tick_delta
 
-    def get_interpolated_snapshot(self) -> WorldSnapshot | None:
+    def get_interpolated_snapshot(self) -> WorldSnapshot | InterpolatedWorldView | None:
         """
         Get a snapshot which is a result of interpolation.
 
-        :returns: snapshot
-        :rtype: :class:`kitsunet.snapshot.Snapshot`
+        :returns: snapshot, a lazy view with lazy interpolation
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
         """
         return self._intr_snapshot
 
@@ -133,13 +245,31 @@ class PlaybackSystem:
         :returns: snapshot
         :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
         """
-        if self._snapshot_queue:
-            return self._snapshot_queue.pop(-1)
+        return self._snapshot_queue.pop()
 
     def _drop_snapshots(self):
-        """Clears snapshots queue."""
-        while self.get_snapshot_queue_size() > 1:
-            self._pull_snapshot()
+        """Clears snapshots queue down to the target depth."""
+        dropped: int = self._snapshot_queue.trim()
+        if dropped and self._metrics is not None:
+            self._metrics.increment(m.SNAPSHOTS_DROPPED, dropped)
+
+    def _get_queue_counts(self) -> tuple[int, int, int]:
+        queue: JitterBuffer = self._snapshot_queue
+        return queue.get_late_count(), queue.get_duplicate_count(), queue.get_overflow_count()
+
+    def _report_queue(self, metrics: Metrics):
+        """
+        Report snapshots rejected by the queue since the last update,
+        so feeding snapshots is not instrumented itself.
+        """
+        counts: tuple[int, int, int] = self._get_queue_counts()
+        for name, count, reported in zip(
+                (m.SNAPSHOTS_LATE, m.SNAPSHOTS_DUPLICATE, m.SNAPSHOTS_OVERFLOWED),
+                counts, self._reported_counts):
+            if count > reported:
+                metrics.increment(name, count - reported)
+        self._reported_counts = counts
+        metrics.observe(m.QUEUE_DEPTH, len(self._snapshot_queue))
 
     def _do_step(self) -> bool:
         """
@@ -150,6 +280,7 @@ class PlaybackSystem:
         if not wsnapshot:
             return False
 
+        self._before_snapshot = self._prev_snapshot
         self._prev_snapshot = self._next_snapshot
         self._next_snapshot = wsnapshot
         return True
@@ -161,12 +292,20 @@ class PlaybackSystem:
         :param dt: delta time in seconds
         :type dt: float
         """
+        metrics: Metrics | None = self._metrics
+        if metrics is not None:
+            start: float = time.perf_counter()
+
+        self._drain_inboxes()
+
         real_time_new: float = self._real_time + (dt * 1000)
         while self._tick_time < real_time_new:
             if self._do_step():
                 self._tick_time += self._tick_duration
                 self._real_time = max(self._real_time, self._tick_time)
             else:
+                if metrics is not None:
+                    metrics.increment(m.TICKS_STALLED)
                 break  # step failed - stop time
         else:
             self._real_time = real_time_new
@@ -175,8 +314,22 @@ class PlaybackSystem:
         factor: float = self.get_interpolation_factor()
         if factor == 1.0:
             self._intr_snapshot = self._next_snapshot
+        elif self._lazy_interpolation:
+            self._intr_snapshot = InterpolatedWorldView(
+                self._prev_snapshot, self._next_snapshot, factor, self._interpolation,
+                self._before_snapshot, self._snapshot_queue.peek())
         else:
-            self._intr_snapshot = self._prev_snapshot.interpolate(self._next_snapshot, factor)
+            self._intr_snapshot = self._interpolation.interpolate(
+                self._prev_snapshot, self._next_snapshot, factor,
+                self._before_snapshot, self._snapshot_queue.peek(),
+                out=self._intr_pool if self._reuse_interpolated else None)
+            if self._reuse_interpolated:
+                self._intr_pool = self._intr_snapshot
 
         # clear snapshots queue
         self._drop_snapshots()
+
+        if metrics is not None:
+            metrics.observe(m.INTERPOLATION_FACTOR, factor)
+            self._report_queue(metrics)
+            metrics.observe(m.UPDATE_TIME, time.perf_counter() - start)
@@ -1,6 +1,13 @@
+from . import metrics as m
 from .event import Event
+from .history import TickHistory
+from .interpolation import LinearInterpolation
+from .kernel import LinearKernel
+from .math import distance3
+from .metrics import Metrics
 from .playback import PlaybackSystem
 from .snapshot import Snapshot, WorldSnapshot
+from .spsc import SPSCQueue
 
 
 class PredictionSystem(PlaybackSystem):
@@ -11,27 +18,97 @@ class PredictionSystem(PlaybackSystem):
     _initial_snapshot: WorldSnapshot
     _local_entity_id: int
     _local_event_queue: list[Event]
-    _local_event_history: list[tuple[Event, WorldSnapshot]]
+    _local_event_inbox: SPSCQueue[Event]  # pushed by input thread
+    _local_event_history: TickHistory[tuple[Event, WorldSnapshot]]
     _event_class: type
     _event_kwargs: dict
+    _reconcile_tolerance: float
+    _reconcile_count: int
+    _kernel: LinearKernel | None
 
     def __init__(
             self, tick_rate: int, initial_snapshot: WorldSnapshot = None,
             local_entity_id: int = 0, event_class: type = None,
-            event_kwargs: dict = None):
+            event_kwargs: dict = None, history_size: int = 64,
+            reconcile_tolerance: float = 0.001, metrics: Metrics | None = None,
+            kernel: LinearKernel | None = None, buffer_capacity: int = 64,
+            target_depth: int = 1, inbox_capacity: int | None = None,
+            interpolation: LinearInterpolation | None = None):
         """
         Create a new prediction system.
 
         :param tick_rate: tick rate in Hz, ex.: 20Hz
         :type tick_rate: int
+
+        :param history_size: number of predicted ticks kept for reconciliation
+        :type history_size: int
+
+        :param reconcile_tolerance: prediction error ignored by reconciliation
+        :type reconcile_tolerance: float
+
+        :param metrics: metrics to report into, disabled if None
+        :type metrics: :class:`kitsunet.metrics.Metrics`
+
+        :param kernel: motion rule of prediction, same as on the server, linear by default
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+
+        :param buffer_capacity: maximum number of queued snapshots
+        :type buffer_capacity: int
+
+        :param target_depth: number of queued snapshots kept on each update
+        :type target_depth: int
+
+        :param inbox_capacity: maximum number of snapshots and of events pushed
+            from another thread between updates, buffer capacity by default
+        :type inbox_capacity: int
+
+        :param interpolation: interpolation strategy, linear by default
+        :type interpolation: :class:`kitsunet.interpolation.LinearInterpolation`
         """
-        super().__init__(tick_rate)
+        super().__init__(
+            tick_rate, buffer_capacity, target_depth, metrics,
+            interpolation=interpolation, inbox_capacity=inbox_capacity)
         self._local_entity_id = local_entity_id
         self._local_event_queue = []
-        self._local_event_history = []
+        self._local_event_inbox = SPSCQueue(inbox_capacity or buffer_capacity)
+        self._local_event_history = TickHistory(history_size)
         self._initial_snapshot = initial_snapshot or WorldSnapshot(tick_id=0)
         self._event_class = event_class or Event
         self._event_kwargs = event_kwargs or {}
+        self._reconcile_tolerance = reconcile_tolerance
+        self._reconcile_count = 0
+        self._kernel = kernel
+
+    def feed_snapshot(self, snapshot: WorldSnapshot):
+        """
+        Feed snapshot into queue.
+        Snapshots of already predicted ticks are used for reconciliation.
+
+        :param snapshot: snapshot
+        :type snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        if snapshot.get_tick_id() <= self.get_tick_id():
+            self._reconcile(snapshot)
+
+        super().feed_snapshot(snapshot)
+
+    def get_reconcile_count(self) -> int:
+        """
+        Get number of times prediction was corrected.
+
+        :returns: number of replays
+        :rtype: int
+        """
+        return self._reconcile_count
+
+    def get_history_size(self) -> int:
+        """
+        Get number of unacknowledged predicted ticks.
+
+        :returns: number of ticks
+        :rtype: int
+        """
+        return len(self._local_event_history)
 
     def feed_event(self, event: Event):
         """
@@ -42,6 +119,26 @@ class PredictionSystem(PlaybackSystem):
         """
         self._local_event_queue.append(event)
 
+    def push_event(self, event: Event) -> bool:
+        """
+        Push event from another thread.
+        Pushed events are fed on the next update, so only one thread
+        may push and only one thread may update, without locks.
+
+        :param event: event
+        :type event: :class:`kitsunet.event.Event`
+
+        :returns: was event accepted? False if too many are pending
+        :rtype: bool
+        """
+        return self._local_event_inbox.push(event)
+
+    def _drain_inboxes(self):
+        if len(self._local_event_inbox):
+            for event in self._local_event_inbox.drain():
+                self.feed_event(event)
+        super()._drain_inboxes()
+
     def get_event_queue_size(self) -> int:
         """
         Get event queue size.
@@ -83,9 +180,10 @@ class PredictionSystem(PlaybackSystem):
                 **self._event_kwargs,
             ))
 
-        return self._next_snapshot.extrapolate(events, self._tick_duration / 1000)
+        return self._next_snapshot.extrapolate(
+            events, self._tick_duration / 1000, tick_id=self.get_tick_id() + 1, kernel=self._kernel)
 
-    def _client_side_predict(self) -> tuple[Event, Snapshot]:
+    def _client_side_predict(self) -> tuple[Event, Snapshot | None]:
         """
         Client side prediction (CSP).
         Extrapolates remote entity state using input events.
@@ -96,15 +194,18 @@ class PredictionSystem(PlaybackSystem):
                 tick_id=self.get_tick_id(),
                 entity_id=self._local_entity_id,
                 **self._event_kwargs,
-            ))
+            )
 
-        if self._local_event_history:
-            _, local_wsnapshot: WorldSnapshot = self._local_event_history[-1]
-        else:
-            local_wsnapshot: WorldSnapshot = self._next_snapshot
+        local_wsnapshot: WorldSnapshot = self._next_snapshot
+        latest: tuple[Event, WorldSnapshot] | None = self._local_event_history.get_latest()
+        if latest:
+            _, local_wsnapshot = latest
+
+        snapshot: Snapshot | None = local_wsnapshot.get_snapshot(self._local_entity_id)
+        if not snapshot:
+            return event, None
 
-        snapshot: Snapshot = local_wsnapshot.get_snapshot(self._local_entity_id)
-        return snapshot.extrapolate([event], self._tick_duration / 1000)
+        return event, snapshot.extrapolate(event, self._tick_duration / 1000, self._kernel)
 
     def _pull_snapshot(self) -> WorldSnapshot:
         wsnapshot: WorldSnapshot = super()._pull_snapshot()
@@ -112,19 +213,77 @@ class PredictionSystem(PlaybackSystem):
         if not self._next_snapshot:
             self._next_snapshot = self._initial_snapshot
 
+        authoritative: Snapshot | None = None
         if not wsnapshot:
             wsnapshot = self._remote_entity_extrapolate()
+            if self._metrics is not None:
+                self._metrics.increment(m.TICKS_EXTRAPOLATED)
+        else:
+            authoritative = wsnapshot.get_snapshot(self._local_entity_id)
 
-        event, snapshot: tuple[Event, Snapshot] = self._client_side_predict()
-        wsnapshot.add_snapshot(self._local_entity_id, snapshot)
-        self._local_event_history.append((event, wsnapshot))
+        event, snapshot = self._client_side_predict()
+        if authoritative:  # server reconciliation of a tick played in order
+            if not self._is_mispredicted(snapshot, authoritative):
+                wsnapshot.add_snapshot(self._local_entity_id, snapshot)
+            else:  # nothing to replay after the newest tick
+                self._count_reconcile()
+            self._local_event_history.discard(wsnapshot.get_tick_id())  # acknowledged
+        else:
+            if snapshot:
+                wsnapshot.add_snapshot(self._local_entity_id, snapshot)
+            self._local_event_history.put(wsnapshot.get_tick_id(), (event, wsnapshot))
 
         return wsnapshot
 
+    def _is_mispredicted(self, predicted: Snapshot | None, snapshot: Snapshot) -> bool:
+        return not predicted or distance3(
+            predicted.get_position(), snapshot.get_position()) > self._reconcile_tolerance
+
+    def _count_reconcile(self):
+        self._reconcile_count += 1
+        if self._metrics is not None:
+            self._metrics.increment(m.RECONCILIATIONS)
+
+    def _reconcile(self, wsnapshot: WorldSnapshot) -> bool:
+        """
+        Server reconciliation.
+        Drops acknowledged history and, if the authoritative local entity
+        state differs from the predicted one, re-simulates the
+        unacknowledged events starting from the authoritative state.
+
+        :param wsnapshot: authoritative snapshot of a predicted tick
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: was prediction corrected?
+        :rtype: bool
+        """
+        tick_id: int = wsnapshot.get_tick_id()
+        entry: tuple[Event, WorldSnapshot] | None = self._local_event_history.get(tick_id)
+        snapshot: Snapshot | None = wsnapshot.get_snapshot(self._local_entity_id)
+        if not entry or not snapshot:
+            return False
+
+        _, predicted_wsnapshot = entry
+        predicted: Snapshot | None = predicted_wsnapshot.get_snapshot(self._local_entity_id)
+        replay: bool = self._is_mispredicted(predicted, snapshot)
+
+        if replay:  # rewind and replay
+            dt: float = self._tick_duration / 1000
+            predicted_wsnapshot.add_snapshot(self._local_entity_id, snapshot)
+            for replay_tick_id in range(tick_id + 1, self._local_event_history.get_last_tick_id() + 1):
+                replay_entry: tuple[Event, WorldSnapshot] | None = self._local_event_history.get(replay_tick_id)
+                if replay_entry:
+                    event, replay_wsnapshot = replay_entry
+                    snapshot = snapshot.extrapolate(event, dt, self._kernel)
+                    replay_wsnapshot.add_snapshot(self._local_entity_id, snapshot)
+            self._count_reconcile()
+
+        self._local_event_history.discard(tick_id)  # acknowledged
+        return replay
+
     def _drop_events(self):
-        """Clears events queue."""
-        while self.get_event_queue_size() > 1:
-            self._pull_event(pop=True)
+        """Clears events queue keeping the latest event."""
+        del self._local_event_queue[:-1]
 
     def update(self, dt: float):
         super().update(dt)
@@ -0,0 +1,271 @@
+from typing import Iterable, Self
+
+from .event import Event
+
+
+class EventBatch:
+    """
+    Input events of a single entity packed into runs
+    of consecutive ticks with the same velocity.
+    """
+    _entity_id: int
+    _runs: list[tuple[int, int, tuple[float]]]  # first tick ID, number of ticks, velocity
+
+    def __init__(self, entity_id: int, runs: list[tuple[int, int, tuple[float]]] | None = None):
+        """
+        Create a new event batch.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :param runs: runs of first tick ID, number of ticks and velocity
+            ordered by tick ID
+        :type runs: list
+        """
+        self._entity_id = entity_id
+        self._runs = runs or []
+
+    def __str__(self) -> str:
+        return (
+            f'EventBatch {self._entity_id} #{self.get_first_tick_id()}..#{self.get_last_tick_id()} '
+            f'({len(self)} events in {len(self._runs)} runs)')
+
+    def __len__(self) -> int:
+        return sum(count for _, count, _ in self._runs)
+
+    @classmethod
+    def from_events(cls, entity_id: int, events: Iterable[Event]) -> Self:
+        """
+        Pack events run-length encoded.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :param events: events of the entity ordered by tick ID
+        :type events: iterable
+
+        :returns: event batch
+        :rtype: :class:`kitsunet.redundancy.EventBatch`
+        """
+        runs: list[tuple[int, int, tuple[float]]] = []
+        for event in events:
+            tick_id: int = event.get_tick_id()
+            velocity: tuple[float] = event.get_velocity()
+            if runs:
+                first_tick_id, count, run_velocity = runs[-1]
+                if first_tick_id + count == tick_id and run_velocity == velocity:
+                    runs[-1] = (first_tick_id, count + 1, run_velocity)
+                    continue
+            runs.append((tick_id, 1, velocity))
+        return cls(entity_id, runs)
+
+    def get_entity_id(self) -> int:
+        return self._entity_id
+
+    def get_runs(self) -> list[tuple[int, int, tuple[float]]]:
+        return self._runs
+
+    def get_first_tick_id(self) -> int | None:
+        if self._runs:
+            return self._runs[0][0]
+
+    def get_last_tick_id(self) -> int | None:
+        if self._runs:
+            first_tick_id, count, _ = self._runs[-1]
+            return first_tick_id + count - 1
+
+    def get_events(self, after_tick_id: int | None = None, event_class: type | None = None) -> list[Event]:
+        """
+        Unpack events.
+
+        :param after_tick_id: unpack events of newer ticks only
+        :type after_tick_id: int
+
+        :param event_class: event class
+        :type event_class: type
+
+        :returns: events ordered by tick ID
+        :rtype: list
+        """
+        event_class = event_class or Event
+        events: list[Event] = []
+        for first_tick_id, count, velocity in self._runs:
+            start: int = first_tick_id
+            if after_tick_id is not None:
+                start = max(start, after_tick_id + 1)
+            for tick_id in range(start, first_tick_id + count):
+                events.append(event_class(tick_id=tick_id, entity_id=self._entity_id, velocity=velocity))
+        return events
+
+
+class EventBatcher:
+    """
+    Sender side input event batcher.
+
+    Keeps the latest unacknowledged events of every entity and packs
+    all of them into every batch, so an event is lost only if all
+    the packets carrying it are lost.
+    """
+    _redundancy: int
+    _pending: dict[int, list[Event]]  # ordered by tick ID
+
+    def __init__(self, redundancy: int = 16):
+        """
+        Create a new event batcher.
+
+        :param redundancy: maximum number of unacknowledged events sent per entity
+        :type redundancy: int
+        """
+        if redundancy < 1:
+            raise ValueError('redundancy must be positive')
+
+        self._redundancy = redundancy
+        self._pending = {}
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} x{self._redundancy} ({len(self._pending)} entities)>'
+
+    def get_redundancy(self) -> int:
+        return self._redundancy
+
+    def get_pending_count(self, entity_id: int) -> int:
+        """
+        Get number of unacknowledged events of the entity.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :returns: number of events
+        :rtype: int
+        """
+        return len(self._pending.get(entity_id, ()))
+
+    def push(self, event: Event):
+        """
+        Add event, the oldest unacknowledged one is forgotten if there are too many.
+
+        :param event: event
+        :type event: :class:`kitsunet.event.Event`
+        """
+        events: list[Event] = self._pending.setdefault(event.get_entity_id(), [])
+        tick_id: int = event.get_tick_id()
+
+        i: int = len(events)
+        while i and events[i - 1].get_tick_id() > tick_id:
+            i -= 1
+        if i and events[i - 1].get_tick_id() == tick_id:
+            events[i - 1] = event  # replaced
+        else:
+            events.insert(i, event)
+
+        if len(events) > self._redundancy:
+            del events[:-self._redundancy]
+
+    def acknowledge(self, entity_id: int, tick_id: int):
+        """
+        Forget events received by the other side.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :param tick_id: tick ID of the latest received event
+        :type tick_id: int
+        """
+        events: list[Event] | None = self._pending.get(entity_id)
+        if not events:
+            return
+
+        i: int = 0
+        while i < len(events) and events[i].get_tick_id() <= tick_id:
+            i += 1
+        del events[:i]
+
+    def remove_entity(self, entity_id: int):
+        self._pending.pop(entity_id, None)
+
+    def get_batch(self, entity_id: int) -> EventBatch | None:
+        """
+        Pack unacknowledged events of the entity.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :returns: event batch, None if all the events are acknowledged
+        :rtype: :class:`kitsunet.redundancy.EventBatch`
+        """
+        events: list[Event] | None = self._pending.get(entity_id)
+        if events:
+            return EventBatch.from_events(entity_id, events)
+
+    def get_batches(self) -> list[EventBatch]:
+        """
+        Pack unacknowledged events of all the entities.
+
+        :returns: event batches
+        :rtype: list
+        """
+        return [
+            EventBatch.from_events(entity_id, events)
+            for entity_id, events in self._pending.items()
+            if events
+        ]
+
+
+class EventDeduplicator:
+    """
+    Receiver side event batch unpacker.
+    Drops events which were already received or are older than them.
+    """
+    _last_tick_ids: dict[int, int]
+    _event_class: type
+    _duplicate_count: int
+
+    def __init__(self, event_class: type | None = None):
+        self._last_tick_ids = {}
+        self._event_class = event_class or Event
+        self._duplicate_count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} ({len(self._last_tick_ids)} entities)>'
+
+    def get_last_tick_id(self, entity_id: int) -> int | None:
+        """
+        Get tick ID of the latest received event of the entity.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :returns: tick ID, None if nothing was received
+        :rtype: int
+        """
+        return self._last_tick_ids.get(entity_id)
+
+    def get_duplicate_count(self) -> int:
+        """
+        Get number of dropped redundant events.
+
+        :returns: number of events
+        :rtype: int
+        """
+        return self._duplicate_count
+
+    def remove_entity(self, entity_id: int):
+        self._last_tick_ids.pop(entity_id, None)
+
+    def receive(self, batch: EventBatch) -> list[Event]:
+        """
+        Unpack new events of the batch.
+
+        :param batch: event batch
+        :type batch: :class:`kitsunet.redundancy.EventBatch`
+
+        :returns: events newer than the already received ones, ordered by tick ID
+        :rtype: list
+        """
+        entity_id: int = batch.get_entity_id()
+        last_tick_id: int | None = self._last_tick_ids.get(entity_id)
+        events: list[Event] = batch.get_events(last_tick_id, self._event_class)
+        self._duplicate_count += len(batch) - len(events)
+        if events:
+            self._last_tick_ids[entity_id] = events[-1].get_tick_id()
+        return events
@@ -0,0 +1,332 @@
+import mmap
+import os
+import struct
+from typing import BinaryIO, Iterator, Self
+
+from .codec import Codec
+from .event import Event
+from .playback import PlaybackSystem
+from .snapshot import Snapshot, WorldSnapshot
+
+REPLAY_MAGIC = b'KNRP'
+INDEX_SUFFIX = '.idx'
+
+_RECORD = struct.Struct('<I')  # length of encoded item
+_INDEX = struct.Struct('<QQ')  # tick ID, log offset
+
+
+class ReplayWriter:
+    """
+    Append-only replay log writer.
+
+    Every record is a length-prefixed item encoded by the codec.
+    The log is accompanied by an index file of tick IDs and offsets
+    of the first record of every new tick, so readers can seek
+    without scanning the log.
+    """
+    _path: str
+    _codec: Codec
+    _log: BinaryIO
+    _index: BinaryIO
+    _offset: int
+    _last_tick_id: int | None
+    _buffer: bytearray
+
+    def __init__(self, path: str, codec: Codec | None = None):
+        """
+        Create a new replay log, existing one is overwritten.
+
+        :param path: log file path, index is written next to it
+        :type path: str
+
+        :param codec: codec of the items
+        :type codec: :class:`kitsunet.codec.Codec`
+        """
+        self._path = path
+        self._codec = codec or Codec()
+        self._buffer = bytearray()
+
+        header: bytearray = bytearray(REPLAY_MAGIC)
+        self._codec.write_header(header)
+        self._log = open(path, 'wb')
+        self._index = open(path + INDEX_SUFFIX, 'wb')
+        self._log.write(header)
+        self._offset = len(header)
+        self._last_tick_id = None
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._path} #{self._last_tick_id}>'
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_path(self) -> str:
+        return self._path
+
+    def get_size(self) -> int:
+        return self._offset
+
+    def get_last_tick_id(self) -> int | None:
+        return self._last_tick_id
+
+    def write(self, item: Snapshot | WorldSnapshot | Event):
+        """
+        Append item to the log.
+
+        Ticks are indexed in the order they are written,
+        an item of an older tick is logged after the newer ones.
+
+        :param item: snapshot, world snapshot or event
+        :type item: object
+        """
+        buffer: bytearray = self._buffer
+        buffer.clear()
+        self._codec.write_item(buffer, item)
+
+        if isinstance(item, (WorldSnapshot, Event)):
+            tick_id: int = item.get_tick_id()
+            if self._last_tick_id is None or tick_id > self._last_tick_id:
+                self._index.write(_INDEX.pack(tick_id, self._offset))
+                self._last_tick_id = tick_id
+
+        self._log.write(_RECORD.pack(len(buffer)))
+        self._log.write(buffer)
+        self._offset += _RECORD.size + len(buffer)
+
+    def flush(self):
+        """Flush written records, so readers can see them."""
+        self._log.flush()
+        self._index.flush()
+
+    def close(self):
+        self._log.close()
+        self._index.close()
+
+
+class ReplayReader:
+    """
+    Memory-mapped replay log reader.
+
+    Items are decoded on demand straight from the mapped log,
+    seeking a tick is a binary search in the mapped index.
+    """
+    _path: str
+    _codec: Codec
+    _log: mmap.mmap | None
+    _index: mmap.mmap | None
+    _log_view: memoryview
+    _index_view: memoryview
+    _data_offset: int
+    _offset: int
+
+    def __init__(self, path: str, codec: Codec | None = None):
+        """
+        Open replay log.
+
+        :param path: log file path
+        :type path: str
+
+        :param codec: codec of the items, must match the writer one
+        :type codec: :class:`kitsunet.codec.Codec`
+        """
+        self._path = path
+        self._codec = codec or Codec()
+        self._log = None
+        self._index = None
+        self._log_view = memoryview(b'')
+        self._index_view = memoryview(b'')
+        self.refresh()
+
+        try:
+            if bytes(self._log_view[:len(REPLAY_MAGIC)]) != REPLAY_MAGIC:
+                raise ValueError(f'not a replay log {path}')
+            self._data_offset = self._codec.read_header(self._log_view, len(REPLAY_MAGIC))
+        except (ValueError, struct.error):
+            self.close()
+            raise
+        self._offset = self._data_offset
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._path} #{self.get_first_tick_id()}..#{self.get_last_tick_id()}>'
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self) -> Iterator[Snapshot | WorldSnapshot | Event]:
+        """Iterate items from the current position."""
+        while True:
+            item: Snapshot | WorldSnapshot | Event | None = self.read()
+            if item is None:
+                return
+            yield item
+
+    @staticmethod
+    def _map(path: str) -> mmap.mmap | None:
+        with open(path, 'rb') as f:
+            if not os.fstat(f.fileno()).st_size:
+                return None  # empty files can not be mapped
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _unmap(self):
+        self._log_view.release()
+        self._index_view.release()
+        for mapped in (self._log, self._index):
+            if mapped is not None:
+                mapped.close()
+
+    def refresh(self):
+        """
+        Map the log again, so records appended by a live writer
+        since the log was opened become readable, ex.: when spectating.
+        """
+        self._unmap()
+        self._log = self._map(self._path)
+        self._index = self._map(self._path + INDEX_SUFFIX)
+        self._log_view = memoryview(self._log if self._log is not None else b'')
+        self._index_view = memoryview(self._index if self._index is not None else b'')
+
+    def close(self):
+        self._unmap()
+        self._log = None
+        self._index = None
+        self._log_view = memoryview(b'')
+        self._index_view = memoryview(b'')
+
+    def get_size(self) -> int:
+        return len(self._log_view)
+
+    def get_tick_count(self) -> int:
+        """
+        Get number of indexed ticks.
+
+        :returns: number of ticks
+        :rtype: int
+        """
+        return len(self._index_view) // _INDEX.size
+
+    def _get_index(self, i: int) -> tuple[int, int]:
+        return _INDEX.unpack_from(self._index_view, i * _INDEX.size)
+
+    def get_first_tick_id(self) -> int | None:
+        if not self.get_tick_count():
+            return None
+        return self._get_index(0)[0]
+
+    def get_last_tick_id(self) -> int | None:
+        if not self.get_tick_count():
+            return None
+        return self._get_index(self.get_tick_count() - 1)[0]
+
+    def tell(self) -> int:
+        return self._offset
+
+    def rewind(self):
+        """Move to the first record."""
+        self._offset = self._data_offset
+
+    def seek(self, tick_id: int) -> int | None:
+        """
+        Move to the first record of the tick or of the next logged tick.
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :returns: tick ID of the record, None if the tick is after the end of the log
+        :rtype: int
+        """
+        low: int = 0
+        high: int = self.get_tick_count()
+        while low < high:  # first indexed tick not less than the wanted one
+            middle: int = (low + high) // 2
+            if self._get_index(middle)[0] < tick_id:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == self.get_tick_count():
+            self._offset = len(self._log_view)
+            return None
+
+        found_tick_id, self._offset = self._get_index(low)
+        return found_tick_id
+
+    def read(self) -> Snapshot | WorldSnapshot | Event | None:
+        """
+        Read item at the current position and move to the next one.
+
+        :returns: snapshot, world snapshot or event,
+            None at the end of the log or of its completely written part
+        :rtype: object
+        """
+        view: memoryview = self._log_view
+        start: int = self._offset + _RECORD.size
+        if start > len(view):
+            return None
+        end: int = start + _RECORD.unpack_from(view, self._offset)[0]
+        if end > len(view):
+            return None
+
+        item, offset = self._codec.read_item(view, start)
+        if offset != end:
+            raise ValueError(f'corrupted record at {self._offset}')
+        self._offset = end
+        return item
+
+    def read_world_snapshot(self) -> WorldSnapshot | None:
+        """
+        Read the next world snapshot, skipping other items.
+
+        :returns: world snapshot, None at the end of the log
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        for item in self:
+            if isinstance(item, WorldSnapshot):
+                return item
+
+    def feed(self, playback: PlaybackSystem, count: int) -> int:
+        """
+        Feed the next world snapshots into playback.
+
+        :param playback: playback system
+        :type playback: :class:`kitsunet.playback.PlaybackSystem`
+
+        :param count: maximum number of world snapshots
+        :type count: int
+
+        :returns: number of fed world snapshots
+        :rtype: int
+        """
+        fed: int = 0
+        while fed < count:
+            wsnapshot: WorldSnapshot | None = self.read_world_snapshot()
+            if wsnapshot is None:
+                break
+            playback.feed_snapshot(wsnapshot)
+            fed += 1
+        return fed
+
+    def scrub(self, playback: PlaybackSystem, tick_id: int, count: int = 2) -> int:
+        """
+        Restart playback from the tick.
+
+        :param playback: playback system
+        :type playback: :class:`kitsunet.playback.PlaybackSystem`
+
+        :param tick_id: tick ID
+        :type tick_id: int
+
+        :param count: number of world snapshots fed ahead
+        :type count: int
+
+        :returns: number of fed world snapshots
+        :rtype: int
+        """
+        playback.reset()
+        self.seek(tick_id)
+        return self.feed(playback, count)
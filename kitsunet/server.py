@@ -0,0 +1,300 @@
+import asyncio
+import heapq
+import time
+from typing import Protocol
+
+from .event import Event
+from .kernel import LinearKernel
+from .lagcomp import WorldHistory
+from .snapshot import Snapshot, WorldSnapshot
+
+
+class Client(Protocol):
+    """
+    Anything world snapshots can be sent to, ex.: :class:`kitsunet.streamer.Streamer`.
+    """
+    def send_snapshot(self, wsnapshot: WorldSnapshot):
+        ...
+
+
+class ServerSystem:
+    """
+    Authoritative simulation system.
+    Applies queued input events on fixed ticks and sends
+    every resulting world snapshot to all the connected clients.
+    """
+    _tick_rate: int  # in Hz
+    _tick_duration: float  # in ms
+    _max_catch_up: int  # ticks per update
+
+    _wsnapshot: WorldSnapshot
+    _clients: dict[int, Client]
+    _event_queue: list[tuple[int, int, Event]]  # min-heap by tick ID
+    _event_count: int
+    _inputs: dict[int, Event]  # latest input of every entity
+    _idle_events: dict[int, Event]
+    _spawn_queue: list[Snapshot]
+    _despawn_queue: set[int]
+    _event_class: type
+    _event_kwargs: dict
+    _history: WorldHistory | None
+    _kernel: LinearKernel | None
+
+    _accumulator: float  # in ms
+    _running: bool
+    _tick_cost: float  # in ms, moving average
+    _last_tick_cost: float  # in ms
+    _overrun_count: int
+
+    def __init__(
+            self, tick_rate: int, initial_snapshot: WorldSnapshot | None = None,
+            event_class: type | None = None, event_kwargs: dict | None = None,
+            max_catch_up: int = 5, history_size: int = 0, kernel: LinearKernel | None = None):
+        """
+        Create a new server system.
+
+        :param tick_rate: tick rate in Hz, ex.: 20Hz
+        :type tick_rate: int
+
+        :param initial_snapshot: world state before the first tick
+        :type initial_snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param max_catch_up: maximum number of ticks done in one update
+        :type max_catch_up: int
+
+        :param history_size: number of world snapshots kept for lag compensation,
+            disabled if 0
+        :type history_size: int
+
+        :param kernel: motion rule of the simulation, linear by default
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+        """
+        self._tick_rate = tick_rate
+        self._tick_duration = 1 / tick_rate * 1000
+        self._max_catch_up = max_catch_up
+
+        self._wsnapshot = initial_snapshot or WorldSnapshot(tick_id=0)
+        self._clients = {}
+        self._event_queue = []
+        self._event_count = 0
+        self._inputs = {}
+        self._idle_events = {}
+        self._spawn_queue = []
+        self._despawn_queue = set()
+        self._event_class = event_class or Event
+        self._event_kwargs = event_kwargs or {}
+        self._history = None
+        if history_size:
+            self._history = WorldHistory(history_size)
+            self._history.record(self._wsnapshot)
+        self._kernel = kernel
+
+        self._accumulator = 0
+        self._running = False
+        self._tick_cost = 0
+        self._last_tick_cost = 0
+        self._overrun_count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._tick_rate}Hz ({len(self._clients)} clients)>'
+
+    def get_tick_id(self) -> int:
+        return self._wsnapshot.get_tick_id()
+
+    def get_tick_time(self) -> float:
+        """
+        Get time of the server tick clock, ex.: for :class:`kitsunet.clock.ClockSync` replies.
+
+        :returns: time in seconds since tick 0
+        :rtype: float
+        """
+        return (self.get_tick_id() * self._tick_duration + self._accumulator) / 1000
+
+    def get_world_snapshot(self) -> WorldSnapshot:
+        """
+        Get world snapshot of the last tick.
+
+        :returns: world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        return self._wsnapshot
+
+    def get_history(self) -> WorldHistory | None:
+        """
+        Get history of world snapshots for lag compensation.
+
+        :returns: world history, None if disabled
+        :rtype: :class:`kitsunet.lagcomp.WorldHistory`
+        """
+        return self._history
+
+    def add_client(self, client_id: int, client: Client):
+        self._clients[client_id] = client
+
+    def remove_client(self, client_id: int):
+        self._clients.pop(client_id, None)
+
+    def get_client_count(self) -> int:
+        return len(self._clients)
+
+    def spawn(self, snapshot: Snapshot):
+        """
+        Add entity on the next tick.
+
+        :param snapshot: initial entity state
+        :type snapshot: :class:`kitsunet.snapshot.Snapshot`
+        """
+        self._spawn_queue.append(snapshot)
+
+    def despawn(self, entity_id: int):
+        """
+        Remove entity on the next tick.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+        """
+        self._despawn_queue.add(entity_id)
+
+    def feed_event(self, event: Event):
+        """
+        Feed event into queue.
+        Event becomes the entity input on the tick following its tick ID
+        and stays until replaced, same as in client side prediction.
+
+        :param event: event
+        :type event: :class:`kitsunet.event.Event`
+        """
+        self._event_count += 1
+        heapq.heappush(self._event_queue, (event.get_tick_id(), self._event_count, event))
+
+    def get_event_queue_size(self) -> int:
+        return len(self._event_queue)
+
+    def get_tick_cost(self) -> float:
+        """
+        Get average processing time of a tick.
+
+        :returns: time in seconds
+        :rtype: float
+        """
+        return self._tick_cost / 1000
+
+    def get_headroom(self) -> float:
+        """
+        Get part of the tick budget left unused by processing.
+
+        :returns: headroom from 0.0 (overloaded) to 1.0 (idle)
+        :rtype: float
+        """
+        return max(0.0, 1 - self._tick_cost / self._tick_duration)
+
+    def get_overrun_count(self) -> int:
+        """
+        Get number of times the simulation fell behind real time.
+
+        :returns: number of overruns
+        :rtype: int
+        """
+        return self._overrun_count
+
+    def _get_event(self, entity_id: int, tick_id: int) -> Event:
+        event: Event | None = self._inputs.get(entity_id)
+        if event:
+            return event
+
+        event = self._idle_events.get(entity_id)
+        if not event:
+            event = self._idle_events[entity_id] = self._event_class(
+                tick_id=tick_id,
+                entity_id=entity_id,
+                **self._event_kwargs,
+            )
+        return event
+
+    def _do_tick(self) -> WorldSnapshot:
+        """
+        Do a single tick.
+        Simulates next world snapshot and sends it to all the clients.
+        """
+        start: float = time.perf_counter()
+        tick_id: int = self.get_tick_id()
+
+        while self._event_queue and self._event_queue[0][0] <= tick_id:
+            _, _, event = heapq.heappop(self._event_queue)
+            self._inputs[event.get_entity_id()] = event
+
+        for entity_id in self._despawn_queue:
+            self._inputs.pop(entity_id, None)
+            self._idle_events.pop(entity_id, None)
+
+        events: list[Event] = [
+            self._get_event(entity_id, tick_id)
+            for entity_id in self._wsnapshot.get_entity_ids()
+            if entity_id not in self._despawn_queue
+        ]
+        self._despawn_queue.clear()
+
+        wsnapshot: WorldSnapshot = self._wsnapshot.extrapolate(
+            events, self._tick_duration / 1000, tick_id=tick_id + 1, kernel=self._kernel)
+        for snapshot in self._spawn_queue:
+            wsnapshot.add_snapshot(snapshot.get_entity_id(), snapshot)
+        self._spawn_queue.clear()
+        self._wsnapshot = wsnapshot
+        if self._history is not None:
+            self._history.record(wsnapshot)
+
+        for client in self._clients.values():  # same snapshot object for everyone
+            client.send_snapshot(wsnapshot)
+
+        self._last_tick_cost = (time.perf_counter() - start) * 1000
+        self._tick_cost += (self._last_tick_cost - self._tick_cost) / 16
+        return wsnapshot
+
+    def update(self, dt: float):
+        """
+        Advances time doing as many ticks as fit into it.
+
+        :param dt: delta time in seconds
+        :type dt: float
+        """
+        self._accumulator += dt * 1000
+
+        ticks: int = 0
+        while self._accumulator >= self._tick_duration:
+            if ticks >= self._max_catch_up:  # fell behind, skip time
+                self._accumulator = 0
+                self._overrun_count += 1
+                break
+
+            self._do_tick()
+            self._accumulator -= self._tick_duration
+            ticks += 1
+
+    async def run(self, ticks: int | None = None):
+        """
+        Run fixed rate tick loop.
+
+        :param ticks: number of ticks to do, forever if None
+        :type ticks: int
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        tick_duration: float = self._tick_duration / 1000
+        next_time: float = loop.time()
+        done: int = 0
+
+        self._running = True
+        while self._running and (ticks is None or done < ticks):
+            next_time += tick_duration
+            delay: float = next_time - loop.time()
+            if delay < -tick_duration * self._max_catch_up:  # fell behind, skip time
+                next_time = loop.time()
+                self._overrun_count += 1
+            await asyncio.sleep(max(0.0, delay))  # let other tasks run
+
+            self._do_tick()
+            done += 1
+        self._running = False
+
+    def stop(self):
+        """Stop tick loop."""
+        self._running = False
@@ -0,0 +1,283 @@
+import multiprocessing
+import threading
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Self
+
+import numpy as np
+
+from .columnar import ColumnarWorldSnapshot
+from .event import Event
+from .kernel import LinearKernel
+from .snapshot import WorldSnapshot
+
+_CONTROL_READ = 0  # index of the position buffer to read
+_CONTROL_STOP = 1  # workers exit if set
+
+
+def _attach(name: str, shape: tuple, dtype: type) -> tuple[SharedMemory, np.ndarray]:
+    shm: SharedMemory = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _run_shard(
+        names: tuple[str, str, str], count: int, buffers: int,
+        start: int, end: int, dt: float, barrier, kernel: LinearKernel | None = None):
+    """
+    Worker process loop.
+    Extrapolates rows from *start* to *end* every tick,
+    reading one position buffer and writing the next one.
+    Velocities changed by the kernel are written back.
+    """
+    shms: list[SharedMemory] = []
+    arrays: list[np.ndarray] = []
+    try:
+        shapes: tuple = ((buffers, count, 3), (count, 3), (2,))
+        for name, shape, dtype in zip(names, shapes, (np.float64, np.float64, np.int64)):
+            shm, array = _attach(name, shape, dtype)
+            shms.append(shm)
+            arrays.append(array)
+        positions, velocities, control = arrays
+
+        step: np.ndarray = np.empty((end - start, 3), dtype=np.float64)
+        while True:
+            barrier.wait()  # tick started
+            if control[_CONTROL_STOP]:
+                break
+
+            read: int = int(control[_CONTROL_READ])
+            if kernel is None:  # same as the linear kernel, without allocations
+                np.divide(velocities[start:end], dt, out=step)
+                np.add(positions[read, start:end], step, out=positions[(read + 1) % buffers, start:end])
+            else:
+                rows: np.ndarray = velocities[start:end]
+                moved, stepped = kernel.step(positions[read, start:end], rows, dt)
+                positions[(read + 1) % buffers, start:end] = moved
+                if stepped is not rows:
+                    rows[:] = stepped
+            barrier.wait()  # tick done
+    finally:
+        arrays.clear()  # views must be released before closing
+        positions = velocities = control = rows = moved = stepped = None
+        for shm in shms:
+            shm.close()
+
+
+class ShardedSimulation:
+    """
+    World simulation split into shards of entity ID ranges,
+    each extrapolated by its own worker process.
+
+    Positions and input velocities live in shared memory, so shards
+    exchange no pickled objects and every shard can read the whole
+    world. Ticks are synchronized with a barrier and positions are
+    written into a ring of buffers, so the world snapshot of a tick
+    is a view of its buffer which stays valid for *buffers* - 1 ticks
+    and until the simulation is closed. The set of entities is fixed.
+    """
+    _tick_rate: int  # in Hz
+    _tick_duration: float  # in ms
+    _tick_id: int
+    _entity_ids: np.ndarray
+    _buffers: int
+    _shard_count: int
+    _timeout: float | None
+    _snapshot_class: type
+
+    _shms: list[SharedMemory]
+    _positions: np.ndarray  # buffers x N x 3
+    _velocities: np.ndarray  # N x 3
+    _control: np.ndarray
+    _barrier: threading.Barrier
+    _workers: list[multiprocessing.Process]
+
+    def __init__(
+            self, tick_rate: int, initial_snapshot: WorldSnapshot, shards: int | None = None,
+            buffers: int = 2, timeout: float | None = 10.0, start_method: str | None = None,
+            kernel: LinearKernel | None = None):
+        """
+        Create a new sharded simulation and start its workers.
+
+        :param tick_rate: tick rate in Hz, ex.: 20Hz
+        :type tick_rate: int
+
+        :param initial_snapshot: world state before the first tick
+        :type initial_snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param shards: number of worker processes, one per CPU by default
+        :type shards: int
+
+        :param buffers: number of position buffers, at least 2
+        :type buffers: int
+
+        :param timeout: maximum time in seconds to wait for workers
+        :type timeout: float
+
+        :param start_method: multiprocessing start method, platform default if None
+        :type start_method: str
+
+        :param kernel: motion rule, picklable, linear by default
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+        """
+        if buffers < 2:
+            raise ValueError('at least 2 buffers are needed')
+
+        wsnapshot: ColumnarWorldSnapshot = ColumnarWorldSnapshot.from_world_snapshot(initial_snapshot)
+        count: int = len(wsnapshot._entity_ids)
+        shards = max(1, min(shards or multiprocessing.cpu_count(), count or 1))
+
+        self._tick_rate = tick_rate
+        self._tick_duration = 1 / tick_rate * 1000
+        self._tick_id = wsnapshot.get_tick_id()
+        self._entity_ids = wsnapshot._entity_ids.copy()
+        self._entity_ids.setflags(write=False)
+        self._buffers = buffers
+        self._shard_count = shards
+        self._timeout = timeout
+        self._snapshot_class = wsnapshot._snapshot_class
+
+        self._shms = []
+        self._positions = self._allocate((buffers, count, 3), np.float64)
+        self._velocities = self._allocate((count, 3), np.float64)
+        self._control = self._allocate((2,), np.int64)
+        self._positions[0] = wsnapshot._positions
+        self._velocities[:] = 0
+        self._control[:] = 0
+
+        context = multiprocessing.get_context(start_method)
+        self._barrier = context.Barrier(shards + 1)
+        names: tuple[str, str, str] = tuple(shm.name for shm in self._shms)
+        bounds: np.ndarray = np.linspace(0, count, shards + 1).astype(int)
+        self._workers = [
+            context.Process(
+                target=_run_shard,
+                args=(names, count, buffers, int(bounds[i]), int(bounds[i + 1]),
+                      self._tick_duration / 1000, self._barrier, kernel),
+                daemon=True)
+            for i in range(shards)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._tick_rate}Hz #{self._tick_id} ({self._shard_count} shards)>'
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _allocate(self, shape: tuple, dtype: type) -> np.ndarray:
+        size: int = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        shm: SharedMemory = SharedMemory(create=True, size=size)
+        self._shms.append(shm)
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    def get_tick_id(self) -> int:
+        return self._tick_id
+
+    def get_shard_count(self) -> int:
+        return self._shard_count
+
+    def get_entity_ids(self) -> np.ndarray:
+        return self._entity_ids
+
+    def get_world_snapshot(self) -> ColumnarWorldSnapshot:
+        """
+        Get world snapshot of the last tick without copying positions.
+        It is overwritten after *buffers* - 1 more ticks.
+
+        :returns: world snapshot, copied on change
+        :rtype: :class:`kitsunet.columnar.ColumnarWorldSnapshot`
+        """
+        positions: np.ndarray = self._positions[self._control[_CONTROL_READ]]
+        positions.setflags(write=False)
+        wsnapshot: ColumnarWorldSnapshot = ColumnarWorldSnapshot.from_arrays(
+            tick_id=self._tick_id,
+            entity_ids=self._entity_ids,
+            positions=positions,
+            snapshot_class=self._snapshot_class,
+        )
+        wsnapshot._shared = True  # never changed in place
+        return wsnapshot
+
+    def feed_velocities(self, velocities: np.ndarray, mask: np.ndarray | None = None):
+        """
+        Set input velocities used from the next tick on.
+
+        :param velocities: Nx3 array of velocities, one row per entity ID
+        :type velocities: :class:`numpy.ndarray`
+
+        :param mask: array of flags of entities to update, all if None
+        :type mask: :class:`numpy.ndarray`
+        """
+        if mask is None:
+            self._velocities[:] = velocities
+        else:
+            self._velocities[mask] = velocities[mask]
+
+    def feed_events(self, events: Iterable[Event]):
+        """
+        Set input velocities from events, the last event of an entity wins.
+        Inputs stay until replaced, same as in the server system.
+
+        :param events: events
+        :type events: iterable
+        """
+        events = list(events)
+        if not events or not len(self._entity_ids):
+            return
+
+        event_ids: np.ndarray = np.fromiter(
+            (event.get_entity_id() for event in events), dtype=np.int64, count=len(events))
+        rows: np.ndarray = np.minimum(
+            np.searchsorted(self._entity_ids, event_ids), len(self._entity_ids) - 1)
+        found: np.ndarray = self._entity_ids[rows] == event_ids
+        velocities: np.ndarray = np.array(
+            [event.get_velocity() for event in events], dtype=np.float64).reshape(-1, 3)
+        self._velocities[rows[found]] = velocities[found]  # later rows are assigned last
+
+    def _wait(self):
+        try:
+            self._barrier.wait(self._timeout)
+        except threading.BrokenBarrierError:
+            raise RuntimeError('shard worker failed or timed out') from None
+
+    def step(self) -> ColumnarWorldSnapshot:
+        """
+        Do a single tick in all the shards.
+
+        :returns: world snapshot of the tick
+        :rtype: :class:`kitsunet.columnar.ColumnarWorldSnapshot`
+        """
+        self._wait()  # start
+        self._wait()  # done
+        self._control[_CONTROL_READ] = (self._control[_CONTROL_READ] + 1) % self._buffers
+        self._tick_id += 1
+        return self.get_world_snapshot()
+
+    def close(self):
+        """
+        Stop workers and free shared memory.
+        World snapshots of the simulation must not be used after it.
+        """
+        if not self._shms:
+            return
+
+        if self._workers:
+            self._control[_CONTROL_STOP] = 1
+            try:
+                self._barrier.wait(self._timeout)
+            except threading.BrokenBarrierError:
+                pass
+            for worker in self._workers:
+                worker.join(self._timeout)
+                if worker.is_alive():
+                    worker.terminate()
+            self._workers = []
+
+        self._positions = self._velocities = self._control = None
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
+        self._shms = []
@@ -1,13 +1,18 @@
-from typing import Self
+from typing import Iterable, Self
 
-from .math import add3, div3, lerp3
+from .math import add3, blend3, div3, hermite3, lerp3, scale3, sub3
 from .event import Event
+from .kernel import LINEAR_KERNEL, LinearKernel
+
+_ZERO: tuple[float] = (0.0, 0.0, 0.0)
 
 
 class Snapshot:
     """
     Game entity state.
     """
+    __slots__ = ('_entity_id', '_position')
+
     _entity_id: int
     _position: tuple[float]
 
@@ -24,7 +29,7 @@ class Snapshot:
     def get_position(self) -> tuple[float]:
         return self._position
 
-    def interpolate(self, snapshot: Self, factor: float) -> Self:
+    def interpolate(self, snapshot: Self, factor: float, out: Self | None = None) -> Self:
         """
         Get iterpolated snapshot between current one and another one.
 
@@ -34,17 +39,27 @@ class Snapshot:
         :param factor: interpolation factor
         :type factor: float
 
+        :param out: pooled snapshot to overwrite instead of creating a new one
+        :type out: :class:`kitsunet.snapshot.Snapshot`
+
         :returns: interpolated snapshot
         :rtype: :class:`kitsunet.snapshot.Snapshot`
         """
+        if out is not None:
+            out._entity_id = self._entity_id
+            out._position = lerp3(self._position, snapshot.get_position(), factor)
+            return out
+
         return self.__class__(
             entity_id=self.get_entity_id(),
             position=lerp3(self.get_position(), snapshot.get_position(), factor)
         )
 
-    def extrapolate(self, event: Event, dt: float) -> Self:
+    def interpolate_hermite(
+            self, snapshot: Self, factor: float,
+            tangent_a: tuple[float], tangent_b: tuple[float]) -> Self:
         """
-        Get iterpolated snapshot between current one and another one.
+        Get cubic Hermite interpolated snapshot between current one and another one.
 
         :param snapshot: snapshot to interpolate into
         :type snapshot: :class:`kitsunet.snapshot.Snapshot`
@@ -52,12 +67,46 @@ class Snapshot:
         :param factor: interpolation factor
         :type factor: float
 
+        :param tangent_a: velocity at the current snapshot per interpolation span
+        :type tangent_a: tuple
+
+        :param tangent_b: velocity at another snapshot per interpolation span
+        :type tangent_b: tuple
+
         :returns: interpolated snapshot
         :rtype: :class:`kitsunet.snapshot.Snapshot`
         """
-        new_position: tuple[float] = self.get_position()
-        if dt != 0:
-            new_position: tuple[float] = add3(new_position, div3(event.get_velocity(), (dt, dt, dt)))
+        return self.__class__(
+            entity_id=self.get_entity_id(),
+            position=hermite3(self.get_position(), snapshot.get_position(), tangent_a, tangent_b, factor)
+        )
+
+    def extrapolate(self, event: Event, dt: float, kernel: LinearKernel | None = None) -> Self:
+        """
+        Get extrapolated snapshot of the next tick.
+        Snapshot itself is returned if the event does not move it.
+
+        :param event: input event
+        :type event: :class:`kitsunet.event.Event`
+
+        :param dt: tick duration in seconds
+        :type dt: float
+
+        :param kernel: motion rule, position += velocity / dt if None
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+
+        :returns: extrapolated snapshot
+        :rtype: :class:`kitsunet.snapshot.Snapshot`
+        """
+        velocity: tuple[float] = event.get_velocity()
+        if kernel is not None:
+            (new_position,), _ = kernel.step_tuples([self._position], [velocity], dt)
+            if new_position == self._position:
+                return self
+        elif dt == 0 or velocity == _ZERO:
+            return self
+        else:
+            new_position = add3(self.get_position(), div3(velocity, (dt, dt, dt)))
 
         return self.__class__(
             entity_id=self.get_entity_id(),
@@ -65,16 +114,116 @@ class Snapshot:
         )
 
 
+class HermiteWeights:
+    """
+    Tangent weights of cubic Hermite interpolation between two ticks.
+
+    Tangents are velocities per interpolation span. At a tick with
+    neighbours on both sides the velocity is the derivative of the parabola
+    through three snapshots (Catmull-Rom for equal spacing), at the edge of
+    the buffer it is extrapolated along the same parabola.
+    """
+    __slots__ = ('_span', '_before', '_after', '_weights_a', '_weights_b')
+
+    _span: int  # in ticks
+    _before: int | None  # ticks from the snapshot before to the first one
+    _after: int | None  # ticks from the second one to the snapshot after
+    _weights_a: tuple[tuple[float, float], tuple[float, float]]  # with snapshot before, after only
+    _weights_b: tuple[tuple[float, float], tuple[float, float]]  # with snapshot after, before only
+
+    def __init__(self, span: int, before: int | None = None, after: int | None = None):
+        """
+        Create new tangent weights.
+
+        :param span: ticks between the interpolated snapshots
+        :type span: int
+
+        :param before: ticks from the snapshot before to the first one
+        :type before: int
+
+        :param after: ticks from the second one to the snapshot after
+        :type after: int
+        """
+        self._span = span
+        self._before = before if before and before > 0 and span > 0 else None
+        self._after = after if after and after > 0 and span > 0 else None
+
+        h_before: float = self._before or 1
+        h_after: float = self._after or 1
+        self._weights_a = (
+            (span * h_before / (h_before + span), span * span / (h_before + span)),
+            (span * (1 + span / (span + h_after)), -span * span / (span + h_after)),
+        )
+        self._weights_b = (
+            (span * h_after / (span + h_after), span * span / (span + h_after)),
+            (span * (1 + span / (h_before + span)), -span * span / (h_before + span)),
+        )
+
+    def get_span(self) -> int:
+        return self._span
+
+    def get_before(self) -> int | None:
+        return self._before
+
+    def get_after(self) -> int | None:
+        return self._after
+
+    def get_weights(self) -> tuple[tuple, tuple]:
+        """
+        Get weights of span velocity and neighbour velocity in tangents.
+
+        :returns: weights at the first and at the second snapshot,
+            each with a neighbour on the same side and on the other side only
+        :rtype: tuple
+        """
+        return self._weights_a, self._weights_b
+
+    def get_tangents(
+            self, position_a: tuple[float], position_b: tuple[float],
+            position_before: tuple[float] | None = None,
+            position_after: tuple[float] | None = None) -> tuple[tuple[float], tuple[float]]:
+        """
+        Get tangents at both ends of the interpolation span.
+
+        :returns: tangent at the first and at the second position
+        :rtype: tuple
+        """
+        chord: tuple[float] = sub3(position_b, position_a)
+        if position_before is None and position_after is None:
+            return chord, chord
+
+        velocity: tuple[float] = scale3(chord, 1 / self._span)
+        if position_before is not None:
+            velocity_before: tuple[float] = scale3(sub3(position_a, position_before), 1 / self._before)
+            tangent_a: tuple[float] = blend3(velocity, velocity_before, *self._weights_a[0])
+        if position_after is not None:
+            velocity_after: tuple[float] = scale3(sub3(position_after, position_b), 1 / self._after)
+            tangent_b: tuple[float] = blend3(velocity, velocity_after, *self._weights_b[0])
+
+        if position_before is None:
+            tangent_a = blend3(velocity, velocity_after, *self._weights_a[1])
+        if position_after is None:
+            tangent_b = blend3(velocity, velocity_before, *self._weights_b[1])
+        return tangent_a, tangent_b
+
+
 class WorldSnapshot:
     """
     Game world state.
+
+    Copies share entity snapshots dict with the original
+    until either of them is changed (copy-on-write).
     """
+    __slots__ = ('_tick_id', '_snapshots', '_shared')
+
     _tick_id: int
     _snapshots: dict
+    _shared: bool  # snapshots dict is shared with a copy
 
     def __init__(self, tick_id: int, snapshots: tuple[Snapshot] | list[Snapshot] | None = None):
         self._tick_id = tick_id
         self._snapshots = {}
+        self._shared = False
         for snapshot in (snapshots or []):
             self._snapshots[snapshot.get_entity_id()] = snapshot
 
@@ -87,13 +236,67 @@ class WorldSnapshot:
     def get_entity_ids(self) -> frozenset[int]:
         return frozenset(self._snapshots.keys())
 
+    def copy(self, tick_id: int | None = None) -> Self:
+        """
+        Get a copy sharing entity snapshots until changed.
+
+        :param tick_id: tick ID of the copy, same by default
+        :type tick_id: int
+
+        :returns: world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        wsnapshot: Self = self.__class__(tick_id=self.get_tick_id() if tick_id is None else tick_id)
+        wsnapshot._snapshots = self._snapshots
+        wsnapshot._shared = self._shared = True
+        return wsnapshot
+
     def add_snapshot(self, entity_id: int, snapshot: Snapshot):
+        if self._shared:
+            self._snapshots = dict(self._snapshots)
+            self._shared = False
         self._snapshots[entity_id] = snapshot
 
     def get_snapshot(self, entity_id: int) -> Snapshot | None:
         return self._snapshots.get(entity_id)
 
-    def interpolate(self, wsnapshot: Self, factor: float) -> Self:
+    def get_snapshots(self, entity_ids: Iterable[int]) -> dict[int, Snapshot]:
+        """
+        Get snapshots of many entities.
+
+        :param entity_ids: entity IDs
+        :type entity_ids: iterable
+
+        :returns: snapshots by entity ID, missing entities are left out
+        :rtype: dict
+        """
+        snapshots: dict[int, Snapshot] = self._snapshots
+        return {
+            entity_id: snapshots[entity_id]
+            for entity_id in entity_ids
+            if entity_id in snapshots
+        }
+
+    def interpolate(self, wsnapshot: Self, factor: float, out: Self | None = None) -> Self:
+        """
+        Get iterpolated world snapshot between current one and another one.
+
+        :param wsnapshot: world snapshot to interpolate into
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param factor: interpolation factor
+        :type factor: float
+
+        :param out: pooled world snapshot to overwrite together with its
+            entity snapshots instead of creating new ones
+        :type out: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :returns: interpolated world snapshot, *out* if given
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        if out is not None and out.__class__ is self.__class__:
+            return self._interpolate_into(wsnapshot, factor, out)
+
         snapshots: list[Snapshot] = []
 
         for entity_id in self.get_entity_ids():
@@ -107,16 +310,164 @@ class WorldSnapshot:
             snapshots=snapshots,
         )
 
-    def extrapolate(self, events: list[Event], dt: float, tick_id: int | None) -> Self:
+    def interpolate_snapshots(self, wsnapshot: Self, factor: float, entity_ids: Iterable[int]) -> dict[int, Snapshot]:
+        """
+        Get iterpolated snapshots of some entities only.
+
+        :param wsnapshot: world snapshot to interpolate into
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param factor: interpolation factor
+        :type factor: float
+
+        :param entity_ids: entity IDs
+        :type entity_ids: iterable
+
+        :returns: snapshots by entity ID, entities missing in either world snapshot are left out
+        :rtype: dict
+        """
+        snapshots: dict[int, Snapshot] = {}
+        for entity_id in entity_ids:
+            snapshot_a: Snapshot | None = self.get_snapshot(entity_id)
+            snapshot_b: Snapshot | None = wsnapshot.get_snapshot(entity_id)
+            if snapshot_a and snapshot_b:
+                snapshots[entity_id] = snapshot_a.interpolate(snapshot_b, factor)
+        return snapshots
+
+    def interpolate_hermite(
+            self, wsnapshot: Self, factor: float,
+            before: Self | None = None, after: Self | None = None,
+            entity_ids: Iterable[int] | None = None) -> Self:
+        """
+        Get cubic Hermite interpolated world snapshot between current one
+        and another one. Velocities at both ends are estimated from
+        the neighbouring world snapshots as in Catmull-Rom splines,
+        so motion is smooth across ticks. With a neighbour on one side
+        only, velocities come from a parabola through three snapshots.
+
+        :param wsnapshot: world snapshot to interpolate into
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param factor: interpolation factor
+        :type factor: float
+
+        :param before: world snapshot preceding the current one
+        :type before: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param after: world snapshot following another one
+        :type after: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param entity_ids: entities to interpolate, all by default
+        :type entity_ids: iterable
+
+        :returns: interpolated world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        tick_a: int = self.get_tick_id()
+        span: int = wsnapshot.get_tick_id() - tick_a
+        weights: HermiteWeights = HermiteWeights(
+            span,
+            before and tick_a - before.get_tick_id(),
+            after and after.get_tick_id() - wsnapshot.get_tick_id())
+        if not weights.get_before():
+            before = None
+        if not weights.get_after():
+            after = None
+
         snapshots: list[Snapshot] = []
+        for entity_id in (self._snapshots if entity_ids is None else entity_ids):
+            snapshot_a: Snapshot | None = self.get_snapshot(entity_id)
+            snapshot_b: Snapshot | None = wsnapshot.get_snapshot(entity_id)
+            if not snapshot_a or not snapshot_b:
+                continue
+
+            position_a: tuple[float] = snapshot_a.get_position()
+            position_b: tuple[float] = snapshot_b.get_position()
+            snapshot_before: Snapshot | None = before and before.get_snapshot(entity_id)
+            snapshot_after: Snapshot | None = after and after.get_snapshot(entity_id)
+            tangent_a, tangent_b = weights.get_tangents(
+                position_a, position_b,
+                snapshot_before and snapshot_before.get_position(),
+                snapshot_after and snapshot_after.get_position())
+            snapshots.append(snapshot_a.interpolate_hermite(snapshot_b, factor, tangent_a, tangent_b))
+
+        return self.__class__(
+            tick_id=tick_a,
+            snapshots=snapshots,
+        )
+
+    def _interpolate_into(self, wsnapshot: Self, factor: float, out: Self) -> Self:
+        if out._shared:
+            out._snapshots = {}
+            out._shared = False
+
+        out._tick_id = self.get_tick_id()
+        pool: dict[int, Snapshot] = out._snapshots
+        written: int = 0
+        for entity_id, snapshot_a in self._snapshots.items():
+            snapshot_b: Snapshot | None = wsnapshot.get_snapshot(entity_id)
+            if snapshot_b:
+                pooled: Snapshot | None = pool.get(entity_id)
+                pool[entity_id] = snapshot_a.interpolate(snapshot_b, factor, out=pooled)
+                written += 1
+
+        if len(pool) > written:  # remove entities missing in this interpolation
+            for entity_id in [
+                    e for e in pool
+                    if e not in self._snapshots or not wsnapshot.get_snapshot(e)]:
+                del pool[entity_id]
+        return out
+
+    def extrapolate(
+            self, events: list[Event], dt: float, tick_id: int | None = None,
+            kernel: LinearKernel | None = None) -> Self:
+        """
+        Get extrapolated world snapshot with entities which have events.
+        If every entity has an event, snapshots of the entities
+        which did not move are shared with the current world snapshot.
+        All the entities are moved with a single kernel call.
+
+        :param events: input events
+        :type events: list
+
+        :param dt: tick duration in seconds
+        :type dt: float
+
+        :param tick_id: tick ID of the new world snapshot, same by default
+        :type tick_id: int
+
+        :param kernel: motion rule, position += velocity / dt if None
+        :type kernel: :class:`kitsunet.kernel.LinearKernel`
+
+        :returns: world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        snapshots: dict[int, Snapshot] = self._snapshots
+        velocities: dict[int, tuple[float]] = {}  # the last event wins
 
         for event in events:
-            snapshot: Snapshot = self.get_snapshot(event.get_entity_id())
-            if snapshot:
-                snapshots.append(snapshot.extrapolate(event, dt))
+            entity_id: int = event.get_entity_id()
+            if entity_id in snapshots:
+                velocities[entity_id] = event.get_velocity()
+
+        moved: list[Snapshot] = [snapshots[entity_id] for entity_id in velocities]
+        positions, _ = (kernel or LINEAR_KERNEL).step_tuples(
+            [snapshot._position for snapshot in moved], list(velocities.values()), dt)
+
+        extrapolated: dict[int, Snapshot] = {}
+        for snapshot, position in zip(moved, positions):
+            if position != snapshot._position:
+                snapshot = snapshot.__class__(entity_id=snapshot._entity_id, position=position)
+            extrapolated[snapshot._entity_id] = snapshot
+
+        if len(extrapolated) == len(snapshots):
+            wsnapshot: Self = self.copy(tick_id)
+            for entity_id, snapshot in extrapolated.items():
+                if snapshot is not snapshots[entity_id]:
+                    wsnapshot.add_snapshot(entity_id, snapshot)
+            return wsnapshot
 
         return self.__class__(
-            # tick_id=self.get_tick_id() + 1,
             tick_id=self.get_tick_id() if tick_id is None else tick_id,
-            snapshots=snapshots,
+            snapshots=list(extrapolated.values()),
         )
@@ -0,0 +1,106 @@
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class SPSCQueue(Generic[T]):
+    """
+    Bounded single-producer/single-consumer queue.
+
+    One thread pushes, another one pops, without locks: the producer
+    only advances the write counter after the item is stored and the
+    consumer only advances the read counter after the item is taken,
+    and both stores are atomic in the interpreter. Every counter is
+    written by one side only.
+    """
+    _slots: list[T | None]
+    _head: int  # read counter, written by consumer
+    _tail: int  # write counter, written by producer
+    _drop_count: int  # written by producer
+
+    def __init__(self, capacity: int = 256):
+        """
+        Create a new queue.
+
+        :param capacity: maximum number of queued items
+        :type capacity: int
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be positive')
+
+        self._slots = [None] * capacity
+        self._head = 0
+        self._tail = 0
+        self._drop_count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {len(self)}/{len(self._slots)}>'
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def get_capacity(self) -> int:
+        return len(self._slots)
+
+    def get_drop_count(self) -> int:
+        """
+        Get number of items rejected because the queue was full.
+
+        :returns: number of items
+        :rtype: int
+        """
+        return self._drop_count
+
+    def push(self, item: T) -> bool:
+        """
+        Add item, producer side only.
+
+        :param item: item
+        :type item: object
+
+        :returns: was item added? False if the queue is full
+        :rtype: bool
+        """
+        tail: int = self._tail
+        if tail - self._head >= len(self._slots):
+            self._drop_count += 1
+            return False
+
+        self._slots[tail % len(self._slots)] = item
+        self._tail = tail + 1  # publish
+        return True
+
+    def pop(self) -> T | None:
+        """
+        Remove and get the oldest item, consumer side only.
+
+        :returns: item, None if the queue is empty
+        :rtype: object
+        """
+        head: int = self._head
+        if head == self._tail:
+            return None
+
+        slot: int = head % len(self._slots)
+        item: T = self._slots[slot]
+        self._slots[slot] = None
+        self._head = head + 1  # release the slot
+        return item
+
+    def drain(self) -> list[T]:
+        """
+        Remove and get all the items pushed so far, consumer side only.
+
+        :returns: items in pushing order
+        :rtype: list
+        """
+        head: int = self._head
+        tail: int = self._tail
+        size: int = len(self._slots)
+        items: list[T] = []
+        for i in range(head, tail):
+            slot: int = i % size
+            items.append(self._slots[slot])
+            self._slots[slot] = None
+        self._head = tail
+        return items
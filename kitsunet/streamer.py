@@ -1,2 +1,408 @@
-class Streamer:
-    pass
+import asyncio
+import struct
+from typing import Callable, Self
+
+from .codec import Codec
+from .delta import DeltaDecoder, DeltaSnapshot
+from .event import Event
+from .playback import PlaybackSystem
+from .redundancy import EventBatch, EventDeduplicator
+from .snapshot import WorldSnapshot
+
+_PACKET_HEADER = struct.Struct('<HHIB')  # sequence, ack, ack bits, flags
+FLAG_ACK = 0x01
+
+SEQUENCE_MASK = 0xffff
+ACK_BITS = 32
+
+
+def sequence_greater(a: int, b: int) -> bool:
+    """
+    Compare 16-bit sequence numbers with wrap around.
+
+    :returns: is sequence *a* newer than *b*?
+    :rtype: bool
+    """
+    return (a > b and a - b <= 0x8000) or (a < b and b - a > 0x8000)
+
+
+class Streamer(asyncio.DatagramProtocol):
+    """
+    Datagram transport of snapshots and events.
+
+    Queued snapshots and events are packed into as few datagrams
+    as fit under the MTU budget. Every datagram carries a sequence
+    number and acknowledges the received ones with a bitfield.
+    """
+    _codec: Codec
+    _playback: PlaybackSystem | None
+    _mtu: int
+    _max_item_size: int  # MTU less the packet header
+    _remote_addr: tuple | None
+    _transport: asyncio.DatagramTransport | None
+
+    _on_event: Callable[[Event], None] | None
+    _on_ack: Callable[[int], None] | None
+    _on_event_ack: Callable[[int, int], None] | None
+    _deduplicator: EventDeduplicator
+    _delta_decoder: DeltaDecoder | None
+
+    # encoded item, world snapshot tick ID, event batch entity ID and last tick ID
+    _outgoing: list[tuple[bytes, int | None, tuple[int, int] | None]]
+    _sent_packets: dict[int, tuple[list[int], list[tuple[int, int]]]]  # sequence -> tick IDs, event batches
+    _local_sequence: int
+    _remote_sequence: int | None
+    _ack_bits: int
+    _ack_pending: bool
+
+    _sent_count: int
+    _received_count: int
+    _discarded_count: int
+
+    def __init__(
+            self, codec: Codec | None = None, playback: PlaybackSystem | None = None,
+            mtu: int = 1200, remote_addr: tuple | None = None,
+            on_event: Callable[[Event], None] | None = None,
+            on_ack: Callable[[int], None] | None = None,
+            on_event_ack: Callable[[int, int], None] | None = None):
+        """
+        Create a new streamer.
+
+        :param codec: codec of snapshots and events
+        :type codec: :class:`kitsunet.codec.Codec`
+
+        :param playback: system fed with received world snapshots
+        :type playback: :class:`kitsunet.playback.PlaybackSystem`
+
+        :param mtu: maximum datagram size in bytes,
+            every queued item must fit in one datagram
+        :type mtu: int
+
+        :param remote_addr: address of the remote side, None if connected
+        :type remote_addr: tuple
+
+        :param on_event: called with every received event,
+            events of event batches are passed once
+        :type on_event: callable
+
+        :param on_ack: called with tick ID of every acknowledged world snapshot
+        :type on_ack: callable
+
+        :param on_event_ack: called with entity ID and last tick ID
+            of every acknowledged event batch
+        :type on_event_ack: callable
+        """
+        self._codec = codec or Codec()
+        self._playback = playback
+        self._mtu = mtu
+        header: bytearray = bytearray(_PACKET_HEADER.size)
+        self._codec.write_header(header)
+        self._max_item_size = mtu - len(header)
+        self._remote_addr = remote_addr
+        self._transport = None
+
+        self._on_event = on_event
+        self._on_ack = on_ack
+        self._on_event_ack = on_event_ack
+        self._deduplicator = EventDeduplicator(self._codec.get_event_class())
+        self._delta_decoder = None
+
+        self._outgoing = []
+        self._sent_packets = {}
+        self._local_sequence = 0
+        self._remote_sequence = None
+        self._ack_bits = 0
+        self._ack_pending = False
+
+        self._sent_count = 0
+        self._received_count = 0
+        self._discarded_count = 0
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} {self._remote_addr} #{self._local_sequence}>'
+
+    @classmethod
+    async def open(
+            cls, local_addr: tuple | None = None, remote_addr: tuple | None = None,
+            **kwargs) -> Self:
+        """
+        Create a streamer bound to UDP socket.
+
+        :param local_addr: local address to bind
+        :type local_addr: tuple
+
+        :param remote_addr: remote address to connect
+        :type remote_addr: tuple
+
+        :returns: streamer
+        :rtype: :class:`kitsunet.streamer.Streamer`
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        _, streamer = await loop.create_datagram_endpoint(
+            lambda: cls(remote_addr=remote_addr, **kwargs),
+            local_addr=local_addr)
+        return streamer
+
+    def connection_made(self, transport: asyncio.DatagramTransport):
+        self._transport = transport
+
+    def connection_lost(self, exc: Exception | None):
+        self._transport = None
+
+    def close(self):
+        if self._transport:
+            self._transport.close()
+
+    def get_local_sequence(self) -> int:
+        return self._local_sequence
+
+    def get_remote_sequence(self) -> int | None:
+        return self._remote_sequence
+
+    def get_ack_bits(self) -> int:
+        return self._ack_bits
+
+    def get_sent_count(self) -> int:
+        return self._sent_count
+
+    def get_received_count(self) -> int:
+        return self._received_count
+
+    def get_discarded_count(self) -> int:
+        return self._discarded_count
+
+    def get_max_item_size(self) -> int:
+        """
+        Get size of the largest item which fits in a datagram.
+
+        :returns: number of bytes
+        :rtype: int
+        """
+        return self._max_item_size
+
+    def get_outgoing_size(self) -> int:
+        """
+        Get number of queued snapshots and events.
+
+        :returns: number of items
+        :rtype: int
+        """
+        return len(self._outgoing)
+
+    def send_snapshot(self, wsnapshot: WorldSnapshot):
+        """
+        Queue world snapshot for sending.
+        Its encoded size must not exceed :meth:`get_max_item_size`.
+
+        :param wsnapshot: world snapshot
+        :type wsnapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        buffer: bytearray = bytearray()
+        self._codec.write_item(buffer, wsnapshot)
+        self._queue(bytes(buffer), wsnapshot.get_tick_id(), None)
+
+    def send_encoded(self, data: bytes, tick_id: int | None = None):
+        """
+        Queue an already encoded item for sending,
+        ex.: a payload shared by many clients.
+        Its size must not exceed :meth:`get_max_item_size`.
+
+        :param data: item encoded by :meth:`kitsunet.codec.Codec.write_item`
+        :type data: bytes
+
+        :param tick_id: tick ID to acknowledge if the item is a world snapshot
+        :type tick_id: int
+        """
+        self._queue(data, tick_id, None)
+
+    def send_event(self, event: Event):
+        """
+        Queue event for sending.
+        Its encoded size must not exceed :meth:`get_max_item_size`.
+
+        :param event: event
+        :type event: :class:`kitsunet.event.Event`
+        """
+        buffer: bytearray = bytearray()
+        self._codec.write_item(buffer, event)
+        self._queue(bytes(buffer), None, None)
+
+    def send_event_batch(self, batch: EventBatch):
+        """
+        Queue event batch for sending.
+        Its encoded size must not exceed :meth:`get_max_item_size`.
+
+        :param batch: event batch
+        :type batch: :class:`kitsunet.redundancy.EventBatch`
+        """
+        buffer: bytearray = bytearray()
+        self._codec.write_item(buffer, batch)
+        self._queue(bytes(buffer), None, (batch.get_entity_id(), batch.get_last_tick_id()))
+
+    def _queue(self, data: bytes, tick_id: int | None, batch: tuple[int, int] | None):
+        if len(data) > self._max_item_size:  # would be sent in an oversized datagram
+            raise ValueError(f'item of {len(data)} bytes does not fit in MTU of {self._mtu} bytes')
+        self._outgoing.append((data, tick_id, batch))
+
+    def _make_header(self, buffer: bytearray):
+        flags: int = 0
+        ack: int = 0
+        if self._remote_sequence is not None:
+            flags |= FLAG_ACK
+            ack = self._remote_sequence
+
+        buffer += _PACKET_HEADER.pack(self._local_sequence, ack, self._ack_bits, flags)
+        self._codec.write_header(buffer)
+
+    def _send_packet(self, buffer: bytearray, tick_ids: list[int], batches: list[tuple[int, int]]):
+        sequence: int = self._local_sequence
+        self._sent_packets[sequence] = (tick_ids, batches)
+        self._sent_packets.pop((sequence - ACK_BITS - 1) & SEQUENCE_MASK, None)  # can not be acked anymore
+        self._local_sequence = (sequence + 1) & SEQUENCE_MASK
+        self._ack_pending = False
+        self._sent_count += 1
+        self._transport.sendto(bytes(buffer), self._remote_addr)
+
+    def flush(self) -> int:
+        """
+        Send queued snapshots and events.
+        Sends an empty packet if there is nothing to send but acks.
+        Nothing is sent before the connection is made, items stay queued.
+
+        :returns: number of sent packets
+        :rtype: int
+        """
+        if self._transport is None or not self._outgoing and not self._ack_pending:
+            return 0
+
+        sent: int = 0
+        buffer: bytearray = bytearray()
+        self._make_header(buffer)
+        header_size: int = len(buffer)
+        tick_ids: list[int] = []
+        batches: list[tuple[int, int]] = []
+
+        for data, tick_id, batch in self._outgoing:
+            if len(buffer) > header_size and len(buffer) + len(data) > self._mtu:
+                self._send_packet(buffer, tick_ids, batches)
+                sent += 1
+                buffer = bytearray()
+                self._make_header(buffer)
+                tick_ids = []
+                batches = []
+
+            buffer += data
+            if tick_id is not None:
+                tick_ids.append(tick_id)
+            if batch is not None:
+                batches.append(batch)
+
+        self._send_packet(buffer, tick_ids, batches)
+        self._outgoing.clear()
+        return sent + 1
+
+    def _is_new_sequence(self, sequence: int) -> bool:
+        if self._remote_sequence is None or sequence_greater(sequence, self._remote_sequence):
+            return True
+
+        distance: int = (self._remote_sequence - sequence) & SEQUENCE_MASK
+        if distance == 0 or distance > ACK_BITS:  # duplicate or too old
+            return False
+        return not self._ack_bits & 1 << (distance - 1)  # duplicate if set
+
+    def _receive_sequence(self, sequence: int) -> bool:
+        """
+        Mark sequence number as received.
+
+        :returns: is sequence new?
+        :rtype: bool
+        """
+        if not self._is_new_sequence(sequence):
+            return False
+
+        if self._remote_sequence is None:
+            self._remote_sequence = sequence
+        elif sequence_greater(sequence, self._remote_sequence):
+            shift: int = (sequence - self._remote_sequence) & SEQUENCE_MASK
+            self._ack_bits = ((self._ack_bits << shift) | (1 << (shift - 1))) & 0xffffffff
+            self._remote_sequence = sequence
+        else:
+            distance: int = (self._remote_sequence - sequence) & SEQUENCE_MASK
+            self._ack_bits |= 1 << (distance - 1)
+        return True
+
+    def _receive_acks(self, ack: int, ack_bits: int):
+        sequences: list[int] = [ack]
+        for i in range(ACK_BITS):
+            if ack_bits >> i & 1:
+                sequences.append((ack - 1 - i) & SEQUENCE_MASK)
+
+        for sequence in sequences:
+            sent: tuple[list[int], list[tuple[int, int]]] | None = self._sent_packets.pop(sequence, None)
+            if not sent:
+                continue
+
+            tick_ids, batches = sent
+            if self._on_ack:
+                for tick_id in tick_ids:
+                    self._on_ack(tick_id)
+            if self._on_event_ack:
+                for entity_id, tick_id in batches:
+                    self._on_event_ack(entity_id, tick_id)
+
+    def _decode_delta(self, delta: DeltaSnapshot) -> WorldSnapshot | None:
+        if self._delta_decoder is None:
+            self._delta_decoder = DeltaDecoder(
+                snapshot_class=self._codec.get_snapshot_class(),
+                world_snapshot_class=self._codec.get_world_snapshot_class())
+        return self._delta_decoder.decode(delta)
+
+    def datagram_received(self, data: bytes, addr: tuple):
+        view: memoryview = memoryview(data)
+        if len(view) < _PACKET_HEADER.size:
+            self._discarded_count += 1
+            return
+
+        items: list = []
+        try:
+            offset: int = self._codec.read_header(view, _PACKET_HEADER.size)
+            while offset < len(view):
+                item, offset = self._codec.read_item(view, offset)
+                items.append(item)
+        except (ValueError, IndexError, struct.error):  # malformed packet, neither acked nor sequenced
+            self._discarded_count += 1
+            return
+
+        sequence, ack, ack_bits, flags = _PACKET_HEADER.unpack_from(view, 0)
+        if not self._is_new_sequence(sequence):
+            self._discarded_count += 1
+            return
+
+        for i, item in enumerate(items):
+            if isinstance(item, DeltaSnapshot):
+                items[i] = self._decode_delta(item)
+                if items[i] is None:  # baseline is gone, not acked so the tick never becomes one
+                    self._discarded_count += 1
+                    return
+
+        self._receive_sequence(sequence)
+
+        if self._remote_addr is None:
+            self._remote_addr = addr
+
+        self._received_count += 1
+        self._ack_pending = True
+        if flags & FLAG_ACK:
+            self._receive_acks(ack, ack_bits)
+
+        for item in items:
+            if isinstance(item, WorldSnapshot):
+                if self._playback:
+                    self._playback.feed_snapshot(item)
+            elif isinstance(item, Event):
+                if self._on_event:
+                    self._on_event(item)
+            elif isinstance(item, EventBatch):
+                for event in self._deduplicator.receive(item):
+                    if self._on_event:
+                        self._on_event(event)
@@ -0,0 +1,123 @@
+from typing import Iterable
+
+from .interpolation import LinearInterpolation
+from .snapshot import Snapshot, WorldSnapshot
+
+_MISSING = object()
+
+
+class InterpolatedWorldView:
+    """
+    Lazy interpolated world state.
+
+    Has the read API of :class:`kitsunet.snapshot.WorldSnapshot`, but
+    interpolates entities only when they are queried and memoizes them,
+    so the cost depends on the number of queried entities instead of
+    the world size. Entities are interpolated from the world snapshots
+    as they are at query time.
+    """
+    _prev_snapshot: WorldSnapshot
+    _next_snapshot: WorldSnapshot
+    _factor: float
+    _interpolation: LinearInterpolation
+    _before: WorldSnapshot | None
+    _after: WorldSnapshot | None
+    _cache: dict[int, Snapshot | None]
+
+    def __init__(
+            self, prev_snapshot: WorldSnapshot, next_snapshot: WorldSnapshot, factor: float,
+            interpolation: LinearInterpolation | None = None,
+            before: WorldSnapshot | None = None, after: WorldSnapshot | None = None):
+        """
+        Create a new interpolated world view.
+
+        :param prev_snapshot: world snapshot to interpolate from
+        :type prev_snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param next_snapshot: world snapshot to interpolate into
+        :type next_snapshot: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param factor: interpolation factor
+        :type factor: float
+
+        :param interpolation: interpolation strategy, linear by default
+        :type interpolation: :class:`kitsunet.interpolation.LinearInterpolation`
+
+        :param before: world snapshot preceding the previous one
+        :type before: :class:`kitsunet.snapshot.WorldSnapshot`
+
+        :param after: world snapshot following the next one
+        :type after: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        self._prev_snapshot = prev_snapshot
+        self._next_snapshot = next_snapshot
+        self._factor = factor
+        self._interpolation = interpolation or LinearInterpolation()
+        self._before = before
+        self._after = after
+        self._cache = {}
+
+    def __str__(self) -> str:
+        return f'<{self.__class__.__name__} #{self.get_tick_id()} x{self._factor}>'
+
+    def get_tick_id(self) -> int:
+        return self._prev_snapshot.get_tick_id()
+
+    def get_factor(self) -> float:
+        return self._factor
+
+    def get_entity_ids(self) -> frozenset[int]:
+        return self._prev_snapshot.get_entity_ids() & self._next_snapshot.get_entity_ids()
+
+    def get_snapshot(self, entity_id: int) -> Snapshot | None:
+        """
+        Get interpolated entity snapshot.
+
+        :param entity_id: entity ID
+        :type entity_id: int
+
+        :returns: snapshot, None if entity is missing in either world snapshot
+        :rtype: :class:`kitsunet.snapshot.Snapshot`
+        """
+        snapshot: Snapshot | None = self._cache.get(entity_id, _MISSING)
+        if snapshot is _MISSING:
+            snapshot = self._cache[entity_id] = self._interpolation.interpolate_snapshots(
+                self._prev_snapshot, self._next_snapshot, self._factor,
+                (entity_id,), self._before, self._after).get(entity_id)
+        return snapshot
+
+    def get_snapshots(self, entity_ids: Iterable[int]) -> dict[int, Snapshot]:
+        """
+        Get interpolated snapshots of many entities.
+
+        :param entity_ids: entity IDs
+        :type entity_ids: iterable
+
+        :returns: snapshots by entity ID, missing entities are left out
+        :rtype: dict
+        """
+        entity_ids = list(entity_ids)
+        missing: list[int] = [entity_id for entity_id in entity_ids if entity_id not in self._cache]
+        if missing:
+            interpolated: dict[int, Snapshot] = self._interpolation.interpolate_snapshots(
+                self._prev_snapshot, self._next_snapshot, self._factor,
+                missing, self._before, self._after)
+            for entity_id in missing:
+                self._cache[entity_id] = interpolated.get(entity_id)
+
+        snapshots: dict[int, Snapshot] = {}
+        for entity_id in entity_ids:
+            snapshot: Snapshot | None = self._cache[entity_id]
+            if snapshot:
+                snapshots[entity_id] = snapshot
+        return snapshots
+
+    def to_world_snapshot(self) -> WorldSnapshot:
+        """
+        Interpolate all the entities.
+
+        :returns: world snapshot
+        :rtype: :class:`kitsunet.snapshot.WorldSnapshot`
+        """
+        return self._interpolation.interpolate(
+            self._prev_snapshot, self._next_snapshot, self._factor, self._before, self._after)
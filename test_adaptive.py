@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+import random
+import unittest
+
+from kitsunet.adaptive import AdaptivePlaybackSystem
+from kitsunet.snapshot import WorldSnapshot
+
+
+def play(playback: AdaptivePlaybackSystem, jitter: float, seconds: float = 60, seed: int = 1):
+    """Play snapshots sent at 20Hz and delayed by up to *jitter* seconds, rendering at 60Hz."""
+    rnd = random.Random(seed)
+    arrivals = sorted(
+        (tick_id * 0.05 + 0.03 + rnd.random() * jitter, tick_id)
+        for tick_id in range(1, int(seconds * 20)))
+
+    t, i = 0.0, 0
+    while t < seconds:
+        t += 1 / 60
+        while i < len(arrivals) and arrivals[i][0] <= t:
+            arrival_time, tick_id = arrivals[i]
+            playback.feed_snapshot(WorldSnapshot(tick_id=tick_id), arrival_time=arrival_time)
+            i += 1
+        playback.update(1 / 60)
+
+
+class AdaptivePlaybackSystemTestCase(unittest.TestCase):
+    def test_steady(self):
+        """Steady link keeps minimal depth."""
+        playback = AdaptivePlaybackSystem(tick_rate=20)
+        play(playback, jitter=0, seconds=10)
+        self.assertAlmostEqual(playback.get_jitter(), 0)
+        self.assertEqual(playback.get_target_depth(), 1)
+        self.assertAlmostEqual(playback.get_playout_rate(), 1, places=2)
+        self.assertEqual(playback.get_snapshot_queue().get_drop_count(), 0)
+
+    def test_jitter(self):
+        """Jittery link grows depth and keeps stall rate near the bound."""
+        playback = AdaptivePlaybackSystem(tick_rate=20, stall_bound=0.01)
+        play(playback, jitter=0.2, seconds=300)
+        self.assertAlmostEqual(playback.get_jitter(), 0.2 / 3, delta=0.02)  # mean |D| of uniform delay
+        self.assertGreater(playback.get_target_depth(), 2)
+        self.assertLess(playback.get_stall_rate(), 0.02)
+        self.assertEqual(playback.get_snapshot_queue().get_drop_count(), 0)
+
+    def test_dilation(self):
+        """Playout clock speeds up on a deep buffer and is clamped."""
+        playback = AdaptivePlaybackSystem(tick_rate=20, max_dilation=0.05)
+        for tick_id in range(1, 21):
+            playback.feed_snapshot(WorldSnapshot(tick_id=tick_id), arrival_time=0)
+        for _ in range(20):
+            playback.update(1 / 60)
+        self.assertAlmostEqual(playback.get_playout_rate(), 1.05)
+        self.assertLess(playback.get_depth(), 20)
+
+    def test_stall_bound(self):
+        """Stall bound must be a fraction."""
+        with self.assertRaises(ValueError):
+            AdaptivePlaybackSystem(tick_rate=20, stall_bound=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kitsunet.batch import BatchPredictionSystem, run_parallel
+from kitsunet.event import Event
+from kitsunet.kernel import AccelerationKernel, DragKernel, LinearKernel
+from kitsunet.prediction import PredictionSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+class BatchPredictionSystemTestCase(unittest.TestCase):
+    def test_same_as_individual(self):
+        """Same results as individual prediction systems, with any kernel."""
+        for kernel in (None, DragKernel(2.0), AccelerationKernel((0.0, 0.0, -1.0))):
+            with self.subTest(kernel=str(kernel)):
+                self.check_same_as_individual(kernel)
+
+    def check_same_as_individual(self, kernel: LinearKernel | None):
+        rnd = random.Random(1)
+        count = 16
+        positions = [(rnd.uniform(-10, 10), rnd.uniform(-10, 10), 0.0) for _ in range(count)]
+        systems = [
+            PredictionSystem(20, initial_snapshot=WorldSnapshot(0, [
+                Snapshot(entity_id=0, position=position),
+            ]), kernel=kernel)
+            for position in positions
+        ]
+        batch = BatchPredictionSystem(20, np.array(positions), kernel)
+        for frame in range(40):
+            if frame % 7 == 0:
+                velocities = [(rnd.uniform(-0.1, 0.1), rnd.uniform(-0.1, 0.1), 0.0) for _ in range(count)]
+                for system, velocity in zip(systems, velocities):
+                    system.feed_event(Event(tick_id=system.get_tick_id(), entity_id=0, velocity=velocity))
+                batch.feed_velocities(np.array(velocities))
+
+            dt = rnd.choice((0.016, 0.033, 0.050, 0.1))
+            for system in systems:
+                system.update(dt)
+            batch.update(dt)
+
+            for i, system in enumerate(systems):
+                self.assertEqual(batch.get_tick_ids()[i], system.get_tick_id())
+                self.assertEqual(batch.get_tick_times()[i], system.get_tick_time())
+                self.assertEqual(batch.get_real_times()[i], system.get_real_time())
+                self.assertEqual(batch.get_interpolation_factors()[i], system.get_interpolation_factor())
+                self.assertEqual(
+                    tuple(batch.get_interpolated_positions()[i].tolist()),
+                    system.get_interpolated_snapshot().get_snapshot(0).get_position())
+
+    def test_split_merge(self):
+        """Split and merge batches."""
+        batch = BatchPredictionSystem(20, np.arange(30, dtype=float).reshape(10, 3))
+        batch.feed_velocities(np.full((10, 3), 0.05))
+        batch.update(0.050)
+        merged = BatchPredictionSystem.merge(batch.split(3))
+        self.assertEqual(len(merged), 10)
+        np.testing.assert_array_equal(merged.get_positions(), batch.get_positions())
+        np.testing.assert_array_equal(merged.get_tick_ids(), batch.get_tick_ids())
+
+    def test_parallel(self):
+        """Advance in process pool."""
+        batch = BatchPredictionSystem(20, np.zeros((100, 3)))
+        batch.feed_velocities(np.full((100, 3), 0.05))
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = run_parallel(batch, 0.050, 10, executor, parts=2)
+        np.testing.assert_array_equal(result.get_tick_ids(), np.full(100, 10))
+        np.testing.assert_array_equal(result.get_positions(), np.full((100, 3), 10.0))
+        # input batch is not advanced
+        np.testing.assert_array_equal(batch.get_tick_ids(), np.zeros(100))
+        np.testing.assert_array_equal(batch.get_positions(), np.zeros((100, 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+import random
+import struct
+import unittest
+
+from kitsunet.cache import PacketCache
+from kitsunet.codec import Codec
+from kitsunet.delta import DeltaDecoder
+from kitsunet.playback import PlaybackSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+from fake_transport import make_pair
+
+
+def make_world(tick_id: int, count: int = 10) -> WorldSnapshot:
+    return WorldSnapshot(tick_id, [
+        Snapshot(entity_id=entity_id, position=(float(entity_id), float(tick_id * (entity_id % 2)), 0.0))
+        for entity_id in range(count)
+    ])
+
+
+class PacketCacheTestCase(unittest.TestCase):
+    def test_shared(self):
+        """Clients with the same view get the same bytes."""
+        cache = PacketCache()
+        wsnapshot = make_world(1)
+        near = frozenset((1, 2, 3))
+        payloads = [cache.encode(client_id, wsnapshot, frozenset((3, 2, 1))) for client_id in range(10)]
+        self.assertTrue(all(payload is payloads[0] for payload in payloads))
+        self.assertIsNot(cache.encode(10, wsnapshot, frozenset((4,))), payloads[0])
+        self.assertIsNot(cache.encode(11, wsnapshot), payloads[0])
+        self.assertEqual((cache.get_miss_count(), cache.get_hit_count()), (3, 9))
+        self.assertEqual(cache.get_payload_count(1), 3)
+
+        delta = Codec().read_item(memoryview(cache.encode(0, make_world(2), near)), 0)[0]
+        self.assertTrue(delta.is_full())  # nothing acknowledged yet
+
+    def test_baseline(self):
+        """Acknowledged ticks become baselines shared by clients."""
+        cache = PacketCache()
+        interest = frozenset(range(10))
+        for client_id in range(4):
+            cache.encode(client_id, make_world(1), interest)
+            cache.acknowledge(client_id, 1)
+        full = cache.encode(4, make_world(2), interest)
+        delta = cache.encode(0, make_world(2), interest)
+        self.assertLess(len(delta), len(full))
+        self.assertTrue(all(cache.encode(client_id, make_world(2), interest) is delta for client_id in (1, 2, 3)))
+
+        decoded = Codec().read_item(memoryview(delta), 0)[0]
+        self.assertEqual(decoded.get_baseline_tick_id(), 1)
+        self.assertEqual(len(decoded.get_changed()), 5)  # odd entities moved
+
+    def test_baseline_interest(self):
+        """Clients which saw different entities at the baseline do not share."""
+        cache = PacketCache()
+        cache.encode(0, make_world(1), frozenset((1, 2)))
+        cache.encode(1, make_world(1), frozenset((1,)))
+        cache.acknowledge(0, 1)
+        cache.acknowledge(1, 1)
+        interest = frozenset((1, 2))
+        payload_a = cache.encode(0, make_world(2), interest)
+        payload_b = cache.encode(1, make_world(2), interest)
+        self.assertIsNot(payload_a, payload_b)
+        self.assertEqual([s.get_entity_id() for s in Codec().read_item(memoryview(payload_b), 0)[0].get_spawned()], [2])
+
+    def test_evict(self):
+        """Ticks out of history are evicted and stop being baselines."""
+        cache = PacketCache(history_size=4)
+        cache.encode(0, make_world(1))
+        cache.acknowledge(0, 1)
+        for tick_id in range(2, 7):
+            cache.encode(1, make_world(tick_id))
+        self.assertEqual(cache.get_payload_count(1), 0)
+        delta = Codec().read_item(memoryview(cache.encode(0, make_world(7))), 0)[0]
+        self.assertTrue(delta.is_full())
+
+    def test_long_chain(self):
+        """Chained deltas at single precision do not drift from the server."""
+        rnd = random.Random(1)
+        to_float = struct.Struct('<3f')  # positions the codec writes exactly
+        positions = {entity_id: (rnd.uniform(-100, 100), rnd.uniform(-100, 100), 0.0) for entity_id in range(10)}
+        cache = PacketCache()
+        codec = Codec()
+        decoder = DeltaDecoder()
+        for tick_id in range(1, 5001):
+            for entity_id, (x, y, z) in positions.items():
+                positions[entity_id] = to_float.unpack(to_float.pack(
+                    x + rnd.uniform(-0.1, 0.1), y + rnd.uniform(-0.1, 0.1), z))
+            wsnapshot = WorldSnapshot(tick_id, [
+                Snapshot(entity_id=entity_id, position=position) for entity_id, position in positions.items()])
+            decoded = decoder.decode(codec.read_item(memoryview(cache.encode(0, wsnapshot)), 0)[0])
+            cache.acknowledge(0, tick_id)
+        self.assertEqual({
+            entity_id: decoded.get_snapshot(entity_id).get_position() for entity_id in positions}, positions)
+
+    def test_streamer(self):
+        """Shared payloads are decoded into world snapshots by clients."""
+        cache = PacketCache(Codec(double_precision=True))
+        codec = Codec(double_precision=True)
+        systems = [PlaybackSystem(20), PlaybackSystem(20)]
+        pairs = []
+        for client_id, system in enumerate(systems):
+            pairs.append(make_pair(
+                server={'codec': codec, 'on_ack': lambda tick_id, c=client_id: cache.acknowledge(c, tick_id)},
+                client={'codec': codec, 'playback': system}))
+
+        for tick_id in range(1, 5):
+            for client_id, (server, client) in enumerate(pairs):
+                server.send_encoded(cache.encode(client_id, make_world(tick_id)), tick_id)
+                server.flush()
+                client.flush()  # acks
+
+        self.assertEqual(cache.get_miss_count(), 4)
+        for system in systems:
+            system.update(0.2)
+            self.assertEqual(system.get_tick_id(), 4)
+            self.assertEqual(system.get_interpolated_snapshot().get_snapshot(3).get_position(), (3.0, 4.0, 0.0))
+
+    def test_streamer_lost_baseline(self):
+        """Deltas the client can not decode are not acknowledged, so it recovers."""
+        codec = Codec(double_precision=True)
+        cache = PacketCache(codec, history_size=4)
+        acked = []
+
+        def on_ack(tick_id: int):
+            acked.append(tick_id)
+            cache.acknowledge(0, tick_id)
+
+        system = PlaybackSystem(20, target_depth=16)
+        server, client = make_pair(
+            server={'codec': codec, 'on_ack': on_ack}, client={'codec': codec, 'playback': system})
+        for tick_id in range(1, 11):
+            server.send_encoded(cache.encode(0, make_world(tick_id)), tick_id)
+            server.flush()
+            client.flush()  # acks
+            if tick_id == 1:
+                client._delta_decoder.__init__()  # baseline is gone, ex.: evicted
+
+        self.assertEqual(acked[:2], [1, 5])  # deltas of ticks 2 to 4 are discarded
+        self.assertEqual(client.get_discarded_count(), 3)
+        self.assertEqual(acked[-1], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
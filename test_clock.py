@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import random
+import unittest
+
+from kitsunet.adaptive import AdaptivePlaybackSystem
+from kitsunet.clock import ClockSync
+from kitsunet.playback import PlaybackSystem
+from kitsunet.server import ServerSystem
+
+
+def synchronize(
+        sync: ClockSync, offset: float, latency: float, jitter: float = 0,
+        spikes: float = 0, count: int = 100, seed: int = 1) -> list[bool]:
+    """
+    Exchange timestamps every 0.1s over a simulated link, each way delayed
+    by *latency* plus up to *jitter* seconds, *spikes* part of trips by 0.5s more.
+    """
+    rnd = random.Random(seed)
+
+    def delay() -> float:
+        spike: float = 0.5 if rnd.random() < spikes else 0
+        return latency + rnd.random() * jitter + spike
+
+    accepted: list[bool] = []
+    for i in range(count):
+        client_send: float = i * 0.1
+        server_receive: float = client_send + delay() + offset
+        server_send: float = server_receive + 0.001
+        client_receive: float = server_send - offset + delay()
+        accepted.append(sync.add_sample(client_send, server_receive, server_send, client_receive))
+    return accepted
+
+
+class ClockSyncTestCase(unittest.TestCase):
+    def test_steady(self):
+        """Symmetric steady link gives exact offset and round trip time."""
+        sync = ClockSync(tick_rate=20)
+        self.assertFalse(sync.is_synchronized())
+        self.assertTrue(all(synchronize(sync, offset=100, latency=0.04)))
+        self.assertTrue(sync.is_synchronized())
+        self.assertAlmostEqual(sync.get_offset(), 100)
+        self.assertAlmostEqual(sync.get_rtt(), 0.08)
+        self.assertAlmostEqual(sync.get_jitter(), 0)
+        self.assertEqual(sync.get_target_depth(), 1)
+        self.assertAlmostEqual(sync.get_server_time(5), 105)
+        self.assertAlmostEqual(sync.get_server_tick(5), 2100)
+
+    def test_jitter(self):
+        """Jittery link keeps offset error below the jitter."""
+        sync = ClockSync(tick_rate=20)
+        synchronize(sync, offset=-3, latency=0.03, jitter=0.06)
+        self.assertAlmostEqual(sync.get_offset(), -3, delta=0.015)
+        self.assertAlmostEqual(sync.get_rtt(), 0.12, delta=0.02)
+        self.assertGreater(sync.get_jitter(), 0.005)
+        self.assertGreater(sync.get_target_depth(), 1)
+
+    def test_outliers(self):
+        """Delay spikes are rejected."""
+        sync = ClockSync(tick_rate=20)
+        accepted = synchronize(sync, offset=10, latency=0.03, jitter=0.01, spikes=0.1, count=200)
+        self.assertGreater(sync.get_rejected_count(), 10)
+        self.assertEqual(accepted.count(False), sync.get_rejected_count())
+        self.assertLess(sync.get_rtt(), 0.1)
+        self.assertAlmostEqual(sync.get_offset(), 10, delta=0.005)
+
+    def test_route_change(self):
+        """Persistently longer round trips are accepted after a while."""
+        sync = ClockSync(tick_rate=20, window=8)
+        synchronize(sync, offset=0, latency=0.02)
+        accepted = synchronize(sync, offset=0, latency=0.2, count=20)
+        self.assertEqual(accepted[:4], [False] * 4)
+        self.assertTrue(accepted[4])
+        self.assertAlmostEqual(sync.get_rtt(), 0.4)
+
+    def test_negative(self):
+        """Impossible round trips are rejected."""
+        sync = ClockSync(tick_rate=20)
+        self.assertFalse(sync.add_sample(1.0, 5.0, 5.5, 1.1))
+        self.assertFalse(sync.is_synchronized())
+
+    def test_delay_and_lead(self):
+        """Playback runs behind the server tick and input is stamped ahead of it."""
+        sync = ClockSync(tick_rate=20)
+        synchronize(sync, offset=0, latency=0.04)
+        self.assertAlmostEqual(sync.get_playback_delay(), 0.04 + 2 * 0.05)
+        self.assertAlmostEqual(sync.get_playback_tick(10), 197.2)
+        self.assertAlmostEqual(sync.get_prediction_lead(), 0.04)
+        self.assertEqual(sync.get_input_tick_id(10), 201)
+
+    def test_server(self):
+        """Server tick clock includes the time since the last tick."""
+        server = ServerSystem(tick_rate=20)
+        server.update(0.125)
+        self.assertEqual(server.get_tick_id(), 2)
+        self.assertAlmostEqual(server.get_tick_time(), 0.125)
+
+        sync = ClockSync(tick_rate=20, clock=lambda: 1.0)
+        server_time = server.get_tick_time()
+        sync.add_sample(0.96, server_time, server_time)
+        self.assertAlmostEqual(sync.get_server_tick(1.0), 2.5 + 0.4)  # half of the round trip later
+
+    def test_apply(self):
+        """Target depth is set on the playback systems."""
+        sync = ClockSync(tick_rate=20, min_depth=3)
+        synchronize(sync, offset=0, latency=0.04)
+
+        playback = PlaybackSystem(tick_rate=20)
+        sync.apply(playback)
+        self.assertEqual(playback.get_snapshot_queue().get_target_depth(), 3)
+
+        adaptive = AdaptivePlaybackSystem(tick_rate=20)
+        sync.apply(adaptive)
+        self.assertEqual(adaptive.get_target_depth(), 3)
+
+    def test_window(self):
+        """Window must not be empty."""
+        with self.assertRaises(ValueError):
+            ClockSync(tick_rate=20, window=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.codec import Codec, Quantizer, read_varint, write_varint
+from kitsunet.delta import DeltaSnapshot
+from kitsunet.event import Event
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+class CodecTestCase(unittest.TestCase):
+    def test_varint(self):
+        """Varint round trip."""
+        for value in (0, 1, 127, 128, 300, 2 ** 32, 2 ** 63):
+            buffer = bytearray()
+            write_varint(buffer, value)
+            self.assertEqual(read_varint(buffer, 0), (value, len(buffer)))
+        buffer = bytearray()
+        write_varint(buffer, 127)
+        self.assertEqual(len(buffer), 1)
+
+    def test_snapshot(self):
+        """Snapshot round trip."""
+        codec = Codec(double_precision=True)
+        snapshot = codec.decode(codec.encode(Snapshot(entity_id=300, position=(0.1, -2.5, 1e6))))
+        self.assertEqual(snapshot.get_entity_id(), 300)
+        self.assertEqual(snapshot.get_position(), (0.1, -2.5, 1e6))
+
+    def test_world_snapshot(self):
+        """World snapshot round trip."""
+        codec = Codec()
+        wsnapshot = codec.decode(memoryview(codec.encode(WorldSnapshot(1000, [
+            Snapshot(entity_id=entity_id, position=(entity_id / 2, 0.0, -1.0))
+            for entity_id in (9000, 3, 17)
+        ]))))
+        self.assertEqual(wsnapshot.get_tick_id(), 1000)
+        self.assertEqual(wsnapshot.get_entity_ids(), frozenset((3, 17, 9000)))
+        self.assertEqual(wsnapshot.get_snapshot(17).get_position(), (8.5, 0.0, -1.0))
+
+    def test_event(self):
+        """Event round trip."""
+        codec = Codec()
+        event = codec.decode(codec.encode(Event(tick_id=5, entity_id=2, velocity=(1.5, 0.0, -0.25))))
+        self.assertEqual(event.get_tick_id(), 5)
+        self.assertEqual(event.get_entity_id(), 2)
+        self.assertEqual(event.get_velocity(), (1.5, 0.0, -0.25))
+
+    def test_quantization(self):
+        """Quantized positions and velocities."""
+        position_quantizer = Quantizer(-1000.0, 1000.0, bits=20)
+        velocity_quantizer = Quantizer(-10.0, 10.0, bits=10)
+        codec = Codec(position_quantizer, velocity_quantizer)
+        self.assertEqual(len(codec.encode(Snapshot(entity_id=1, position=(1.0, 2.0, 3.0)))), 2 + 1 + 1 + 8)
+        self.assertEqual(len(codec.encode(Event(tick_id=1, entity_id=1))), 2 + 1 + 2 + 4)
+
+        snapshot = codec.decode(codec.encode(Snapshot(entity_id=1, position=(123.456, -999.0, 5000.0))))
+        for value, expected in zip(snapshot.get_position(), (123.456, -999.0, 1000.0)):
+            self.assertAlmostEqual(value, expected, delta=position_quantizer.get_precision())
+
+        event = codec.decode(codec.encode(Event(tick_id=1, entity_id=1, velocity=(0.3, -9.9, 0.0))))
+        for value, expected in zip(event.get_velocity(), (0.3, -9.9, 0.0)):
+            self.assertAlmostEqual(value, expected, delta=velocity_quantizer.get_precision())
+
+    def test_batch(self):
+        """Batch round trip."""
+        codec = Codec()
+        items = [
+            WorldSnapshot(1, [Snapshot(entity_id=1, position=(1.0, 0.0, 0.0))]),
+            Event(tick_id=1, entity_id=1, velocity=(0.5, 0.0, 0.0)),
+            Snapshot(entity_id=2, position=(2.0, 0.0, 0.0)),
+        ]
+        decoded = codec.decode_batch(codec.encode_batch(items))
+        self.assertEqual([type(item) for item in decoded], [WorldSnapshot, Event, Snapshot])
+        self.assertEqual(decoded[0].get_snapshot(1).get_position(), (1.0, 0.0, 0.0))
+        self.assertEqual(decoded[1].get_velocity(), (0.5, 0.0, 0.0))
+        self.assertEqual(decoded[2].get_entity_id(), 2)
+
+    def test_delta_snapshot(self):
+        """Delta snapshot round trip."""
+        codec = Codec(double_precision=True)
+        delta = codec.decode(codec.encode(DeltaSnapshot(
+            tick_id=10, baseline_tick_id=0,
+            spawned=[Snapshot(entity_id=300, position=(1.0, 2.0, 3.0))],
+            changed=[(7, (0.1, 0.0, -0.2)), (2, (1.0, 0.0, 0.0))],
+            removed=[9, 4],
+        )))
+        self.assertEqual((delta.get_tick_id(), delta.get_baseline_tick_id()), (10, 0))
+        self.assertEqual(delta.get_spawned()[0].get_position(), (1.0, 2.0, 3.0))
+        self.assertEqual(delta.get_changed(), [(2, (1.0, 0.0, 0.0)), (7, (0.1, 0.0, -0.2))])
+        self.assertEqual(delta.get_removed(), [4, 9])
+        self.assertTrue(codec.decode(codec.encode(DeltaSnapshot(tick_id=1))).is_full())
+
+    def test_mismatch(self):
+        """Codec configuration mismatch."""
+        data = Codec().encode(Snapshot())
+        with self.assertRaises(ValueError):
+            Codec(double_precision=True).decode(data)
+        with self.assertRaises(ValueError):
+            Codec().decode(b'\x63' + data[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.event import Event
+from kitsunet.playback import PlaybackSystem
+from kitsunet.prediction import PredictionSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+def make_snapshots(offset: float) -> list[Snapshot]:
+    return [
+        Snapshot(entity_id=entity_id, position=(entity_id + offset, -entity_id, offset))
+        for entity_id in (5, 1, 3, 2)
+    ]
+
+
+class ColumnarWorldSnapshotTestCase(unittest.TestCase):
+    def test_convert(self):
+        """Convert to and from object API."""
+        wsnapshot = WorldSnapshot(7, make_snapshots(0.5))
+        csnapshot = ColumnarWorldSnapshot.from_world_snapshot(wsnapshot)
+        self.assertEqual(csnapshot.get_tick_id(), 7)
+        self.assertEqual(csnapshot.get_entity_ids(), wsnapshot.get_entity_ids())
+        self.assertEqual(csnapshot.get_entity_id_array().tolist(), [1, 2, 3, 5])
+        restored = csnapshot.to_world_snapshot()
+        for entity_id in wsnapshot.get_entity_ids():
+            self.assertEqual(
+                restored.get_snapshot(entity_id).get_position(),
+                wsnapshot.get_snapshot(entity_id).get_position())
+        self.assertIsNone(csnapshot.get_snapshot(4))
+
+    def test_add_snapshot(self):
+        """Add and replace snapshots."""
+        csnapshot = ColumnarWorldSnapshot(1, make_snapshots(0))
+        csnapshot.add_snapshot(4, Snapshot(entity_id=4, position=(4.0, 4.0, 4.0)))
+        csnapshot.add_snapshot(1, Snapshot(entity_id=1, position=(9.0, 9.0, 9.0)))
+        self.assertEqual(csnapshot.get_entity_id_array().tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(csnapshot.get_snapshot(4).get_position(), (4.0, 4.0, 4.0))
+        self.assertEqual(csnapshot.get_snapshot(1).get_position(), (9.0, 9.0, 9.0))
+
+    def test_interpolate(self):
+        """Interpolate matches object API."""
+        snapshots_b = make_snapshots(1.0)[1:]  # entity 5 is missing
+        expected = WorldSnapshot(1, make_snapshots(0.0)).interpolate(
+            WorldSnapshot(2, snapshots_b), 0.25)
+        result = ColumnarWorldSnapshot(1, make_snapshots(0.0)).interpolate(
+            ColumnarWorldSnapshot(2, snapshots_b), 0.25)
+        mixed = ColumnarWorldSnapshot(1, make_snapshots(0.0)).interpolate(
+            WorldSnapshot(2, snapshots_b), 0.25)
+        self.assertEqual(result.get_tick_id(), 1)
+        self.assertEqual(result.get_entity_ids(), expected.get_entity_ids())
+        for entity_id in expected.get_entity_ids():
+            position = expected.get_snapshot(entity_id).get_position()
+            self.assertEqual(result.get_snapshot(entity_id).get_position(), position)
+            self.assertEqual(mixed.get_snapshot(entity_id).get_position(), position)
+
+    def test_interpolate_out(self):
+        """Pooled arrays are overwritten."""
+        csnapshot_a = ColumnarWorldSnapshot(1, make_snapshots(0.0))
+        csnapshot_b = ColumnarWorldSnapshot(2, make_snapshots(1.0))
+        pool = csnapshot_a.interpolate(csnapshot_b, 0.5)
+        positions = pool.get_positions()
+        self.assertIs(csnapshot_a.interpolate(csnapshot_b, 0.25, out=pool), pool)
+        self.assertIs(pool.get_positions(), positions)
+        expected = csnapshot_a.interpolate(csnapshot_b, 0.25)
+        self.assertEqual(positions.tolist(), expected.get_positions().tolist())
+
+    def test_copy_on_write(self):
+        """Copies share arrays until changed."""
+        csnapshot = ColumnarWorldSnapshot(1, make_snapshots(0.0))
+        copy = csnapshot.copy(tick_id=2)
+        self.assertIs(copy.get_positions(), csnapshot.get_positions())
+        copy.add_snapshot(1, Snapshot(entity_id=1, position=(9.0, 9.0, 9.0)))
+        self.assertEqual(copy.get_snapshot(1).get_position(), (9.0, 9.0, 9.0))
+        self.assertEqual(csnapshot.get_snapshot(1).get_position(), (1.0, -1.0, 0.0))
+
+    def test_extrapolate(self):
+        """Extrapolate matches object API."""
+        events = [
+            Event(tick_id=1, entity_id=3, velocity=(0.1, 0.2, 0.3)),
+            Event(tick_id=1, entity_id=1, velocity=(1.0, 0.0, 0.0)),
+            Event(tick_id=1, entity_id=4, velocity=(1.0, 1.0, 1.0)),  # missing
+            Event(tick_id=1, entity_id=1, velocity=(2.0, 0.0, 0.0)),  # last wins
+        ]
+        expected = WorldSnapshot(1, make_snapshots(0.0)).extrapolate(events, 0.05, tick_id=2)
+        result = ColumnarWorldSnapshot(1, make_snapshots(0.0)).extrapolate(events, 0.05, tick_id=2)
+        self.assertEqual(result.get_tick_id(), 2)
+        self.assertEqual(result.get_entity_ids(), expected.get_entity_ids())
+        for entity_id in expected.get_entity_ids():
+            self.assertEqual(
+                result.get_snapshot(entity_id).get_position(),
+                expected.get_snapshot(entity_id).get_position())
+
+    def test_playback(self):
+        """Drop-in for playback system."""
+        system = PlaybackSystem(20)  # tick 50ms
+        for tick_id in (1, 2, 3):
+            system.feed_snapshot(ColumnarWorldSnapshot(
+                tick_id, [Snapshot(entity_id=0, position=(float(tick_id), 0, 0))]))
+        system.update(0.075)  # +75ms
+        self.assertEqual(system.get_interpolation_factor(), 0.5)
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (1.5, 0, 0))
+
+    def test_prediction(self):
+        """Drop-in for prediction system."""
+        initial = ColumnarWorldSnapshot(0, [
+            Snapshot(entity_id=0, position=(0.0, 0.0, 0.0)),
+            Snapshot(entity_id=1, position=(1.0, 0.0, 0.0)),
+        ])
+        system = PredictionSystem(20, initial_snapshot=initial)
+        system.feed_event(Event(tick_id=0, entity_id=0, velocity=(0.05, 0.0, 0.0)))
+        system.update(0.100)  # +100ms, extrapolated
+        self.assertEqual(system.get_tick_id(), 2)
+        wsnapshot = system.get_interpolated_snapshot()
+        self.assertIsInstance(wsnapshot, ColumnarWorldSnapshot)
+        self.assertEqual(wsnapshot.get_snapshot(0).get_position(), (2.0, 0.0, 0.0))
+        self.assertEqual(wsnapshot.get_snapshot(1).get_position(), (1.0, 0.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
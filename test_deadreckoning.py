@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.deadreckoning import DeadReckoningFilter, DeadReckoningReceiver
+from kitsunet.event import Event
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+class MovingEvent(Event):
+    """Event moving entities 0.05 units per 20Hz tick along x."""
+    def __init__(self, tick_id: int, entity_id: int, velocity: tuple[float] | None = None):
+        # velocity is divided by dt as in Snapshot.extrapolate
+        super().__init__(tick_id, entity_id, velocity or (0.0025, 0.0, 0.0))
+
+
+def make_world(tick_id: int, positions: dict[int, tuple[float]]) -> WorldSnapshot:
+    return WorldSnapshot(tick_id, [
+        Snapshot(entity_id=entity_id, position=position)
+        for entity_id, position in positions.items()
+    ])
+
+
+class DeadReckoningFilterTestCase(unittest.TestCase):
+    def test_idle(self):
+        """Idle entities are sent once and on refresh only."""
+        drf = DeadReckoningFilter(tick_rate=20, refresh_interval=10)
+        sent = [
+            drf.filter(1, make_world(tick_id, {0: (0.0, 0.0, 0.0), 1: (5.0, 0.0, 0.0)}))
+            for tick_id in range(1, 21)
+        ]
+        self.assertEqual(sent[0].get_entity_ids(), {0, 1})
+        self.assertEqual(drf.get_sent_count(), 2 + 4)  # refreshed at ticks 9, 10, 19, 20
+        self.assertEqual(sent[8].get_entity_ids(), {1})
+        self.assertEqual(sent[9].get_entity_ids(), {0})
+        self.assertAlmostEqual(drf.get_suppression_rate(), 34 / 40)
+        self.assertEqual(drf.get_max_error(), 0)
+
+    def test_threshold(self):
+        """Entities are sent when the prediction is off by more than the threshold."""
+        drf = DeadReckoningFilter(tick_rate=20, threshold=0.1, refresh_interval=1000)
+        sent = [
+            drf.filter(1, make_world(tick_id, {1: (tick_id * 0.04, 0.0, 0.0)}))
+            for tick_id in range(1, 11)
+        ]
+        self.assertEqual([len(wsnapshot.get_entity_ids()) for wsnapshot in sent], [1, 0, 0, 1, 0, 0, 1, 0, 0, 1])
+        self.assertAlmostEqual(drf.get_max_error(), 0.08)
+        self.assertLessEqual(drf.get_mean_error(), 0.1)
+
+    def test_model(self):
+        """Server runs the client side model."""
+        drf = DeadReckoningFilter(tick_rate=20, threshold=0.001, event_class=MovingEvent)
+        for tick_id in range(1, 6):
+            sent = drf.filter(1, make_world(tick_id, {1: (tick_id * 0.05, 0.0, 0.0)}))
+        self.assertEqual(drf.get_sent_count(), 1)
+        self.assertFalse(sent.get_entity_ids())
+
+    def test_clients(self):
+        """Every client has its own model, despawned entities are forgotten."""
+        drf = DeadReckoningFilter(tick_rate=20)
+        drf.filter(1, make_world(1, {1: (0.0, 0.0, 0.0)}))
+        self.assertEqual(drf.filter(2, make_world(2, {1: (0.0, 0.0, 0.0)})).get_entity_ids(), {1})
+        drf.filter(1, make_world(3, {}))
+        self.assertEqual(drf.filter(1, make_world(4, {1: (0.0, 0.0, 0.0)})).get_entity_ids(), {1})
+        drf.remove_client(1)
+        self.assertEqual(drf.filter(1, make_world(5, {1: (0.0, 0.0, 0.0)})).get_entity_ids(), {1})
+
+    def test_refresh_interval(self):
+        """Refresh interval must be positive."""
+        with self.assertRaises(ValueError):
+            DeadReckoningFilter(tick_rate=20, refresh_interval=0)
+
+
+class DeadReckoningReceiverTestCase(unittest.TestCase):
+    def test_merge(self):
+        """Receiver rebuilds what the server suppressed within the threshold."""
+        drf = DeadReckoningFilter(tick_rate=20, threshold=0.1, refresh_interval=7)
+        receiver = DeadReckoningReceiver(tick_rate=20)
+        for tick_id in range(1, 50):
+            positions = {0: (0.0, 0.0, 0.0), 1: (tick_id * 0.03, 0.0, 0.0), 2: (0.0, tick_id * 0.5, 0.0)}
+            merged = receiver.merge(drf.filter(1, make_world(tick_id, positions)))
+            self.assertEqual(merged.get_tick_id(), tick_id)
+            self.assertEqual(merged.get_entity_ids(), {0, 1, 2})
+            for entity_id, position in positions.items():
+                self.assertLessEqual(abs(merged.get_snapshot(entity_id).get_position()[0] - position[0]), 0.1)
+        self.assertGreater(drf.get_suppression_rate(), 0.5)
+
+    def test_model(self):
+        """Receiver extrapolates with the same model over lost ticks."""
+        drf = DeadReckoningFilter(tick_rate=20, threshold=0.001, event_class=MovingEvent)
+        receiver = DeadReckoningReceiver(tick_rate=20, event_class=MovingEvent)
+        receiver.merge(drf.filter(1, make_world(1, {1: (0.05, 0.0, 0.0)})))
+        drf.filter(1, make_world(2, {1: (0.1, 0.0, 0.0)}))  # lost
+        merged = receiver.merge(drf.filter(1, make_world(3, {1: (0.15, 0.0, 0.0)})))
+        self.assertEqual(drf.get_sent_count(), 1)
+        self.assertAlmostEqual(merged.get_snapshot(1).get_position()[0], 0.15)
+
+    def test_timeout(self):
+        """Entities not sent for longer than the timeout are gone."""
+        receiver = DeadReckoningReceiver(tick_rate=20, timeout=5)
+        receiver.merge(make_world(1, {1: (0.0, 0.0, 0.0), 2: (0.0, 0.0, 0.0)}))
+        for tick_id in range(2, 8):
+            merged = receiver.merge(make_world(tick_id, {2: (0.0, 0.0, 0.0)}))
+            self.assertEqual(len(merged.get_entity_ids()), 2 if tick_id <= 6 else 1)
+
+    def test_merged_changed(self):
+        """Changing a merged snapshot does not change the model of the next one."""
+        receiver = DeadReckoningReceiver(tick_rate=20)
+        merged = receiver.merge(make_world(1, {1: (1.0, 0.0, 0.0)}))
+        merged.add_snapshot(1, Snapshot(entity_id=1, position=(99.0, 0.0, 0.0)))  # ex.: local prediction
+        merged = receiver.merge(make_world(2, {}))
+        self.assertEqual(merged.get_snapshot(1).get_position(), (1.0, 0.0, 0.0))
+
+    def test_late(self):
+        """Older filtered snapshots are rejected."""
+        receiver = DeadReckoningReceiver(tick_rate=20)
+        receiver.merge(make_world(2, {}))
+        self.assertIsNone(receiver.merge(make_world(1, {})))
+        self.assertEqual(receiver.get_late_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.delta import DeltaDecoder, DeltaEncoder
+from kitsunet.playback import PlaybackSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+def make_world(tick_id: int, positions: dict[int, tuple[float]]) -> WorldSnapshot:
+    return WorldSnapshot(tick_id, [
+        Snapshot(entity_id=entity_id, position=position)
+        for entity_id, position in positions.items()
+    ])
+
+
+def get_positions(wsnapshot: WorldSnapshot) -> dict[int, tuple[float]]:
+    return {
+        entity_id: wsnapshot.get_snapshot(entity_id).get_position()
+        for entity_id in wsnapshot.get_entity_ids()
+    }
+
+
+class DeltaTestCase(unittest.TestCase):
+    def test_full(self):
+        """Full snapshot without acknowledged baseline."""
+        encoder = DeltaEncoder()
+        delta = encoder.encode(1, make_world(1, {1: (1.0, 0, 0), 2: (2.0, 0, 0)}))
+        self.assertTrue(delta.is_full())
+        self.assertEqual(len(delta.get_spawned()), 2)
+
+    def test_delta(self):
+        """Only changes are sent against acknowledged baseline."""
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        world_1 = make_world(1, {1: (1.0, 0, 0), 2: (2.0, 0, 0), 3: (3.0, 0, 0)})
+        world_2 = make_world(2, {1: (1.0, 0, 0), 2: (2.5, 0.1, 0), 4: (4.0, 0, 0)})
+
+        decoder.decode(encoder.encode(7, world_1))
+        encoder.acknowledge(7, 1)
+        delta = encoder.encode(7, world_2)
+        self.assertEqual(delta.get_baseline_tick_id(), 1)
+        self.assertEqual([s.get_entity_id() for s in delta.get_spawned()], [4])
+        self.assertEqual(delta.get_changed(), [(2, (0.5, 0.1, 0))])
+        self.assertEqual(delta.get_removed(), [3])
+
+        decoded = decoder.decode(delta)
+        self.assertEqual(decoded.get_tick_id(), 2)
+        self.assertEqual(get_positions(decoded), get_positions(world_2))
+
+    def test_inexact_difference(self):
+        """Positions are exact even when difference rounds."""
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        decoder.decode(encoder.encode(1, make_world(1, {1: (0.1, 1e16, 0)})))
+        encoder.acknowledge(1, 1)
+        world_2 = make_world(2, {1: (0.3, 1.0, 0)})
+        self.assertEqual(get_positions(decoder.decode(encoder.encode(1, world_2))), get_positions(world_2))
+
+    def test_unknown_baseline(self):
+        """Decoding fails without baseline."""
+        encoder = DeltaEncoder()
+        encoder.encode(1, make_world(1, {1: (1.0, 0, 0)}))
+        encoder.acknowledge(1, 1)
+        self.assertIsNone(DeltaDecoder().decode(encoder.encode(1, make_world(2, {1: (2.0, 0, 0)}))))
+
+    def test_baseline_expired(self):
+        """Fall back to full snapshot when baseline left the history."""
+        encoder = DeltaEncoder(history_size=4)
+        for tick_id in range(1, 10):
+            encoder.encode(1, make_world(tick_id, {1: (float(tick_id), 0, 0)}))
+            if tick_id == 1:
+                encoder.acknowledge(1, 1)
+        self.assertTrue(encoder.encode(1, make_world(10, {1: (10.0, 0, 0)})).is_full())
+
+    def test_decoded_changed(self):
+        """Changing a decoded snapshot does not change the baseline of the next one."""
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        decoded = decoder.decode(encoder.encode(1, make_world(1, {1: (10.0, 0, 0)})))
+        encoder.acknowledge(1, 1)
+        decoded.add_snapshot(1, Snapshot(entity_id=1, position=(1.0, 0, 0)))  # ex.: local prediction
+        decoded = decoder.decode(encoder.encode(1, make_world(2, {1: (20.0, 0, 0)})))
+        self.assertEqual(get_positions(decoded), {1: (20.0, 0, 0)})
+
+    def test_playback(self):
+        """Decoded snapshots feed playback system."""
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        system = PlaybackSystem(20)  # tick 50ms
+        for tick_id in (1, 2, 3):
+            delta = encoder.encode(1, make_world(tick_id, {0: (float(tick_id), 0, 0)}))
+            system.feed_snapshot(decoder.decode(delta))
+            encoder.acknowledge(1, tick_id)
+        system.update(0.075)  # +75ms
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (1.5, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
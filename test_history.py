@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.history import TickHistory
+
+
+class TickHistoryTestCase(unittest.TestCase):
+    def test_ring(self):
+        """Old ticks are overwritten."""
+        history = TickHistory(4)
+        for tick_id in range(1, 11):
+            history.put(tick_id, str(tick_id))
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history.get_first_tick_id(), 7)
+        self.assertEqual(history.get_last_tick_id(), 10)
+        self.assertEqual(history.get_latest(), '10')
+        self.assertIsNone(history.get(6))
+        self.assertEqual(history.get(7), '7')
+        history.put(3, 'old')  # older than the ring
+        self.assertEqual(history.get(7), '7')
+
+    def test_jump(self):
+        """Values skipped over by a later tick are dropped."""
+        history = TickHistory(8)
+        for tick_id in (1, 2, 3):
+            history.put(tick_id, tick_id)
+        history.put(100, 100)
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history.get_first_tick_id(), 100)
+        self.assertIsNone(history.get(3))
+
+        history.put(105, 105)  # within the ring, 100 is kept
+        history.put(110, 110)
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history.get_first_tick_id(), 103)
+        self.assertIsNone(history.get(100))
+        self.assertEqual(history.get(105), 105)
+
+    def test_discard(self):
+        """Discard acknowledged ticks."""
+        history = TickHistory(8)
+        for tick_id in (1, 2, 4, 5):
+            history.put(tick_id, tick_id)
+        history.discard(2)
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history.get_first_tick_id(), 3)
+        self.assertIsNone(history.get(2))
+        self.assertEqual(history.get(4), 4)
+        history.discard(5)
+        self.assertEqual(len(history), 0)
+        self.assertIsNone(history.get_latest())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import random
+import unittest
+
+from kitsunet.interest import InterestManager, SpatialGrid
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+def make_world(tick_id: int, positions: dict[int, tuple[float]]) -> WorldSnapshot:
+    return WorldSnapshot(tick_id, [
+        Snapshot(entity_id=entity_id, position=position)
+        for entity_id, position in positions.items()
+    ])
+
+
+class SpatialGridTestCase(unittest.TestCase):
+    def test_query(self):
+        """Query matches brute force."""
+        rnd = random.Random(1)
+        grid = SpatialGrid(10.0)
+        positions = {
+            entity_id: (rnd.uniform(-100, 100), rnd.uniform(-100, 100), rnd.uniform(-5, 5))
+            for entity_id in range(500)
+        }
+        grid.update_world(make_world(1, positions))
+        center = (3.0, -7.0, 0.0)
+        expected = {
+            entity_id for entity_id, (x, y, z) in positions.items()
+            if (x - 3) ** 2 + (y + 7) ** 2 + z ** 2 <= 25 ** 2
+        }
+        self.assertEqual(set(grid.query(center, 25.0)), expected)
+
+    def test_move_and_remove(self):
+        """Incremental updates."""
+        grid = SpatialGrid(10.0)
+        grid.update_world(make_world(1, {1: (0.0, 0.0, 0.0), 2: (50.0, 0.0, 0.0)}))
+        grid.update_world(make_world(2, {1: (45.0, 0.0, 0.0)}))
+        self.assertEqual(len(grid), 1)
+        self.assertEqual(set(grid.query((50.0, 0.0, 0.0), 10.0)), {1})
+        self.assertEqual(set(grid.query((0.0, 0.0, 0.0), 10.0)), set())
+
+
+class InterestManagerTestCase(unittest.TestCase):
+    def test_hysteresis(self):
+        """Entities enter and leave at different radii."""
+        manager = InterestManager(enter_radius=10.0, leave_radius=15.0)
+        manager.add_client(7, entity_id=1)
+        for tick_id, x in enumerate((20.0, 12.0, 9.0, 14.0, 16.0, 12.0), 1):
+            manager.update(make_world(tick_id, {1: (0.0, 0.0, 0.0), 2: (x, 0.0, 0.0)}))
+            self.assertEqual(
+                2 in manager.get_interest_set(7),
+                tick_id in (3, 4),
+                f'tick {tick_id} at {x}')
+        self.assertIn(1, manager.get_interest_set(7))
+
+    def test_filter(self):
+        """Filtered view shares entity snapshots."""
+        manager = InterestManager(enter_radius=10.0)
+        manager.add_client(1, entity_id=1)
+        manager.add_client(2, entity_id=3)
+        wsnapshot = make_world(5, {1: (0.0, 0.0, 0.0), 2: (5.0, 0.0, 0.0), 3: (100.0, 0.0, 0.0)})
+        manager.update(wsnapshot)
+        view = manager.filter(1, wsnapshot)
+        self.assertEqual(view.get_tick_id(), 5)
+        self.assertEqual(view.get_entity_ids(), frozenset((1, 2)))
+        self.assertIs(view.get_snapshot(2), wsnapshot.get_snapshot(2))
+        self.assertEqual(manager.filter(2, wsnapshot).get_entity_ids(), frozenset((3,)))
+        self.assertEqual(manager.filter(3, wsnapshot).get_entity_ids(), frozenset())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import math
+import unittest
+
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.interpolation import HermiteInterpolation, LinearInterpolation
+from kitsunet.playback import PlaybackSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+def circle(t: float) -> tuple[float]:
+    return (10 * math.cos(2 * t), 10 * math.sin(2 * t), 0.0)
+
+
+def make_world(tick_id: int, tick_rate: int, world_class: type = WorldSnapshot) -> WorldSnapshot:
+    return world_class(tick_id, [
+        Snapshot(entity_id=1, position=circle(tick_id / tick_rate)),
+        Snapshot(entity_id=2, position=(float(tick_id), 0.0, 0.0)),
+        Snapshot(entity_id=3, position=(1.0, 2.0, 3.0)),
+    ])
+
+
+def max_error(tick_rate: int, interpolation: LinearInterpolation, seconds: float = 2) -> float:
+    """Play circular motion with snapshots arriving just in time, rendering at 240Hz."""
+    system = PlaybackSystem(tick_rate, interpolation=interpolation)
+    fed, t, error = 0, 0.0, 0.0
+    while t < seconds:
+        t += 1 / 240
+        while fed / tick_rate <= t + 1 / tick_rate:
+            fed += 1
+            system.feed_snapshot(make_world(fed, tick_rate))
+        system.update(1 / 240)
+        if t > 0.5:
+            position = system.get_interpolated_snapshot().get_snapshot(1).get_position()
+            playout = (system.get_tick_id() - 1 + system.get_interpolation_factor()) / tick_rate
+            error = max(error, math.dist(position, circle(playout)))
+    return error
+
+
+class InterpolationTestCase(unittest.TestCase):
+    def test_hermite(self):
+        """Hermite interpolation passes through snapshots and keeps linear motion."""
+        wsnapshots = [make_world(tick_id, 20) for tick_id in range(4)]
+        for before, after in ((None, None), (wsnapshots[0], None), (None, wsnapshots[3]), (wsnapshots[0], wsnapshots[3])):
+            for factor in (0.0, 1.0):
+                result = wsnapshots[1].interpolate_hermite(wsnapshots[2], factor, before, after)
+                expected = wsnapshots[1] if factor == 0 else wsnapshots[2]
+                for entity_id in (1, 2, 3):
+                    for a, b in zip(
+                            result.get_snapshot(entity_id).get_position(),
+                            expected.get_snapshot(entity_id).get_position()):
+                        self.assertAlmostEqual(a, b, places=12)
+
+            result = wsnapshots[1].interpolate_hermite(wsnapshots[2], 0.25, before, after)
+            self.assertEqual(result.get_snapshot(2).get_position(), (1.25, 0.0, 0.0))
+            self.assertEqual(result.get_snapshot(3).get_position(), (1.0, 2.0, 3.0))
+
+    def test_columnar(self):
+        """Vectorized Hermite interpolation matches object API."""
+        wsnapshots = [make_world(tick_id, 20) for tick_id in range(5)]
+        csnapshots = [ColumnarWorldSnapshot.from_world_snapshot(w) for w in wsnapshots]
+        for before, after in ((None, None), (0, None), (None, 4), (0, 3)):
+            expected = wsnapshots[1].interpolate_hermite(
+                wsnapshots[2], 0.3,
+                None if before is None else wsnapshots[before],
+                None if after is None else wsnapshots[after])
+            result = csnapshots[1].interpolate_hermite(
+                csnapshots[2], 0.3,
+                None if before is None else csnapshots[before],
+                None if after is None else wsnapshots[after])
+            for entity_id in (1, 2, 3):
+                self.assertEqual(
+                    result.get_snapshot(entity_id).get_position(),
+                    expected.get_snapshot(entity_id).get_position())
+
+    def test_lower_tick_rate(self):
+        """Hermite interpolation at 20Hz is smoother than linear at 60Hz."""
+        linear_60hz = max_error(60, LinearInterpolation())
+        hermite_20hz = max_error(20, HermiteInterpolation())
+        self.assertLess(hermite_20hz, linear_60hz)
+        self.assertLess(hermite_20hz, max_error(20, LinearInterpolation()) / 10)
+
+    def test_lazy(self):
+        """Lazy view uses the interpolation strategy."""
+        system = PlaybackSystem(20, lazy_interpolation=True, interpolation=HermiteInterpolation())
+        eager = PlaybackSystem(20, interpolation=HermiteInterpolation())
+        for tick_id in range(1, 5):
+            system.feed_snapshot(make_world(tick_id, 20))
+            eager.feed_snapshot(make_world(tick_id, 20))
+            system.update(0.030)
+            eager.update(0.030)
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshots([1, 2])[1].get_position(),
+            eager.get_interpolated_snapshot().get_snapshot(1).get_position())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.jitter import JitterBuffer
+from kitsunet.playback import PlaybackSystem
+from kitsunet.snapshot import WorldSnapshot
+
+
+class JitterBufferTestCase(unittest.TestCase):
+    def test_order(self):
+        """Pop in tick order."""
+        buffer = JitterBuffer(16)
+        for tick_id in (4, 2, 10, 3, 7, 1, 6, 8, 5, 9):
+            self.assertTrue(buffer.push(WorldSnapshot(tick_id)))
+        self.assertEqual(len(buffer), 10)
+        self.assertEqual(buffer.peek().get_tick_id(), 1)
+        for tick_id in range(1, 10 + 1):
+            self.assertEqual(buffer.pop().get_tick_id(), tick_id)
+        self.assertIsNone(buffer.pop())
+
+    def test_late_and_duplicate(self):
+        """Late and duplicate snapshots."""
+        buffer = JitterBuffer(16)
+        self.assertTrue(buffer.push(WorldSnapshot(5), min_tick_id=3))
+        self.assertFalse(buffer.push(WorldSnapshot(5), min_tick_id=3))
+        self.assertFalse(buffer.push(WorldSnapshot(3), min_tick_id=3))
+        self.assertFalse(buffer.push(WorldSnapshot(2), min_tick_id=3))
+        self.assertEqual(len(buffer), 1)
+        self.assertEqual(buffer.get_duplicate_count(), 1)
+        self.assertEqual(buffer.get_late_count(), 2)
+
+    def test_overflow(self):
+        """Overflow drops the oldest snapshots."""
+        buffer = JitterBuffer(3)
+        for tick_id in (2, 3, 4, 5):
+            buffer.push(WorldSnapshot(tick_id))
+        self.assertFalse(buffer.push(WorldSnapshot(1)))
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.get_overflow_count(), 2)
+        self.assertEqual([buffer.pop().get_tick_id() for _ in range(3)], [3, 4, 5])
+
+    def test_trim(self):
+        """Trim down to the target depth."""
+        buffer = JitterBuffer(16, target_depth=3)
+        for tick_id in range(1, 8):
+            buffer.push(WorldSnapshot(tick_id))
+        self.assertEqual(buffer.trim(), 4)
+        self.assertEqual(buffer.get_drop_count(), 4)
+        self.assertEqual(buffer.peek().get_tick_id(), 5)
+
+    def test_playback_target_depth(self):
+        """Playback keeps target depth of snapshots."""
+        system = PlaybackSystem(20, target_depth=2)  # tick 50ms
+        for tick_id in range(1, 6):
+            system.feed_snapshot(WorldSnapshot(tick_id))
+        system.update(0.010)  # +10ms
+        self.assertEqual(system.get_tick_id(), 1)
+        self.assertEqual(system.get_snapshot_queue_size(), 2)
+        self.assertEqual(system.get_snapshot_queue().get_drop_count(), 2)
+        system.feed_snapshot(WorldSnapshot(1))
+        self.assertEqual(system.get_snapshot_queue().get_late_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+import unittest
+
+import numpy as np
+
+from kitsunet.batch import BatchPredictionSystem
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.event import Event
+from kitsunet.kernel import AccelerationKernel, ClampKernel, DragKernel, LinearKernel
+from kitsunet.prediction import PredictionSystem
+from kitsunet.server import ServerSystem
+from kitsunet.sharding import ShardedSimulation
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+POSITIONS = [(0.0, 1.0, 2.0), (-3.5, 0.25, 1e6), (7.0, 7.0, 7.0)]
+VELOCITIES = [(0.01, -0.02, 0.0), (0.0, 0.0, 0.0), (1.5, 2.5, -0.125)]
+
+
+def make_world(count: int) -> WorldSnapshot:
+    return WorldSnapshot(0, [
+        Snapshot(entity_id=entity_id, position=(float(entity_id), 0.0, 10.0))
+        for entity_id in range(count)
+    ])
+
+
+class KernelTestCase(unittest.TestCase):
+    def test_linear(self):
+        """Default kernel is the same rule as snapshot extrapolation, batched or not."""
+        kernel = LinearKernel()
+        moved, velocities = kernel.step(np.array(POSITIONS), np.array(VELOCITIES), 0.05)
+        tuples, _ = kernel.step_tuples(POSITIONS, VELOCITIES, 0.05)
+        for i, (position, velocity) in enumerate(zip(POSITIONS, VELOCITIES)):
+            expected = Snapshot(position=position).extrapolate(Event(0, 0, velocity), 0.05).get_position()
+            self.assertEqual(tuple(moved[i]), expected)
+            self.assertEqual(tuples[i], expected)
+        np.testing.assert_array_equal(velocities, VELOCITIES)
+
+    def test_dt_array(self):
+        """Every entity may have its own dt, zero dt does not move."""
+        moved, _ = LinearKernel().step(np.array(POSITIONS), np.array(VELOCITIES), np.array([0.05, 0.1, 0.0]))
+        np.testing.assert_allclose(moved[0], (0.2, 0.6, 2.0))
+        np.testing.assert_array_equal(moved[2], POSITIONS[2])
+        moved, _ = LinearKernel().step_tuples(POSITIONS, VELOCITIES, 0)
+        self.assertEqual(moved, POSITIONS)
+
+    def test_acceleration(self):
+        """Acceleration changes velocities before the move."""
+        kernel = AccelerationKernel((0.0, 0.0, -10.0))
+        moved, velocities = kernel.step(np.array(POSITIONS), np.array(VELOCITIES), 0.05)
+        tuples, tuple_velocities = kernel.step_tuples(POSITIONS, VELOCITIES, 0.05)
+        np.testing.assert_allclose(velocities[1], (0.0, 0.0, -0.5))
+        np.testing.assert_allclose(moved[1], (-3.5, 0.25, 1e6 - 10))
+        np.testing.assert_allclose(moved, tuples)
+        np.testing.assert_allclose(velocities, tuple_velocities)
+
+        _, velocities = kernel.step(np.array(POSITIONS), np.array(VELOCITIES), np.array([0.05, 0.1, 0.0]))
+        np.testing.assert_allclose(velocities[:, 2], (-0.5, -1.0, -0.125))
+
+    def test_drag(self):
+        """Drag slows entities down and stops them at most."""
+        kernel = DragKernel(4)
+        moved, velocities = kernel.step(np.array(POSITIONS), np.array(VELOCITIES), 0.05)
+        tuples, tuple_velocities = kernel.step_tuples(POSITIONS, VELOCITIES, 0.05)
+        np.testing.assert_allclose(velocities, np.array(VELOCITIES) * 0.8)
+        np.testing.assert_allclose(moved, tuples)
+        np.testing.assert_allclose(velocities, tuple_velocities)
+
+        _, velocities = kernel.step(np.array(POSITIONS), np.array(VELOCITIES), np.array([0.05, 0.5, 0.5]))
+        np.testing.assert_allclose(velocities[2], (0.0, 0.0, 0.0))
+        with self.assertRaises(ValueError):
+            DragKernel(-1)
+
+    def test_clamp(self):
+        """Clamp keeps positions moved by another kernel inside bounds."""
+        kernel = ClampKernel((-1.0, -1.0, -1.0), (10.0, 10.0, 10.0), AccelerationKernel((0.0, 0.0, -100.0)))
+        moved, _ = kernel.step(np.array(POSITIONS), np.array(VELOCITIES), 0.05)
+        tuples, _ = kernel.step_tuples(POSITIONS, VELOCITIES, 0.05)
+        np.testing.assert_allclose(moved, tuples)
+        self.assertEqual(tuple(moved[1]), (-1.0, 0.25, 10.0))
+        self.assertEqual(moved[0][2], -1.0)
+        with self.assertRaises(ValueError):
+            ClampKernel((1.0, 0.0, 0.0), (0.0, 0.0, 0.0))
+
+
+class KernelWorldTestCase(unittest.TestCase):
+    def test_world_snapshot(self):
+        """World snapshots of both layouts move the same with a kernel."""
+        kernel = AccelerationKernel((0.0, 0.0, -10.0))
+        wsnapshot = make_world(50)
+        columnar = ColumnarWorldSnapshot.from_world_snapshot(wsnapshot)
+        events = [Event(0, entity_id, (0.01 * entity_id, 0.0, 0.0)) for entity_id in range(0, 50, 2)]
+
+        extrapolated = wsnapshot.extrapolate(events, 0.05, 1, kernel=kernel)
+        extrapolated_columnar = columnar.extrapolate(events, 0.05, 1, kernel=kernel)
+        self.assertEqual(extrapolated.get_entity_ids(), set(range(0, 50, 2)))
+        self.assertEqual(extrapolated_columnar.get_entity_ids(), extrapolated.get_entity_ids())
+        for entity_id in (0, 10, 48):
+            np.testing.assert_allclose(
+                extrapolated_columnar.get_snapshot(entity_id).get_position(),
+                extrapolated.get_snapshot(entity_id).get_position())
+        self.assertEqual(extrapolated.get_snapshot(10).get_position(), (12.0, 0.0, 0.0))
+
+    def test_shared(self):
+        """Entities which did not move keep their snapshots."""
+        wsnapshot = make_world(3)
+        extrapolated = wsnapshot.extrapolate([Event(0, i) for i in range(3)], 0.05, 1, kernel=DragKernel(1))
+        self.assertIs(extrapolated.get_snapshot(1), wsnapshot.get_snapshot(1))
+
+    def test_server(self):
+        """Server simulates with its kernel."""
+        server = ServerSystem(20, make_world(2), kernel=ClampKernel((0.0, 0.0, 0.0), (1.0, 1.0, 11.0)))
+        server.feed_event(Event(0, 1, (0.01, 0.0, 0.0)))
+        server.update(0.5)
+        self.assertEqual(server.get_world_snapshot().get_snapshot(1).get_position(), (1.0, 0.0, 10.0))
+
+    def test_prediction(self):
+        """Prediction extrapolates the local entity with its kernel."""
+        system = PredictionSystem(
+            20, initial_snapshot=make_world(2), local_entity_id=1,
+            kernel=ClampKernel((0.0, 0.0, 0.0), (2.0, 1.0, 11.0)))
+        for _ in range(10):
+            system.feed_event(Event(system.get_tick_id(), 1, (0.01, 0.0, 0.0)))
+            system.update(0.05)
+        self.assertEqual(system.get_interpolated_snapshot().get_snapshot(1).get_position(), (2.0, 0.0, 10.0))
+
+    def test_batch(self):
+        """Batch prediction repeats the fed velocity every tick, same as prediction."""
+        batch = BatchPredictionSystem(20, np.zeros((4, 3)), kernel=DragKernel(10))
+        batch.feed_velocities(np.full((4, 3), 0.01))
+        batch.update(0.1)
+        np.testing.assert_allclose(batch.get_positions(), np.full((4, 3), 0.1 + 0.1))
+        np.testing.assert_allclose(batch._velocities, 0.01)
+        merged = BatchPredictionSystem.merge(batch.split(2))
+        self.assertIs(merged._kernel, batch._kernel)
+
+    def test_sharding(self):
+        """Shards keep velocities changed by the kernel."""
+        with ShardedSimulation(20, make_world(10), shards=2, kernel=DragKernel(10)) as simulation:
+            simulation.feed_velocities(np.full((10, 3), 0.01))
+            simulation.step()
+            simulation.step()
+            np.testing.assert_allclose(simulation.get_world_snapshot().get_positions()[3], (3.15, 0.15, 10.15))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.lagcomp import WorldHistory
+from kitsunet.server import ServerSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+def make_world(tick_id: int, world_class: type = WorldSnapshot) -> WorldSnapshot:
+    return world_class(tick_id, [
+        Snapshot(entity_id=1, position=(float(tick_id), 0.0, 0.0)),
+        Snapshot(entity_id=2, position=(0.0, float(tick_id) * 2, 0.0)),
+    ])
+
+
+class WorldHistoryTestCase(unittest.TestCase):
+    def test_ring(self):
+        """Oldest world snapshots are overwritten."""
+        history = WorldHistory(4)
+        for tick_id in range(1, 7):
+            history.record(make_world(tick_id))
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history.get_first_tick_id(), 3)
+        self.assertEqual(history.get_last_tick_id(), 6)
+        self.assertIsNone(history.get(2))
+        self.assertEqual(history.get(5).get_tick_id(), 5)
+        with self.assertRaises(ValueError):
+            history.record(make_world(6))
+
+    def test_fractional(self):
+        """Entities are interpolated at fractional ticks."""
+        history = WorldHistory(8)
+        for tick_id in range(1, 6):
+            history.record(make_world(tick_id))
+        self.assertEqual(history.get_snapshot(1, 2, 0.25).get_position(), (2.25, 0.0, 0.0))
+        self.assertEqual(history.get_snapshots((2, 3), 3, 0.5)[2].get_position(), (0.0, 7.0, 0.0))
+        self.assertEqual(history.get_world_snapshot(4).get_snapshot(1).get_position(), (4.0, 0.0, 0.0))
+        self.assertEqual(history.get_world_snapshot(4, 0.5).get_tick_id(), 4)
+
+    def test_gaps(self):
+        """Factor spans the gap between recorded ticks."""
+        history = WorldHistory(8)
+        for tick_id in (1, 2, 6, 10):
+            history.record(make_world(tick_id))
+        prev_snapshot, next_snapshot, factor = history.get_bracket(3, 0.0)
+        self.assertEqual((prev_snapshot.get_tick_id(), next_snapshot.get_tick_id()), (2, 6))
+        self.assertEqual(factor, 0.25)
+        self.assertEqual(history.get_snapshot(1, 8, 0.5).get_position(), (8.5, 0.0, 0.0))
+
+    def test_bounds(self):
+        """Ticks older than history are rejected, newer ones are clamped."""
+        history = WorldHistory(4)
+        self.assertIsNone(history.get_world_snapshot(1))
+        for tick_id in range(10, 15):
+            history.record(make_world(tick_id))
+        self.assertIsNone(history.get_snapshot(1, 10, 0.5))
+        self.assertEqual(history.get_snapshots((1,), 9), {})
+        self.assertEqual(history.get_snapshot(1, 20).get_position(), (14.0, 0.0, 0.0))
+
+    def test_columnar(self):
+        """Columnar world snapshots are interpolated in batch."""
+        history = WorldHistory(8)
+        for tick_id in range(1, 4):
+            history.record(make_world(tick_id, ColumnarWorldSnapshot))
+        snapshots = history.get_snapshots((1, 2), 1, 0.5)
+        self.assertEqual(snapshots[1].get_position(), (1.5, 0.0, 0.0))
+        self.assertEqual(snapshots[2].get_position(), (0.0, 3.0, 0.0))
+
+    def test_server(self):
+        """Server records every tick."""
+        server = ServerSystem(20, make_world(0), history_size=16)
+        server.update(0.2)
+        history = server.get_history()
+        self.assertEqual((history.get_first_tick_id(), history.get_last_tick_id()), (0, 4))
+        self.assertIs(history.get(4), server.get_world_snapshot())
+        self.assertIsNone(ServerSystem(20).get_history())
+
+
+if __name__ == '__main__':
+    unittest.main()
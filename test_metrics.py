@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet import metrics as m
+from kitsunet.metrics import Histogram, Metrics
+from kitsunet.playback import PlaybackSystem
+from kitsunet.prediction import PredictionSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+class MetricsTestCase(unittest.TestCase):
+    def test_histogram(self):
+        """Values are counted into buckets."""
+        histogram = Histogram((1, 2, 4))
+        for value in (0.5, 1, 1.5, 3, 10):
+            histogram.observe(value)
+        self.assertEqual(histogram.get_buckets(), [(1, 2), (2, 1), (4, 1), (float('inf'), 1)])
+        self.assertEqual(histogram.get_count(), 5)
+        self.assertEqual(histogram.get_min(), 0.5)
+        self.assertEqual(histogram.get_max(), 10)
+        self.assertEqual(histogram.get_percentile(50), 2)
+        self.assertEqual(histogram.get_percentile(100), 10)
+
+    def test_subscribe(self):
+        """Callbacks receive reported values."""
+        reported = []
+        metrics = Metrics()
+        metrics.subscribe(lambda name, value: reported.append((name, value)))
+        metrics.increment('a', 2)
+        metrics.observe('b', 0.5)
+        self.assertEqual(reported, [('a', 2), ('b', 0.5)])
+        self.assertEqual(metrics.get_counter('a'), 2)
+        self.assertEqual(metrics.to_dict()['histograms']['b']['count'], 1)
+
+    def test_playback(self):
+        """Playback reports stalls, drops and late snapshots."""
+        metrics = Metrics()
+        playback = PlaybackSystem(tick_rate=20, metrics=metrics)
+        for tick_id in range(1, 5):
+            playback.feed_snapshot(WorldSnapshot(tick_id=tick_id, snapshots=[Snapshot(1, (tick_id, 0, 0))]))
+
+        playback.update(0.050)  # tick 1, 2 and 3 are dropped down to depth 1
+        self.assertEqual(metrics.get_counter(m.SNAPSHOTS_DROPPED), 2)
+        self.assertEqual(metrics.get_histogram(m.QUEUE_DEPTH).get_max(), 1)
+
+        playback.feed_snapshot(WorldSnapshot(tick_id=1))
+        playback.update(0.075)
+        self.assertEqual(metrics.get_counter(m.SNAPSHOTS_LATE), 1)
+        self.assertEqual(metrics.get_counter(m.TICKS_STALLED), 1)
+        self.assertEqual(metrics.get_histogram(m.UPDATE_TIME).get_count(), 2)
+        self.assertEqual(metrics.get_histogram(m.INTERPOLATION_FACTOR).get_count(), 2)
+
+    def test_prediction(self):
+        """Prediction reports extrapolated ticks."""
+        metrics = Metrics()
+        prediction = PredictionSystem(tick_rate=20, metrics=metrics)
+        prediction.update(0.150)
+        self.assertEqual(metrics.get_counter(m.TICKS_EXTRAPOLATED), 3)
+        self.assertEqual(metrics.get_counter(m.TICKS_STALLED), 0)
+
+    def test_disabled(self):
+        """Nothing is reported without metrics."""
+        playback = PlaybackSystem(tick_rate=20)
+        playback.update(0.050)
+        self.assertIsNone(playback.get_metrics())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.event import Event
+from kitsunet.netsim import PROFILES, LinkSimulator
+from kitsunet.playback import PlaybackSystem
+from kitsunet.server import ServerSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+def deliver(link: LinkSimulator, count: int, dt: float = 0.01, steps: int = 1000) -> list:
+    delivered: list = []
+    for i in range(count):
+        link.send(i)
+        delivered.extend(link.advance(dt))
+    for _ in range(steps):
+        delivered.extend(link.advance(dt))
+    return delivered
+
+
+class LinkSimulatorTestCase(unittest.TestCase):
+    def test_deterministic(self):
+        """Same seed gives the same deliveries, another seed does not."""
+        first = deliver(LinkSimulator.from_profile('mobile', seed=7), 500)
+        self.assertEqual(deliver(LinkSimulator.from_profile('mobile', seed=7), 500), first)
+        self.assertNotEqual(deliver(LinkSimulator.from_profile('mobile', seed=8), 500), first)
+
+    def test_latency(self):
+        """Items arrive after the latency and the jitter."""
+        link = LinkSimulator(latency=0.05, jitter=0.02)
+        link.send('a')
+        self.assertEqual(link.advance(0.049), [])
+        self.assertEqual(len(link), 1)
+        self.assertEqual(link.advance(0.021), ['a'])
+        self.assertEqual(link.get_delivered_count(), 1)
+
+    def test_in_order(self):
+        """Jitter alone does not reorder items."""
+        self.assertEqual(deliver(LinkSimulator(latency=0.01, jitter=0.1), 200), list(range(200)))
+
+    def test_loss(self):
+        """Lost items are never delivered."""
+        link = LinkSimulator(loss=0.2, seed=1)
+        delivered = deliver(link, 5000)
+        self.assertEqual(len(delivered), 5000 - link.get_lost_count())
+        self.assertAlmostEqual(link.get_lost_count() / 5000, 0.2, delta=0.02)
+
+    def test_duplication(self):
+        """Duplicated items are delivered twice."""
+        link = LinkSimulator(duplication=0.1, seed=1)
+        delivered = deliver(link, 1000)
+        self.assertEqual(len(delivered), 1000 + link.get_duplicated_count())
+        self.assertEqual(set(delivered), set(range(1000)))
+        self.assertGreater(link.get_duplicated_count(), 50)
+
+    def test_reorder(self):
+        """Reordered items arrive after some of the following ones."""
+        link = LinkSimulator(latency=0.05, reorder=0.1, seed=1)
+        delivered = deliver(link, 1000)
+        self.assertEqual(sorted(delivered), list(range(1000)))
+        self.assertNotEqual(delivered, list(range(1000)))
+        self.assertGreater(link.get_reordered_count(), 50)
+
+    def test_bandwidth(self):
+        """Capped link delays items by their size and drops what waits too long."""
+        link = LinkSimulator(bandwidth=1000, max_queue_delay=0.25)
+        self.assertTrue(link.send('a', 100))
+        self.assertTrue(link.send('b', 100))
+        self.assertEqual(link.advance(0.15), ['a'])
+        self.assertEqual(link.advance(0.05), ['b'])
+
+        for _ in range(5):
+            link.send('c', 100)
+        self.assertEqual(link.get_lost_count(), 2)
+        self.assertEqual(link.get_sent_bytes(), 500)
+
+        link = LinkSimulator(bandwidth=1000)
+        link.send(WorldSnapshot(1, [Snapshot(entity_id=1)]))
+        self.assertGreater(link.get_sent_bytes(), 0)
+
+    def test_profiles(self):
+        """Every profile creates a link, unknown ones are rejected."""
+        for name in PROFILES:
+            self.assertIsInstance(LinkSimulator.from_profile(name, latency=0.1), LinkSimulator)
+        with self.assertRaises(ValueError):
+            LinkSimulator.from_profile('carrier pigeon')
+        with self.assertRaises(ValueError):
+            LinkSimulator(loss=1.5)
+
+    def test_server_client(self):
+        """Link carries world snapshots from the server into playback and events back."""
+        server = ServerSystem(20, WorldSnapshot(0, [Snapshot(entity_id=1)]))
+        playback = PlaybackSystem(20)
+        downlink = LinkSimulator(latency=0.12)
+        uplink = LinkSimulator(latency=0.12)
+        server.add_client(1, downlink)
+
+        uplink.send_event(Event(0, 1, (0.0025, 0.0, 0.0)))
+        for _ in range(20):
+            for event in uplink.advance(0.05):
+                server.feed_event(event)
+            server.update(0.05)
+            for wsnapshot in downlink.advance(0.05):
+                playback.feed_snapshot(wsnapshot)
+            playback.update(0.05)
+
+        self.assertEqual(server.get_tick_id() - playback.get_tick_id(), 2)
+        self.assertGreater(playback.get_interpolated_snapshot().get_snapshot(1).get_position()[0], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -119,6 +119,26 @@ class PlaybackSystemTestCase(unittest.TestCase):
             system.get_interpolated_snapshot().get_snapshot(0).get_position(),
             (2.5, 0, 0))
 
+    def test_reuse_interpolated(self):
+        """Interpolated snapshot is reused across updates."""
+        system = PlaybackSystem(20, reuse_interpolated=True)  # tick 50ms
+        system.feed_snapshot(WorldSnapshot(1, [Snapshot(entity_id=0, position=(1.0, 0, 0))]))
+        system.feed_snapshot(WorldSnapshot(2, [Snapshot(entity_id=0, position=(2.0, 0, 0))]))
+        system.update(0.075)  # +75ms
+        wsnapshot = system.get_interpolated_snapshot()
+        self.assertEqual(wsnapshot.get_snapshot(0).get_position(), (1.5, 0, 0))
+        system.update(0.015)  # +15ms
+        self.assertIs(system.get_interpolated_snapshot(), wsnapshot)
+        self.assertEqual(wsnapshot.get_snapshot(0).get_position(), (1.8, 0, 0))
+
+        system.reset()  # snapshot of the previous run is left alone
+        system.feed_snapshot(WorldSnapshot(5, [Snapshot(entity_id=0, position=(5.0, 0, 0))]))
+        system.feed_snapshot(WorldSnapshot(6, [Snapshot(entity_id=0, position=(6.0, 0, 0))]))
+        system.update(0.075)  # +75ms
+        self.assertIsNot(system.get_interpolated_snapshot(), wsnapshot)
+        self.assertEqual(system.get_interpolated_snapshot().get_snapshot(0).get_position(), (5.5, 0, 0))
+        self.assertEqual(wsnapshot.get_snapshot(0).get_position(), (1.8, 0, 0))
+
     def test_overflow(self):
         """Overflow."""
         system = PlaybackSystem(20)  # tick 50ms
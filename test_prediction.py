@@ -36,6 +36,87 @@ class PredictionSystemTestCase(unittest.TestCase):
         self.assertEqual(system.get_tick_time(), 0.200)
         self.assertEqual(system.get_real_time(), 0.188)
 
+    def test_history_size(self):
+        """Prediction history is bounded."""
+        system = PredictionSystem(20, history_size=8)  # tick 50ms
+        system.update(1.0)  # +1s, extrapolated
+        self.assertEqual(system.get_tick_id(), 20)
+        self.assertEqual(system.get_history_size(), 8)
+
+    def test_capacities(self):
+        """Queue sizes are passed through to playback, inboxes do not follow history size."""
+        system = PredictionSystem(20, history_size=2, buffer_capacity=8, target_depth=3, inbox_capacity=4)
+        self.assertEqual(system.get_snapshot_queue().get_capacity(), 8)
+        self.assertEqual(system.get_snapshot_queue().get_target_depth(), 3)
+        self.assertEqual(system.get_snapshot_inbox().get_capacity(), 4)
+        self.assertEqual(sum(system.push_event(Event(0, 0, (0.0, 0.0, 0.0))) for _ in range(6)), 4)
+
+    def test_reconcile(self):
+        """Server reconciliation."""
+        system = PredictionSystem(20, initial_snapshot=WorldSnapshot(0, [
+            Snapshot(entity_id=0, position=(0.0, 0.0, 0.0)),
+        ]))  # tick 50ms
+        system.feed_event(Event(tick_id=0, entity_id=0, velocity=(0.05, 0.0, 0.0)))  # +1.0 per tick
+        system.update(0.150)  # +150ms, extrapolated
+        self.assertEqual(system.get_tick_id(), 3)
+        self.assertEqual(system.get_history_size(), 3)
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (3.0, 0.0, 0.0))
+
+        # server disagrees on tick 1, ticks 2 and 3 are replayed
+        system.feed_snapshot(WorldSnapshot(1, [Snapshot(entity_id=0, position=(0.5, 0.0, 0.0))]))
+        self.assertEqual(system.get_reconcile_count(), 1)
+        self.assertEqual(system.get_history_size(), 2)
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (2.5, 0.0, 0.0))
+
+        # server agrees on tick 2 within tolerance
+        system.feed_snapshot(WorldSnapshot(2, [Snapshot(entity_id=0, position=(1.5001, 0.0, 0.0))]))
+        self.assertEqual(system.get_reconcile_count(), 1)
+        self.assertEqual(system.get_history_size(), 1)
+
+        # prediction continues from the corrected state
+        system.update(0.050)  # +50ms
+        self.assertEqual(system.get_tick_id(), 4)
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (3.5, 0.0, 0.0))
+
+    def test_reconcile_in_order(self):
+        """Server reconciliation of snapshots queued ahead of prediction."""
+        system = PredictionSystem(20, initial_snapshot=WorldSnapshot(0, [
+            Snapshot(entity_id=0, position=(0.0, 0.0, 0.0)),
+        ]))  # tick 50ms
+        system.feed_event(Event(tick_id=0, entity_id=0, velocity=(0.05, 0.0, 0.0)))  # +1.0 per tick
+
+        # server disagrees on tick 1, its state is played
+        system.feed_snapshot(WorldSnapshot(1, [Snapshot(entity_id=0, position=(0.5, 0.0, 0.0))]))
+        system.update(0.050)  # +50ms
+        self.assertEqual(system.get_tick_id(), 1)
+        self.assertEqual(system.get_reconcile_count(), 1)
+        self.assertEqual(system.get_history_size(), 0)
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (0.5, 0.0, 0.0))
+
+        # server agrees on tick 2 within tolerance
+        system.feed_snapshot(WorldSnapshot(2, [Snapshot(entity_id=0, position=(1.5001, 0.0, 0.0))]))
+        system.update(0.050)  # +50ms
+        self.assertEqual(system.get_reconcile_count(), 1)
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (1.5, 0.0, 0.0))
+
+        # prediction continues from the acknowledged state
+        system.update(0.050)  # +50ms, extrapolated
+        self.assertEqual(system.get_tick_id(), 3)
+        self.assertEqual(system.get_history_size(), 1)
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (2.5, 0.0, 0.0))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+import random
+import unittest
+
+from kitsunet.codec import Codec
+from kitsunet.event import Event
+from kitsunet.redundancy import EventBatch, EventBatcher, EventDeduplicator
+
+from fake_transport import make_pair
+
+
+def make_event(tick_id: int, x: float = 1.0, entity_id: int = 1) -> Event:
+    return Event(tick_id=tick_id, entity_id=entity_id, velocity=(x, 0.0, 0.0))
+
+
+class EventBatchTestCase(unittest.TestCase):
+    def test_runs(self):
+        """Identical consecutive velocities are run-length encoded."""
+        events = [make_event(tick_id) for tick_id in range(1, 11)]
+        events += [make_event(11, 2.0), make_event(13, 2.0)]  # tick 12 is missing
+        batch = EventBatch.from_events(1, events)
+        self.assertEqual(batch.get_runs(), [
+            (1, 10, (1.0, 0.0, 0.0)), (11, 1, (2.0, 0.0, 0.0)), (13, 1, (2.0, 0.0, 0.0))])
+        self.assertEqual(len(batch), 12)
+        self.assertEqual((batch.get_first_tick_id(), batch.get_last_tick_id()), (1, 13))
+        unpacked = batch.get_events()
+        self.assertEqual([event.get_tick_id() for event in unpacked], [event.get_tick_id() for event in events])
+        self.assertEqual([event.get_tick_id() for event in batch.get_events(after_tick_id=10)], [11, 13])
+
+    def test_codec(self):
+        """Event batch round trip is smaller than separate events."""
+        codec = Codec()
+        events = [make_event(tick_id) for tick_id in range(1000, 1016)]
+        data = codec.encode(EventBatch.from_events(1, events))
+        batch = codec.decode(data)
+        self.assertEqual(batch.get_entity_id(), 1)
+        self.assertEqual(batch.get_runs(), [(1000, 16, (1.0, 0.0, 0.0))])
+        self.assertLess(len(data), len(codec.encode(events[0])) + 4)
+
+
+class EventBatcherTestCase(unittest.TestCase):
+    def test_acknowledge(self):
+        """Acknowledged events are not resent."""
+        batcher = EventBatcher(redundancy=4)
+        for tick_id in range(1, 7):
+            batcher.push(make_event(tick_id, x=tick_id))
+        self.assertEqual(batcher.get_pending_count(1), 4)
+        self.assertEqual(batcher.get_batch(1).get_first_tick_id(), 3)
+        batcher.acknowledge(1, 4)
+        self.assertEqual(batcher.get_batch(1).get_first_tick_id(), 5)
+        batcher.acknowledge(1, 6)
+        self.assertIsNone(batcher.get_batch(1))
+        self.assertEqual(batcher.get_batches(), [])
+
+    def test_replace(self):
+        """Event of a pushed tick replaces it."""
+        batcher = EventBatcher()
+        batcher.push(make_event(2))
+        batcher.push(make_event(1))
+        batcher.push(make_event(2, x=5.0))
+        self.assertEqual([event.get_velocity()[0] for event in batcher.get_batch(1).get_events()], [1.0, 5.0])
+
+    def test_dedupe(self):
+        """Redundant events are received once."""
+        batcher = EventBatcher()
+        deduplicator = EventDeduplicator()
+        received = []
+        for tick_id in range(1, 6):
+            batcher.push(make_event(tick_id))
+            received += deduplicator.receive(batcher.get_batch(1))
+        self.assertEqual([event.get_tick_id() for event in received], [1, 2, 3, 4, 5])
+        self.assertEqual(deduplicator.get_duplicate_count(), 10)
+        self.assertEqual(deduplicator.get_last_tick_id(1), 5)
+
+    def test_lossy(self):
+        """Every input arrives over a lossy link."""
+        rnd = random.Random(1)
+        received = []
+        batcher = EventBatcher(redundancy=8)
+        server, client = make_pair(
+            server={'on_event': received.append},
+            client={'on_event_ack': batcher.acknowledge})
+        client._transport.hold = True
+        server._transport.hold = True
+
+        for tick_id in range(1, 201):
+            batcher.push(make_event(tick_id, x=float(tick_id // 10)))
+            for batch in batcher.get_batches():
+                client.send_event_batch(batch)
+            client.flush()
+            client._transport.packets = [p for p in client._transport.packets if rnd.random() >= 0.3]
+            client._transport.deliver()
+            server.flush()  # acks
+            server._transport.deliver()
+
+        self.assertEqual([event.get_tick_id() for event in received], list(range(1, 201)))
+        self.assertEqual(received[-1].get_velocity(), (20.0, 0.0, 0.0))
+        self.assertLessEqual(batcher.get_pending_count(1), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import unittest
+
+from kitsunet.codec import Codec
+from kitsunet.event import Event
+from kitsunet.playback import PlaybackSystem
+from kitsunet.replay import INDEX_SUFFIX, ReplayReader, ReplayWriter
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+def make_world(tick_id: int) -> WorldSnapshot:
+    return WorldSnapshot(tick_id, [Snapshot(entity_id=1, position=(float(tick_id), 0.0, 0.0))])
+
+
+class ReplayTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'match.knrp')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, ticks: int = 100):
+        with ReplayWriter(self.path) as writer:
+            for tick_id in range(1, ticks + 1):
+                writer.write(make_world(tick_id))
+                writer.write(Event(tick_id=tick_id, entity_id=1, velocity=(1.0, 0.0, 0.0)))
+
+    def test_round_trip(self):
+        """Items are read in the written order."""
+        self.write(3)
+        with ReplayReader(self.path) as reader:
+            items = list(reader)
+            self.assertEqual(reader.get_first_tick_id(), 1)
+            self.assertEqual(reader.get_last_tick_id(), 3)
+            self.assertEqual(reader.get_tick_count(), 3)
+        self.assertEqual(len(items), 6)
+        self.assertIsInstance(items[0], WorldSnapshot)
+        self.assertEqual(items[2].get_snapshot(1).get_position(), (2.0, 0.0, 0.0))
+        self.assertIsInstance(items[5], Event)
+        self.assertEqual(items[5].get_tick_id(), 3)
+
+    def test_seek(self):
+        """Seek moves to the first record of the tick."""
+        self.write()
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(reader.seek(42), 42)
+            self.assertEqual(reader.read().get_tick_id(), 42)
+            self.assertEqual(reader.read().get_tick_id(), 42)
+            self.assertEqual(reader.read().get_tick_id(), 43)
+            self.assertEqual(reader.seek(0), 1)
+            self.assertIsNone(reader.seek(101))
+            self.assertIsNone(reader.read())
+
+    def test_seek_gap(self):
+        """Seek of a missing tick moves to the next logged one."""
+        with ReplayWriter(self.path) as writer:
+            for tick_id in (1, 5, 9):
+                writer.write(make_world(tick_id))
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(reader.seek(2), 5)
+            self.assertEqual(reader.read().get_tick_id(), 5)
+
+    def test_truncated(self):
+        """Incomplete tail record is not read."""
+        self.write(2)
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(len(list(reader)), 3)
+
+    def test_live(self):
+        """Refresh reads records appended by a live writer."""
+        writer = ReplayWriter(self.path)
+        writer.write(make_world(1))
+        writer.flush()
+        reader = ReplayReader(self.path)
+        self.assertEqual(reader.read().get_tick_id(), 1)
+        self.assertIsNone(reader.read())
+
+        writer.write(make_world(2))
+        writer.close()
+        reader.refresh()
+        self.assertEqual(reader.read().get_tick_id(), 2)
+        self.assertEqual(reader.get_last_tick_id(), 2)
+        reader.close()
+
+    def test_scrub(self):
+        """Playback restarts from any tick."""
+        self.write()
+        playback = PlaybackSystem(20)
+        with ReplayReader(self.path) as reader:
+            self.assertEqual(reader.scrub(playback, 80), 2)
+            playback.update(0.05)
+            self.assertEqual(playback.get_tick_id(), 80)
+            self.assertEqual(reader.feed(playback, 1), 1)
+            playback.update(0.075)
+            self.assertEqual(playback.get_tick_id(), 82)
+            self.assertEqual(playback.get_interpolated_snapshot().get_snapshot(1).get_position(), (81.5, 0.0, 0.0))
+
+            reader.scrub(playback, 10)  # backwards
+            playback.update(0.05)
+            self.assertEqual(playback.get_tick_id(), 10)
+
+    def test_invalid(self):
+        """Codec mismatch and foreign files are rejected."""
+        self.write(1)
+        with self.assertRaises(ValueError):
+            ReplayReader(self.path, Codec(double_precision=True))
+        with open(self.path, 'wb') as f:
+            f.write(b'junk')
+        with self.assertRaises(ValueError):
+            ReplayReader(self.path)
+        self.assertTrue(os.path.exists(self.path + INDEX_SUFFIX))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import asyncio
+import unittest
+
+from kitsunet.event import Event
+from kitsunet.playback import PlaybackSystem
+from kitsunet.server import ServerSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+class RecordingClient:
+    def __init__(self):
+        self.wsnapshots = []
+
+    def send_snapshot(self, wsnapshot: WorldSnapshot):
+        self.wsnapshots.append(wsnapshot)
+
+
+def make_server() -> ServerSystem:
+    return ServerSystem(20, WorldSnapshot(0, [
+        Snapshot(entity_id=1, position=(0.0, 0.0, 0.0)),
+        Snapshot(entity_id=2, position=(5.0, 0.0, 0.0)),
+    ]))
+
+
+class ServerSystemTestCase(unittest.TestCase):
+    def test_ticks(self):
+        """Fixed ticks."""
+        server = make_server()
+        server.update(0.120)  # +120ms
+        self.assertEqual(server.get_tick_id(), 2)
+        server.update(0.030)  # +30ms
+        self.assertEqual(server.get_tick_id(), 3)
+        self.assertEqual(server.get_world_snapshot().get_entity_ids(), frozenset((1, 2)))
+
+    def test_events(self):
+        """Events become entity input."""
+        server = make_server()
+        server.feed_event(Event(tick_id=1, entity_id=1, velocity=(0.05, 0.0, 0.0)))
+        server.update(0.050)  # tick 1, event not yet applied
+        self.assertEqual(server.get_world_snapshot().get_snapshot(1).get_position(), (0.0, 0.0, 0.0))
+        server.update(0.100)  # ticks 2 and 3, input stays
+        self.assertEqual(server.get_world_snapshot().get_snapshot(1).get_position(), (2.0, 0.0, 0.0))
+        self.assertEqual(server.get_world_snapshot().get_snapshot(2).get_position(), (5.0, 0.0, 0.0))
+        self.assertEqual(server.get_event_queue_size(), 0)
+
+    def test_fan_out(self):
+        """Same snapshot is sent to all the clients."""
+        server = make_server()
+        clients = [RecordingClient() for _ in range(100)]
+        for client_id, client in enumerate(clients):
+            server.add_client(client_id, client)
+        server.remove_client(0)
+        server.update(0.100)
+        self.assertEqual(clients[0].wsnapshots, [])
+        for client in clients[1:]:
+            self.assertEqual([w.get_tick_id() for w in client.wsnapshots], [1, 2])
+            self.assertIs(client.wsnapshots[-1], clients[1].wsnapshots[-1])
+        self.assertGreater(server.get_headroom(), 0.0)
+        self.assertLessEqual(server.get_headroom(), 1.0)
+
+    def test_spawn(self):
+        """Spawn and despawn entities."""
+        server = make_server()
+        server.spawn(Snapshot(entity_id=3, position=(1.0, 1.0, 1.0)))
+        server.despawn(2)
+        server.update(0.050)
+        self.assertEqual(server.get_world_snapshot().get_entity_ids(), frozenset((1, 3)))
+
+    def test_overrun(self):
+        """Skip time when far behind."""
+        server = ServerSystem(20, max_catch_up=3)
+        server.update(1.0)  # +1s
+        self.assertEqual(server.get_tick_id(), 3)
+        self.assertEqual(server.get_overrun_count(), 1)
+
+    def test_run(self):
+        """Tick loop feeds client playback."""
+        server = ServerSystem(100, WorldSnapshot(0, [Snapshot(entity_id=1)]))
+        client = PlaybackSystem(100)
+        server.add_client(1, client)
+        client.send_snapshot = client.feed_snapshot
+        asyncio.run(server.run(ticks=5))
+        self.assertEqual(server.get_tick_id(), 5)
+        self.assertEqual(client.get_snapshot_queue_size(), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import unittest
+
+import numpy as np
+
+from kitsunet.event import Event
+from kitsunet.sharding import ShardedSimulation
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+def make_world(count: int) -> WorldSnapshot:
+    return WorldSnapshot(0, [
+        Snapshot(entity_id=entity_id * 2, position=(float(entity_id), 0.0, 0.0))
+        for entity_id in range(count)
+    ])
+
+
+class ShardedSimulationTestCase(unittest.TestCase):
+    def test_extrapolate(self):
+        """Shards simulate the same world as a single process."""
+        wsnapshot = make_world(100)
+        events = [
+            Event(tick_id=0, entity_id=entity_id * 2, velocity=(entity_id * 0.01, 0.0, -0.02))
+            for entity_id in range(100)
+        ]
+        with ShardedSimulation(20, wsnapshot, shards=3) as simulation:
+            self.assertEqual(simulation.get_shard_count(), 3)
+            simulation.feed_events(events + [Event(tick_id=0, entity_id=1, velocity=(1.0, 0.0, 0.0))])
+            for tick_id in range(1, 6):
+                wsnapshot = wsnapshot.extrapolate(events, 0.05, tick_id)
+                sharded = simulation.step()
+                self.assertEqual(sharded.get_tick_id(), tick_id)
+                self.assertEqual(sharded.get_entity_ids(), wsnapshot.get_entity_ids())
+                for entity_id in (0, 66, 198):
+                    self.assertEqual(
+                        sharded.get_snapshot(entity_id).get_position(),
+                        wsnapshot.get_snapshot(entity_id).get_position())
+
+    def test_buffers(self):
+        """World snapshot stays valid for buffers - 1 ticks and is copied on change."""
+        with ShardedSimulation(20, make_world(10), shards=2, buffers=3) as simulation:
+            simulation.feed_velocities(np.full((10, 3), 0.05))
+            first = simulation.step()
+            simulation.step()
+            self.assertEqual(first.get_snapshot(0).get_position(), (1.0, 1.0, 1.0))
+            first.add_snapshot(0, Snapshot(entity_id=0, position=(9.0, 9.0, 9.0)))
+            self.assertEqual(simulation.step().get_snapshot(0).get_position(), (3.0, 3.0, 3.0))
+            self.assertEqual(simulation.get_world_snapshot().get_snapshot(2).get_position(), (4.0, 3.0, 3.0))
+
+    def test_invalid(self):
+        """Position buffers must be double buffered at least."""
+        with self.assertRaises(ValueError):
+            ShardedSimulation(20, make_world(1), buffers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
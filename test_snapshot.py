@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.event import Event
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def test_slots(self):
+        """Snapshots and events have no instance dict."""
+        for obj in (Snapshot(1), WorldSnapshot(1), Event(1, 1)):
+            self.assertFalse(hasattr(obj, '__dict__'))
+
+    def test_extrapolate_idle(self):
+        """Snapshot which does not move is returned itself."""
+        snapshot = Snapshot(1, (1.0, 2.0, 3.0))
+        self.assertIs(snapshot.extrapolate(Event(1, 1), 0.05), snapshot)
+        moved = snapshot.extrapolate(Event(1, 1, (0.05, 0.0, 0.0)), 0.05)
+        self.assertEqual(moved.get_position(), (2.0, 2.0, 3.0))
+
+    def test_interpolate_out(self):
+        """Pooled snapshot is overwritten."""
+        pool = WorldSnapshot(0)
+        wsnapshot_a = WorldSnapshot(1, [Snapshot(1, (0.0, 0.0, 0.0)), Snapshot(2, (0.0, 0.0, 0.0))])
+        wsnapshot_b = WorldSnapshot(2, [Snapshot(1, (1.0, 0.0, 0.0)), Snapshot(2, (2.0, 0.0, 0.0))])
+        self.assertIs(wsnapshot_a.interpolate(wsnapshot_b, 0.5, out=pool), pool)
+        snapshot = pool.get_snapshot(1)
+        self.assertEqual(pool.get_tick_id(), 1)
+        self.assertEqual(pool.get_snapshot(2).get_position(), (1.0, 0.0, 0.0))
+
+        wsnapshot_b = WorldSnapshot(2, [Snapshot(1, (3.0, 0.0, 0.0))])
+        wsnapshot_a.interpolate(wsnapshot_b, 0.5, out=pool)
+        self.assertIs(pool.get_snapshot(1), snapshot)
+        self.assertEqual(snapshot.get_position(), (1.5, 0.0, 0.0))
+        self.assertEqual(pool.get_entity_ids(), {1})
+
+    def test_copy_on_write(self):
+        """Copies share entity snapshots until changed."""
+        snapshot = Snapshot(1, (1.0, 0.0, 0.0))
+        wsnapshot = WorldSnapshot(1, [snapshot])
+        copy = wsnapshot.copy(tick_id=2)
+        self.assertEqual(copy.get_tick_id(), 2)
+        self.assertIs(copy.get_snapshot(1), snapshot)
+
+        copy.add_snapshot(2, Snapshot(2))
+        self.assertEqual(copy.get_entity_ids(), {1, 2})
+        self.assertEqual(wsnapshot.get_entity_ids(), {1})
+
+    def test_extrapolate_shares(self):
+        """Extrapolated world shares snapshots of idle entities."""
+        wsnapshot = WorldSnapshot(1, [Snapshot(1), Snapshot(2)])
+        events = [Event(1, 1, (0.05, 0.0, 0.0)), Event(1, 2)]
+        extrapolated = wsnapshot.extrapolate(events, 0.05, tick_id=2)
+        self.assertIs(extrapolated.get_snapshot(2), wsnapshot.get_snapshot(2))
+        self.assertEqual(extrapolated.get_snapshot(1).get_position(), (1.0, 0.0, 0.0))
+        self.assertEqual(wsnapshot.get_snapshot(1).get_position(), (0.0, 0.0, 0.0))
+
+        extrapolated = wsnapshot.extrapolate(events[:1], 0.05)  # entities without events are left out
+        self.assertEqual(extrapolated.get_entity_ids(), {1})
+
+
+if __name__ == '__main__':
+    unittest.main()
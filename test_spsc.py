@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+import sys
+import threading
+import time
+import unittest
+
+from kitsunet.adaptive import AdaptivePlaybackSystem
+from kitsunet.event import Event
+from kitsunet.playback import PlaybackSystem
+from kitsunet.prediction import PredictionSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+from kitsunet.spsc import SPSCQueue
+
+
+class FastSwitching:
+    """Switch threads as often as possible, so races show up."""
+    def __enter__(self):
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+
+    def __exit__(self, *args):
+        sys.setswitchinterval(self.interval)
+
+
+TIMEOUT = 30.0  # in seconds, so a lost item fails instead of hanging
+
+
+def produce(count: int, push, deadline: float) -> threading.Thread:
+    def run():
+        for i in range(1, count + 1):
+            while not push(i):  # full, wait for consumer
+                if time.monotonic() > deadline:
+                    return
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def play(system: PlaybackSystem, count: int) -> list[int]:
+    """Push snapshots from another thread, collect played tick IDs."""
+    played = []
+    deadline = time.monotonic() + TIMEOUT
+    with FastSwitching():
+        thread = produce(count, lambda tick_id: system.push_snapshot(WorldSnapshot(tick_id, [
+            Snapshot(entity_id=1, position=(float(tick_id), 0.0, 0.0))])), deadline)
+        while len(played) < count and time.monotonic() < deadline:
+            system.update(0.025)  # below a tick even at the fastest playout
+            if system.get_tick_id() and (not played or played[-1] != system.get_tick_id()):
+                played.append(system.get_tick_id())
+        thread.join()
+    return played
+
+
+class SPSCQueueTestCase(unittest.TestCase):
+    def test_bounded(self):
+        """Full queue rejects items."""
+        queue = SPSCQueue(2)
+        self.assertTrue(queue.push(1))
+        self.assertTrue(queue.push(2))
+        self.assertFalse(queue.push(3))
+        self.assertEqual(queue.get_drop_count(), 1)
+        self.assertEqual(queue.pop(), 1)
+        self.assertTrue(queue.push(4))
+        self.assertEqual(queue.drain(), [2, 4])
+        self.assertIsNone(queue.pop())
+        self.assertEqual(len(queue), 0)
+
+    def test_stress(self):
+        """Concurrent producer, every item is popped once in order."""
+        count = 10000
+        queue = SPSCQueue(64)
+        received = []
+        deadline = time.monotonic() + TIMEOUT
+        with FastSwitching():
+            thread = produce(count, queue.push, deadline)
+            while len(received) < count and time.monotonic() < deadline:
+                received += queue.drain()
+                item = queue.pop()
+                if item is not None:
+                    received.append(item)
+            thread.join()
+        self.assertEqual(received, list(range(1, count + 1)))
+
+    def test_playback(self):
+        """Snapshots pushed by a network thread are played in order."""
+        count = 2000
+        # queue keeps everything a full inbox can add, so no tick is skipped
+        system = PlaybackSystem(20, buffer_capacity=count + 17, target_depth=count, inbox_capacity=16)
+        self.assertEqual(play(system, count), list(range(1, count + 1)))
+        self.assertEqual(system.get_snapshot_queue().get_overflow_count(), 0)
+        self.assertEqual(system.get_snapshot_queue().get_drop_count(), 0)
+
+    def test_adaptive(self):
+        """Pushed snapshots are played in order, arrival time is taken on push."""
+        count = 2000
+        system = AdaptivePlaybackSystem(20, buffer_capacity=count + 17, max_depth=count, inbox_capacity=16)
+        self.assertEqual(play(system, count), list(range(1, count + 1)))
+        self.assertEqual(system.get_snapshot_queue().get_overflow_count(), 0)
+        self.assertEqual(system.get_snapshot_queue().get_drop_count(), 0)
+
+        system = AdaptivePlaybackSystem(20, clock=lambda: 0.0)
+        system.push_snapshot(WorldSnapshot(1))
+        system.push_snapshot(WorldSnapshot(2), arrival_time=1.0)
+        system.update(0.05)
+        self.assertEqual(system.get_tick_id(), 1)
+        self.assertGreater(system.get_jitter(), 0)
+
+    def test_prediction(self):
+        """Events pushed by an input thread are fed on update."""
+        count = 5000
+        system = PredictionSystem(20, local_entity_id=1, initial_snapshot=WorldSnapshot(0, [
+            Snapshot(entity_id=1, position=(0.0, 0.0, 0.0))]))
+        last = [0]
+
+        def push(tick_id: int) -> bool:
+            return system.push_event(Event(tick_id=tick_id, entity_id=1, velocity=(float(tick_id), 0.0, 0.0)))
+
+        deadline = time.monotonic() + TIMEOUT
+        with FastSwitching():
+            thread = produce(count, push, deadline)
+            while last[0] < count and time.monotonic() < deadline:
+                system.update(0.05)
+                event = system._pull_event()
+                if event:
+                    self.assertGreaterEqual(event.get_tick_id(), last[0])
+                    last[0] = event.get_tick_id()
+            thread.join()
+        self.assertEqual(system.get_event_queue_size(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
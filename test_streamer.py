@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.event import Event
+from kitsunet.playback import PlaybackSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+from kitsunet.streamer import Streamer, sequence_greater
+
+from fake_transport import FakeTransport, make_pair
+
+
+def make_world(tick_id: int, count: int = 1) -> WorldSnapshot:
+    return WorldSnapshot(tick_id, [
+        Snapshot(entity_id=entity_id, position=(float(tick_id), 0.0, 0.0))
+        for entity_id in range(count)
+    ])
+
+
+class StreamerTestCase(unittest.TestCase):
+    def test_sequence_greater(self):
+        """Sequence comparison with wrap around."""
+        self.assertTrue(sequence_greater(2, 1))
+        self.assertFalse(sequence_greater(1, 2))
+        self.assertTrue(sequence_greater(0, 0xffff))
+        self.assertFalse(sequence_greater(0xffff, 0))
+
+    def test_feed_playback(self):
+        """Received world snapshots feed playback system."""
+        system = PlaybackSystem(20)  # tick 50ms
+        server, client = make_pair(client={'playback': system})
+        for tick_id in (1, 2, 3):
+            server.send_snapshot(make_world(tick_id))
+        self.assertEqual(server.flush(), 1)
+        self.assertEqual(system.get_snapshot_queue_size(), 3)
+        system.update(0.075)  # +75ms
+        self.assertEqual(
+            system.get_interpolated_snapshot().get_snapshot(0).get_position(),
+            (1.5, 0, 0))
+
+    def test_events(self):
+        """Received events are passed to callback."""
+        events = []
+        server, client = make_pair(server={'on_event': events.append})
+        client.send_event(Event(tick_id=4, entity_id=1, velocity=(1.0, 0.0, 0.0)))
+        client.flush()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].get_tick_id(), 4)
+        self.assertEqual(events[0].get_velocity(), (1.0, 0.0, 0.0))
+
+    def test_mtu(self):
+        """Items are batched under MTU."""
+        system = PlaybackSystem(20)
+        server, client = make_pair(server={'mtu': 200}, client={'playback': system})
+        for tick_id in range(1, 11):
+            server.send_snapshot(make_world(tick_id, count=4))  # ~55 bytes each
+        sent = server.flush()
+        self.assertEqual(sent, 4)
+        self.assertEqual(system.get_snapshot_queue_size(), 10)
+        self.assertEqual(client.get_received_count(), 4)
+
+    def test_mtu_size(self):
+        """Datagrams do not exceed MTU."""
+        server, client = make_pair(server={'mtu': 200})
+        server._transport.hold = True
+        for tick_id in range(1, 11):
+            server.send_snapshot(make_world(tick_id, count=4))
+        server.flush()
+        self.assertTrue(all(len(packet) <= 200 for packet in server._transport.packets))
+
+    def test_mtu_oversized(self):
+        """Items which do not fit in a datagram are rejected."""
+        server, client = make_pair(server={'mtu': 200})
+        with self.assertRaises(ValueError):
+            server.send_snapshot(make_world(1, count=20))
+        with self.assertRaises(ValueError):
+            server.send_encoded(bytes(server.get_max_item_size() + 1))
+        self.assertEqual(server.get_outgoing_size(), 0)
+
+        server._transport.hold = True
+        server.send_encoded(bytes(server.get_max_item_size()))
+        server.flush()
+        self.assertEqual(len(server._transport.packets[0]), 200)
+
+    def test_acks(self):
+        """Acknowledged world snapshots are reported."""
+        acked = []
+        server, client = make_pair(server={'on_ack': acked.append})
+        server._transport.hold = True
+        for tick_id in (1, 2, 3):
+            server.send_snapshot(make_world(tick_id))
+            server.flush()
+        server._transport.packets.pop(1)  # lose tick 2
+        server._transport.deliver()
+        self.assertEqual(client.get_remote_sequence(), 2)
+        self.assertEqual(client.get_ack_bits(), 0b10)
+        self.assertEqual(client.flush(), 1)  # ack only
+        self.assertEqual(sorted(acked), [1, 3])
+
+    def test_duplicate(self):
+        """Duplicate datagrams are discarded."""
+        system = PlaybackSystem(20)
+        server, client = make_pair(client={'playback': system})
+        server._transport.hold = True
+        server.send_snapshot(make_world(1))
+        server.flush()
+        packet = server._transport.packets[0]
+        server._transport.deliver()
+        client.datagram_received(packet, ('server', 1))
+        client.datagram_received(b'\x00', ('server', 1))
+        self.assertEqual(client.get_received_count(), 1)
+        self.assertEqual(client.get_discarded_count(), 2)
+
+    def test_malformed(self):
+        """Malformed datagrams are neither acknowledged nor sequenced."""
+        server, client = make_pair()
+        server._transport.hold = True
+        server.send_snapshot(make_world(1))
+        server.flush()
+        packet = server._transport.packets.pop()
+        client.datagram_received(packet[:-1], ('server', 1))
+        self.assertIsNone(client.get_remote_sequence())
+        self.assertEqual(client.get_discarded_count(), 1)
+        self.assertEqual(client.flush(), 0)  # nothing to ack
+        client.datagram_received(packet, ('server', 1))
+        self.assertEqual(client.get_received_count(), 1)
+
+    def test_not_connected(self):
+        """Items stay queued until the connection is made."""
+        streamer = Streamer(remote_addr=('server', 1))
+        streamer.send_snapshot(make_world(1))
+        self.assertEqual(streamer.flush(), 0)
+        self.assertEqual(streamer.get_outgoing_size(), 1)
+        streamer.connection_made(FakeTransport(('client', 1)))
+        streamer._transport.hold = True
+        self.assertEqual(streamer.flush(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import unittest
+
+from kitsunet.columnar import ColumnarWorldSnapshot
+from kitsunet.playback import PlaybackSystem
+from kitsunet.snapshot import Snapshot, WorldSnapshot
+from kitsunet.view import InterpolatedWorldView
+
+
+def make_world(tick_id: int, entity_ids: tuple[int], world_class: type = WorldSnapshot) -> WorldSnapshot:
+    return world_class(tick_id, [
+        Snapshot(entity_id=entity_id, position=(float(tick_id), float(entity_id), 0.0))
+        for entity_id in entity_ids
+    ])
+
+
+class InterpolatedWorldViewTestCase(unittest.TestCase):
+    def test_get_snapshot(self):
+        """Entities are interpolated on demand and memoized."""
+        view = InterpolatedWorldView(make_world(1, (1, 2, 3)), make_world(2, (2, 3, 4)), 0.25)
+        self.assertEqual(view.get_tick_id(), 1)
+        self.assertEqual(view.get_entity_ids(), {2, 3})
+        snapshot = view.get_snapshot(2)
+        self.assertEqual(snapshot.get_position(), (1.25, 2.0, 0.0))
+        self.assertIs(view.get_snapshot(2), snapshot)
+        self.assertIsNone(view.get_snapshot(1))
+        self.assertIsNone(view.get_snapshot(4))
+
+    def test_get_snapshots(self):
+        """Batch accessor matches eager interpolation."""
+        for world_class in (WorldSnapshot, ColumnarWorldSnapshot):
+            wsnapshot_a = make_world(1, (1, 2, 3), world_class)
+            wsnapshot_b = make_world(2, (2, 3, 4), world_class)
+            view = InterpolatedWorldView(wsnapshot_a, wsnapshot_b, 0.5)
+            expected = wsnapshot_a.interpolate(wsnapshot_b, 0.5)
+            snapshots = view.get_snapshots(iter((1, 2, 3)))
+            self.assertEqual(set(snapshots), {2, 3})
+            for entity_id, snapshot in snapshots.items():
+                self.assertEqual(snapshot.get_position(), expected.get_snapshot(entity_id).get_position())
+            self.assertEqual(view.to_world_snapshot().get_entity_ids(), expected.get_entity_ids())
+
+    def test_playback(self):
+        """Playback returns a lazy view."""
+        system = PlaybackSystem(20, lazy_interpolation=True)  # tick 50ms
+        system.feed_snapshot(make_world(1, (0, 1)))
+        system.feed_snapshot(make_world(2, (0, 1)))
+        system.update(0.075)  # +75ms
+        view = system.get_interpolated_snapshot()
+        self.assertIsInstance(view, InterpolatedWorldView)
+        self.assertEqual(view.get_snapshot(0).get_position(), (1.5, 0.0, 0.0))
+        system.update(0.025)  # +25ms, factor 1.0
+        self.assertIsInstance(system.get_interpolated_snapshot(), WorldSnapshot)
+        self.assertEqual(system.get_interpolated_snapshot().get_snapshots([1]).keys(), {1})
+
+
+if __name__ == '__main__':
+    unittest.main()